@@ -64,4 +64,58 @@ class ApiClient
             return null;
         }
     }
+    
+    /**
+     * Fetch several student requests by ID in a single round trip
+     * Uses POST /requests:batchGet instead of one GET /requests/{id} per ID
+     * 
+     * @param array $ids Student request IDs to fetch
+     * @return array|null Array with 'requests' and 'missing' keys, or null on failure
+     */
+    public function fetchRequestsByIds(array $ids)
+    {
+        try {
+            $url = $this->baseUrl . '/requests:batchGet';
+            
+            // Initialize cURL
+            $ch = curl_init($url);
+            
+            // Set cURL options
+            curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
+            curl_setopt($ch, CURLOPT_TIMEOUT, 5);
+            curl_setopt($ch, CURLOPT_POST, true);
+            curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode(['ids' => array_values(array_map('intval', $ids))]));
+            curl_setopt($ch, CURLOPT_HTTPHEADER, [
+                'Accept: application/json',
+                'Content-Type: application/json'
+            ]);
+            
+            // Execute request
+            $response = curl_exec($ch);
+            $http_code = curl_getinfo($ch, CURLINFO_HTTP_CODE);
+            $error = curl_error($ch);
+            
+            curl_close($ch);
+            
+            // Check for errors
+            if ($response === false || $http_code !== 200) {
+                error_log("Batch API request failed: HTTP $http_code, Error: $error");
+                return null;
+            }
+            
+            // Decode JSON response
+            $data = json_decode($response, true);
+            
+            if (json_last_error() !== JSON_ERROR_NONE) {
+                error_log("JSON decode error: " . json_last_error_msg());
+                return null;
+            }
+            
+            return $data;
+            
+        } catch (Exception $e) {
+            error_log("Exception in fetchRequestsByIds: " . $e->getMessage());
+            return null;
+        }
+    }
 }
@@ -0,0 +1,477 @@
+"""
+Compiled OpenAPI response validation for Strangler Studio.
+
+The contract is walked once and every response schema is compiled into a
+tree of small validator closures: type checks, required fields, enums and
+constraints are resolved up front, and $refs are compiled once and shared.
+Validating a payload is then only a series of direct checks with no schema
+lookups.
+
+Compiled contracts are cached per file, so test modules, worker processes
+and middleware that ask for the same contract share one compilation.
+
+ContractMiddleware enforces the contract at runtime on a 1-in-N sample of
+requests. Unsampled requests pass straight through. Sampled requests have
+their JSON bodies buffered, up to a size cap. Each one is checked by a
+detached background task, running in a worker thread, once the response has
+gone to the client. Validation therefore never holds up the event loop, the
+request or the latency recorded for it. The number of checks in flight is
+bounded. When the backlog is full, further samples are skipped rather than
+queued. Results are counted in the metrics registry, so a violation never
+changes or delays a response.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.metrics import REGISTRY, UNMATCHED_ROUTE, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+Validator = Callable[[Any], None]
+
+DEFAULT_CONTRACT_PATH = Path(os.getenv(
+    "OPENAPI_CONTRACT_PATH",
+    str(Path(__file__).resolve().parents[2] / "contracts" / "openapi.yaml"),
+))
+
+_REF_PREFIX = "#/components/schemas/"
+_HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+
+class ContractViolation(ValueError):
+    """A payload does not match its contract schema"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+        # Location segments, innermost last, such as [".requests", "[0]", ".id"]
+        self.location: List[str] = []
+        self.subject = "response"
+
+    def __str__(self) -> str:
+        return f"At {self.subject}{''.join(self.location)}: {self.message}"
+
+
+def _type_name(data: Any) -> str:
+    return type(data).__name__
+
+
+def _is_date_time(value: str) -> bool:
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00").replace("z", "+00:00"))
+    except ValueError:
+        return False
+    return "T" in value or "t" in value
+
+
+class CompiledContract:
+    """All response schemas of an OpenAPI document, compiled to validators"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self._schemas = spec.get("components", {}).get("schemas", {})
+        self._paths = frozenset(spec.get("paths", {}))
+        self._refs: Dict[str, Validator] = {}
+        # (path template, method, status) -> validator, or None when the
+        # response has no JSON schema
+        self.responses: Dict[Tuple[str, str, str], Optional[Validator]] = {}
+        # (path template, method) -> validator for JSON request bodies
+        self.request_bodies: Dict[Tuple[str, str], Validator] = {}
+        for path, path_item in spec.get("paths", {}).items():
+            for method, operation in path_item.items():
+                if method not in _HTTP_METHODS:
+                    continue
+                body_schema = (
+                    operation.get("requestBody", {}).get("content", {}).get("application/json", {}).get("schema")
+                )
+                if body_schema is not None:
+                    self.request_bodies[(path, method)] = self.compile(body_schema)
+                for status, response in operation.get("responses", {}).items():
+                    schema = response.get("content", {}).get("application/json", {}).get("schema")
+                    self.responses[(path, method, str(status))] = (
+                        self.compile(schema) if schema is not None else None
+                    )
+
+    def validate_response(self, path: str, method: str, status_code: int, data: Any) -> None:
+        """
+        Validate a response body against the documented schema.
+
+        Raises:
+            ContractViolation: if the response is undocumented or does not match
+        """
+        key = (path, method.lower(), str(status_code))
+        if key not in self.responses:
+            raise ContractViolation(f"{method.upper()} {path} {status_code} is not documented in the contract")
+        validator = self.responses[key]
+        if validator is not None:
+            validator(data)
+
+    def validate_request_body(self, path: str, method: str, data: Any) -> None:
+        """Validate a JSON request body; operations without a body schema accept anything"""
+        validator = self.request_bodies.get((path, method.lower()))
+        if validator is None:
+            return
+        try:
+            validator(data)
+        except ContractViolation as e:
+            e.subject = "request"
+            raise
+
+    def documents(self, path: str) -> bool:
+        """Whether the contract describes the path template at all"""
+        return path in self._paths
+
+    def schema_validator(self, name: str) -> Validator:
+        """Validator for a named component schema"""
+        return self._compile_ref(_REF_PREFIX + name)
+
+    # -- compilation -------------------------------------------------------
+
+    def compile(self, schema: Dict[str, Any]) -> Validator:
+        if "$ref" in schema:
+            return self._compile_ref(schema["$ref"])
+
+        checks: List[Validator] = []
+        schema_type = schema.get("type")
+        if schema_type == "object":
+            checks.append(self._compile_object(schema))
+        elif schema_type == "array":
+            checks.append(self._compile_array(schema))
+        elif schema_type == "string":
+            checks.append(self._compile_string(schema))
+        elif schema_type in ("integer", "number"):
+            checks.append(self._compile_number(schema, integer=schema_type == "integer"))
+        elif schema_type == "boolean":
+            checks.append(_expect_boolean)
+
+        if "enum" in schema:
+            checks.append(_compile_enum(schema["enum"]))
+        for keyword in ("oneOf", "anyOf", "allOf"):
+            if keyword in schema:
+                checks.append(self._compile_combinator(keyword, schema[keyword]))
+
+        validator = _chain(checks)
+        if schema.get("nullable"):
+            return _nullable(validator)
+        return validator
+
+    def _compile_ref(self, ref: str) -> Validator:
+        if ref in self._refs:
+            return self._refs[ref]
+        if not ref.startswith(_REF_PREFIX):
+            raise ValueError(f"Unsupported $ref: {ref}")
+
+        # Register a forwarding validator first so recursive schemas terminate
+        target: List[Validator] = []
+
+        def forward(data: Any) -> None:
+            target[0](data)
+
+        self._refs[ref] = forward
+        target.append(self.compile(self._schemas[ref[len(_REF_PREFIX):]]))
+        self._refs[ref] = target[0]
+        return target[0]
+
+    def _compile_object(self, schema: Dict[str, Any]) -> Validator:
+        required = tuple(schema.get("required", ()))
+        properties = {name: self.compile(prop) for name, prop in schema.get("properties", {}).items()}
+
+        def validate(data: Any) -> None:
+            if not isinstance(data, dict):
+                raise ContractViolation(f"Expected object, got {_type_name(data)}")
+            for name in required:
+                if name not in data:
+                    raise ContractViolation(f"Missing required field '{name}'")
+            for name, value in data.items():
+                check = properties.get(name)
+                if check is None:
+                    continue
+                try:
+                    check(value)
+                except ContractViolation as e:
+                    e.location.insert(0, f".{name}")
+                    raise
+        return validate
+
+    def _compile_array(self, schema: Dict[str, Any]) -> Validator:
+        item_check = self.compile(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+
+        def validate(data: Any) -> None:
+            if not isinstance(data, list):
+                raise ContractViolation(f"Expected array, got {_type_name(data)}")
+            if min_items is not None and len(data) < min_items:
+                raise ContractViolation(f"Array length {len(data)} < minimum {min_items}")
+            if max_items is not None and len(data) > max_items:
+                raise ContractViolation(f"Array length {len(data)} > maximum {max_items}")
+            if item_check is None:
+                return
+            for index, item in enumerate(data):
+                try:
+                    item_check(item)
+                except ContractViolation as e:
+                    e.location.insert(0, f"[{index}]")
+                    raise
+        return validate
+
+    def _compile_string(self, schema: Dict[str, Any]) -> Validator:
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        date_time = schema.get("format") == "date-time"
+
+        def validate(data: Any) -> None:
+            if not isinstance(data, str):
+                raise ContractViolation(f"Expected string, got {_type_name(data)}")
+            if min_length is not None and len(data) < min_length:
+                raise ContractViolation(f"String length {len(data)} < minimum {min_length}")
+            if max_length is not None and len(data) > max_length:
+                raise ContractViolation(f"String length {len(data)} > maximum {max_length}")
+            if pattern is not None and not pattern.search(data):
+                raise ContractViolation(f"Value '{data}' does not match pattern {pattern.pattern}")
+            if date_time and not _is_date_time(data):
+                raise ContractViolation(f"Expected ISO 8601 date-time format, got '{data}'")
+        return validate
+
+    def _compile_number(self, schema: Dict[str, Any], integer: bool) -> Validator:
+        accepted = int if integer else (int, float)
+        expected = "integer" if integer else "number"
+        minimum = schema.get("minimum")
+        maximum = schema.get("maximum")
+
+        def validate(data: Any) -> None:
+            if not isinstance(data, accepted) or isinstance(data, bool):
+                raise ContractViolation(f"Expected {expected}, got {_type_name(data)}")
+            if minimum is not None and data < minimum:
+                raise ContractViolation(f"Value {data} < minimum {minimum}")
+            if maximum is not None and data > maximum:
+                raise ContractViolation(f"Value {data} > maximum {maximum}")
+        return validate
+
+    def _compile_combinator(self, keyword: str, schemas: List[Dict[str, Any]]) -> Validator:
+        options = [self.compile(option) for option in schemas]
+
+        def passes(check: Validator, data: Any) -> bool:
+            try:
+                check(data)
+            except ContractViolation:
+                return False
+            return True
+
+        def validate(data: Any) -> None:
+            matched = sum(passes(check, data) for check in options)
+            if keyword == "allOf" and matched != len(options):
+                raise ContractViolation("Value does not match all allOf schemas")
+            if keyword == "anyOf" and matched == 0:
+                raise ContractViolation("Value matches none of the anyOf schemas")
+            if keyword == "oneOf" and matched != 1:
+                raise ContractViolation(f"Value matches {matched} oneOf schemas, expected exactly 1")
+        return validate
+
+
+def _expect_boolean(data: Any) -> None:
+    if not isinstance(data, bool):
+        raise ContractViolation(f"Expected boolean, got {_type_name(data)}")
+
+
+def _compile_enum(values: List[Any]) -> Validator:
+    allowed = frozenset(values)
+
+    def validate(data: Any) -> None:
+        try:
+            ok = data in allowed
+        except TypeError:
+            ok = False
+        if not ok:
+            raise ContractViolation(f"Value '{data}' not in allowed enum values {values}")
+    return validate
+
+
+def _chain(checks: List[Validator]) -> Validator:
+    if not checks:
+        return lambda data: None
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(data: Any) -> None:
+        for check in checks:
+            check(data)
+    return validate
+
+
+def _nullable(check: Validator) -> Validator:
+    def validate(data: Any) -> None:
+        if data is not None:
+            check(data)
+    return validate
+
+
+@lru_cache(maxsize=None)
+def _load_contract(path: str, mtime: float) -> CompiledContract:
+    import yaml
+
+    with open(path, "r") as f:
+        return CompiledContract(yaml.safe_load(f))
+
+
+def load_contract(path: Optional[Path] = None) -> CompiledContract:
+    """Compiled contract for `path`, recompiled only when the file changes"""
+    resolved = Path(path or DEFAULT_CONTRACT_PATH).resolve()
+    return _load_contract(str(resolved), resolved.stat().st_mtime)
+
+
+# Results counted in strangler_contract_checks_total
+CHECK_OK = "ok"
+CHECK_RESPONSE_VIOLATION = "response_violation"
+CHECK_REQUEST_VIOLATION = "request_violation"
+CHECK_UNDOCUMENTED = "undocumented"
+CHECK_INVALID_JSON = "invalid_json"
+CHECK_TOO_LARGE = "too_large"
+CHECK_SKIPPED = "skipped"
+
+# Largest request or response body buffered for a sampled check
+DEFAULT_MAX_SAMPLED_BODY = 1024 * 1024
+
+# Sampled checks allowed to run or wait at once; bounds the buffered bodies too
+DEFAULT_MAX_PENDING_CHECKS = 4
+
+
+class ContractMiddleware:
+    """ASGI middleware validating a sample of requests and responses against the contract"""
+
+    def __init__(
+        self,
+        app,
+        contract: Optional[CompiledContract] = None,
+        sample_every: int = 1,
+        registry: MetricsRegistry = REGISTRY,
+        max_body_bytes: int = DEFAULT_MAX_SAMPLED_BODY,
+        max_pending_checks: int = DEFAULT_MAX_PENDING_CHECKS,
+    ):
+        """
+        Args:
+            contract: compiled contract; defaults to load_contract()
+            sample_every: validate one request in every N; 0 disables validation
+            max_body_bytes: a sampled request whose request or response body is
+                larger is not buffered further and is counted as too_large
+            max_pending_checks: a sample taken while this many checks are
+                still running is counted as skipped instead of checked
+        """
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.max_pending_checks = max_pending_checks
+        self.sample_every = sample_every
+        self.registry = registry
+        self.contract = contract
+        if sample_every > 0 and contract is None:
+            # Compile now so no request pays for it
+            try:
+                self.contract = load_contract()
+            except OSError as e:
+                logger.warning("Contract validation disabled, cannot read contract: %s", e)
+                self.sample_every = 0
+        self._seen = 0
+        self._pending: Set[asyncio.Task] = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.sample_every <= 0:
+            await self.app(scope, receive, send)
+            return
+        self._seen += 1
+        if self._seen < self.sample_every:
+            await self.app(scope, receive, send)
+            return
+        self._seen = 0
+
+        request_chunks: List[bytes] = []
+        response_chunks: List[bytes] = []
+        response = [500, False]  # status, JSON body
+        buffered = [0, 0]  # request bytes, response bytes; -1 once over the cap
+
+        def buffer(chunks: List[bytes], index: int, body: bytes) -> None:
+            if buffered[index] < 0:
+                return
+            buffered[index] += len(body)
+            if buffered[index] > self.max_body_bytes:
+                buffered[index] = -1
+                chunks.clear()
+            else:
+                chunks.append(body)
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                buffer(request_chunks, 0, message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response[0] = message["status"]
+                response[1] = any(
+                    name.lower() == b"content-type" and value.startswith(b"application/json")
+                    for name, value in message.get("headers", ())
+                )
+            elif message["type"] == "http.response.body" and response[1]:
+                buffer(response_chunks, 1, message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive_wrapper, send_wrapper)
+        route = scope.get("route")
+        path = route.path if route is not None else UNMATCHED_ROUTE
+        method = scope["method"]
+        if not self.contract.documents(path):
+            return
+        if min(buffered) < 0:
+            self.registry.count_contract_check(method, path, CHECK_TOO_LARGE)
+        elif len(self._pending) >= self.max_pending_checks:
+            self.registry.count_contract_check(method, path, CHECK_SKIPPED)
+        else:
+            # Detached so neither this request nor the middleware around it
+            # waits for validation
+            task = asyncio.create_task(self._check_later(
+                path, method, b"".join(request_chunks), response[0], response[1], b"".join(response_chunks),
+            ))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def drain(self) -> None:
+        """Wait until every started check has been counted"""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def _check_later(self, path: str, method: str, request_body: bytes, status: int,
+                           json_response: bool, response_body: bytes) -> None:
+        """Validate in a worker thread, keeping the loop free while large payloads are checked"""
+        result = await asyncio.to_thread(
+            self._check, path, method, request_body, status, json_response, response_body,
+        )
+        self.registry.count_contract_check(method, path, result)
+
+    def _check(self, path: str, method: str, request_body: bytes, status: int, json_response: bool,
+               response_body: bytes) -> str:
+        """Contract check result for one documented request/response pair"""
+        contract = self.contract
+        result = CHECK_OK
+        try:
+            if request_body:
+                contract.validate_request_body(path, method, json.loads(request_body))
+            if (path, method.lower(), str(status)) not in contract.responses:
+                result = CHECK_UNDOCUMENTED
+            elif json_response:
+                contract.validate_response(path, method, status, json.loads(response_body))
+        except ValueError as e:
+            if isinstance(e, ContractViolation):
+                result = CHECK_REQUEST_VIOLATION if e.subject == "request" else CHECK_RESPONSE_VIOLATION
+            else:
+                result = CHECK_INVALID_JSON
+            logger.warning("Contract check failed for %s %s (%s): %s", method, path, status, e)
+        return result
@@ -72,3 +72,15 @@ def get_seed_data() -> list[StudentRequest]:
             notes="Shape-shifting ethics course - mandatory for graduation"
         ),
     ]
+
+
+def get_synthetic_data(count: int) -> list[StudentRequest]:
+    """
+    Returns `count` Student Requests cycled from the seed data with unique IDs.
+    Used by benchmarks and large-dataset tests; never loaded by the API itself.
+    """
+    seed_data = get_seed_data()
+    return [
+        seed_data[index % len(seed_data)].model_copy(update={"id": index + 1})
+        for index in range(count)
+    ]
@@ -1,7 +1,27 @@
-from fastapi import FastAPI, HTTPException
+import csv
+import io
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from app.models import StudentRequest
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from app.models import StudentRequest, ExportFormat, BatchGetRequest, BatchGetResponse
 from app.data.seed_data import get_seed_data
+from app.data.snapshot import SnapshotError, load_snapshot
+from app.metrics import PROMETHEUS_MEDIA_TYPE, REGISTRY, MetricsMiddleware
+from app.contract import ContractMiddleware
+from app.responses import (
+    FAST_JSON_ENABLED,
+    FastJSONResponse,
+    TimedJSONResponse,
+    render_model,
+    render_requests,
+)
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -10,7 +30,8 @@ app = FastAPI(
     version="1.0.0",
     contact={
         "name": "Strangler Studio"
-    }
+    },
+    default_response_class=FastJSONResponse if FAST_JSON_ENABLED else TimedJSONResponse,
 )
 
 # Configure CORS middleware to allow cross-origin requests
@@ -22,16 +43,93 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load seed data on startup
+# Validate one in every N requests against contracts/openapi.yaml (0 = off)
+CONTRACT_SAMPLE_EVERY = int(os.getenv("CONTRACT_SAMPLE_EVERY", "0"))
+
+if CONTRACT_SAMPLE_EVERY > 0:
+    app.add_middleware(ContractMiddleware, sample_every=CONTRACT_SAMPLE_EVERY)
+
+# Record per-route latency and in-flight requests (outermost middleware)
+app.add_middleware(MetricsMiddleware)
+
+# Load seed data on startup (or on first use when LAZY_SEED=1)
 student_requests: dict[int, StudentRequest] = {}
 
+# Restore the store from a pre-built snapshot instead of the seed data
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH")
+
+# Defer loading the store until the first data or readiness request
+LAZY_SEED = os.getenv("LAZY_SEED", "0") == "1"
+
+_store_ready = False
+_store_lock = threading.Lock()
+
+REGISTRY.register_gauge(
+    "strangler_store_requests",
+    "Number of Student Requests in the store",
+    lambda: len(student_requests),
+)
+
+# Number of records serialized per chunk in /requests/export. Bounds the
+# memory held by the stream regardless of how many records are stored.
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_FIELDS = list(StudentRequest.model_fields)
+
+# Upper bound on IDs accepted by a single batch lookup
+MAX_BATCH_IDS = 1000
+
+# Same pattern as the `ids` parameter in contracts/openapi.yaml
+IDS_PATTERN = re.compile(r"\d+(,\d+)*", re.ASCII)
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _default_records() -> Sequence[StudentRequest]:
+    """Snapshot contents when SNAPSHOT_PATH is configured, else the seed data"""
+    if SNAPSHOT_PATH:
+        return load_snapshot(Path(SNAPSHOT_PATH))
+    return get_seed_data()
+
+
+def _fill_store(records: Sequence[StudentRequest]) -> None:
+    """Replace the store contents and mark it ready; caller holds _store_lock"""
+    global _store_ready
+    student_requests.clear()
+    for request in records:
+        student_requests[request.id] = request
+    _store_ready = True
+
+
+def load_student_requests(records: Optional[Sequence[StudentRequest]] = None) -> None:
+    """
+    Replace the store contents and mark it ready.
+    
+    Args:
+        records: Requests to load. Defaults to the snapshot at SNAPSHOT_PATH
+            when configured, otherwise the deterministic seed data.
+    """
+    with _store_lock:
+        _fill_store(_default_records() if records is None else records)
+
+
+def get_store() -> dict[int, StudentRequest]:
+    """Return the request store, loading it first if seeding was deferred"""
+    if not _store_ready:
+        with _store_lock:
+            if not _store_ready:
+                _fill_store(_default_records())
+    return student_requests
+
 
 @app.on_event("startup")
 async def startup_event():
     """Load deterministic seed data when the application starts"""
-    seed_data = get_seed_data()
-    for request in seed_data:
-        student_requests[request.id] = request
+    if not LAZY_SEED:
+        load_student_requests()
 
 
 @app.get("/health")
@@ -43,15 +141,183 @@ async def health_check():
     return {"status": "healthy", "service": "strangler-studio-api"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint for load balancers and autoscalers.
+    
+    Unlike /health (process liveness), this returns 200 only once the store
+    is loaded. With LAZY_SEED=1 the first readiness probe performs the load,
+    so the process can accept connections before the dataset is restored.
+    Returns 503 if the store cannot be loaded.
+    """
+    try:
+        store = get_store()
+    except SnapshotError as e:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "detail": str(e)})
+    return {"status": "ready", "service": "strangler-studio-api", "requests": len(store)}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus scrape endpoint.
+    
+    Exposes per-route request counts and latency histograms, in-flight
+    requests, response serialization time and store cardinality.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+def _get_many(ids: list[int]) -> tuple[list[StudentRequest], list[int]]:
+    """
+    Look up several Student Requests in a single pass over the store.
+    
+    Duplicate IDs are collapsed; results keep the order of first appearance.
+    
+    Returns:
+        Tuple of (found requests, missing IDs)
+    """
+    found: list[StudentRequest] = []
+    missing: list[int] = []
+    store = get_store()
+    for request_id in dict.fromkeys(ids):
+        request = store.get(request_id)
+        if request is None:
+            missing.append(request_id)
+        else:
+            found.append(request)
+    return found, missing
+
+
+def _parse_ids(raw_ids: str) -> list[int]:
+    """Parse a comma-separated `ids` query parameter into integers"""
+    if not IDS_PATTERN.fullmatch(raw_ids):
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    ids = [int(part) for part in raw_ids.split(",")]
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"ids accepts at most {MAX_BATCH_IDS} IDs")
+    return ids
+
+
 @app.get("/requests", response_model=list[StudentRequest], tags=["requests"])
-async def list_requests():
+async def list_requests(
+    ids: Optional[str] = Query(None, description="Comma-separated IDs to fetch instead of the full list"),
+):
     """
     List all Student Requests.
     
     Returns a list of all Student Request objects in the system.
+    When `ids` is given, only the matching requests are returned (unknown
+    IDs are skipped; use POST /requests:batchGet to learn which were missing).
     Conforms to the OpenAPI contract specification.
     """
-    return list(student_requests.values())
+    if ids is not None:
+        requests, _ = _get_many(_parse_ids(ids))
+    else:
+        requests = list(get_store().values())
+    if FAST_JSON_ENABLED:
+        return render_requests(requests)
+    return requests
+
+
+def _normalize_watermark(since: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware watermark to the naive UTC form used by the store"""
+    if since is not None and since.tzinfo is not None:
+        return since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def _iter_export_records(since: Optional[datetime]) -> Iterator[StudentRequest]:
+    """Yield stored requests created strictly after the watermark"""
+    for request in get_store().values():
+        if since is None or request.created_at > since:
+            yield request
+
+
+def _iter_ndjson(since: Optional[datetime]) -> Iterator[bytes]:
+    """Stream records as newline-delimited JSON in bounded chunks"""
+    batch: list[str] = []
+    for request in _iter_export_records(since):
+        batch.append(request.model_dump_json())
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield ("\n".join(batch) + "\n").encode("utf-8")
+            batch.clear()
+    if batch:
+        yield ("\n".join(batch) + "\n").encode("utf-8")
+
+
+def _iter_csv(since: Optional[datetime]) -> Iterator[bytes]:
+    """Stream records as CSV (with a header row) in bounded chunks"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    rows = 0
+    for request in _iter_export_records(since):
+        row = request.model_dump(mode="json")
+        writer.writerow([row[field] for field in EXPORT_FIELDS])
+        rows += 1
+        if rows >= EXPORT_BATCH_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+@app.get("/requests/export", tags=["requests"])
+async def export_requests(
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Export serialization format"),
+    since: Optional[datetime] = Query(None, description="Only export requests created after this timestamp"),
+):
+    """
+    Stream all Student Requests for bulk export.
+    
+    Records are serialized lazily in fixed-size chunks straight from the store,
+    so memory use stays constant no matter how many requests exist. The ASGI
+    server pulls the next chunk only once the previous one has been sent,
+    which gives slow consumers natural backpressure.
+    
+    Args:
+        format: ndjson (default) or csv
+        since: Watermark for incremental syncs; only requests with a
+            created_at strictly greater than this value are exported.
+            Naive timestamps are treated as UTC.
+    
+    Returns:
+        StreamingResponse with one record per line
+    """
+    watermark = _normalize_watermark(since)
+    if format == ExportFormat.CSV:
+        body = _iter_csv(watermark)
+    else:
+        body = _iter_ndjson(watermark)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="student-requests.{format.value}"'
+        },
+    )
+
+
+@app.post("/requests:batchGet", response_model=BatchGetResponse, tags=["requests"])
+async def batch_get_requests(body: BatchGetRequest):
+    """
+    Get several Student Requests by ID in one round trip.
+    
+    Replaces N calls to GET /requests/{id} with a single multi-get against
+    the store.
+    
+    Returns:
+        BatchGetResponse with the found requests and the missing IDs
+    """
+    found, missing = _get_many(body.ids)
+    result = BatchGetResponse(requests=found, missing=missing)
+    if FAST_JSON_ENABLED:
+        return render_model(result)
+    return result
 
 
 @app.get("/requests/{id}", response_model=StudentRequest, tags=["requests"])
@@ -71,7 +337,10 @@ async def get_request_by_id(id: int):
     Raises:
         HTTPException: 404 if request not found
     """
-    if id not in student_requests:
+    request = get_store().get(id)
+    if request is None:
         raise HTTPException(status_code=404, detail="Request not found")
     
-    return student_requests[id]
+    if FAST_JSON_ENABLED:
+        return render_model(request)
+    return request
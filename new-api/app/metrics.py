@@ -0,0 +1,184 @@
+"""
+Prometheus-style metrics for the Strangler Studio API.
+
+MetricsMiddleware is a raw ASGI middleware (no Request/Response objects are
+built) that records per-route request counts, latency histograms and
+in-flight requests. Histogram buckets are preallocated lists indexed with
+bisect, so recording an observation is a handful of list operations and no
+allocation. The registry is rendered in the Prometheus text exposition
+format by the /metrics endpoint.
+"""
+
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Upper bounds in seconds; the implicit final bucket is +Inf
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative-on-render histogram with preallocated bucket counters"""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        """Yield exposition lines; `labels` is a preformatted label list or ''"""
+        separator = "," if labels else ""
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            cumulative += bucket_count
+            yield f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels}{separator}le="+Inf"}} {self.count}'
+        suffix = f"{{{labels}}}" if labels else ""
+        yield f"{name}_sum{suffix} {self.total}"
+        yield f"{name}_count{suffix} {self.count}"
+
+
+class MetricsRegistry:
+    """Holds every metric exposed on /metrics"""
+
+    def __init__(self):
+        self.request_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.in_flight = 0
+        self.serialization = Histogram()
+        self.gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        # (method, route, result) -> sampled contract checks
+        self.contract_checks: Dict[Tuple[str, str, str], int] = {}
+
+    def latency_histogram(self, method: str, route: str) -> Histogram:
+        key = (method, route)
+        histogram = self.request_latency.get(key)
+        if histogram is None:
+            histogram = self.request_latency[key] = Histogram()
+        return histogram
+
+    def count_contract_check(self, method: str, route: str, result: str) -> None:
+        key = (method, route, result)
+        self.contract_checks[key] = self.contract_checks.get(key, 0) + 1
+
+    def register_gauge(self, name: str, help_text: str, callback: Callable[[], float]) -> None:
+        """Expose a value computed at scrape time (e.g. store cardinality)"""
+        self.gauges[name] = (help_text, callback)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = [
+            "# HELP strangler_http_requests_total HTTP responses by method, route and status",
+            "# TYPE strangler_http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(
+                f'strangler_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {count}'
+            )
+
+        lines += [
+            "# HELP strangler_http_request_duration_seconds Request latency by method and route",
+            "# TYPE strangler_http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.request_latency.items()):
+            lines.extend(histogram.render(
+                "strangler_http_request_duration_seconds", f'method="{method}",route="{route}"'
+            ))
+
+        lines += [
+            "# HELP strangler_http_requests_in_flight Requests currently being handled",
+            "# TYPE strangler_http_requests_in_flight gauge",
+            f"strangler_http_requests_in_flight {self.in_flight}",
+            "# HELP strangler_serialization_duration_seconds Time spent serializing response bodies",
+            "# TYPE strangler_serialization_duration_seconds histogram",
+        ]
+        lines.extend(self.serialization.render("strangler_serialization_duration_seconds", ""))
+
+        if self.contract_checks:
+            lines += [
+                "# HELP strangler_contract_checks_total Sampled contract validations by method, route and result",
+                "# TYPE strangler_contract_checks_total counter",
+            ]
+            for (method, route, result), count in sorted(self.contract_checks.items()):
+                lines.append(
+                    f'strangler_contract_checks_total{{method="{method}",route="{route}",result="{result}"}} {count}'
+                )
+
+        for name, (help_text, callback) in sorted(self.gauges.items()):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {callback()}"]
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and in-flight counts per route"""
+
+    def __init__(self, app, registry: MetricsRegistry = REGISTRY):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - start
+            registry.in_flight -= 1
+            # The router stores the matched route in the (shared) scope dict
+            route = scope.get("route")
+            key = (scope["method"], route.path if route is not None else UNMATCHED_ROUTE)
+            histogram = registry.request_latency.get(key)
+            if histogram is None:
+                histogram = registry.latency_histogram(*key)
+            histogram.observe(elapsed)
+            response_key = key + (status[0],)
+            responses = registry.responses
+            responses[response_key] = responses.get(response_key, 0) + 1
+
+
+class timed_serialization:
+    """Context manager recording serialization time into the registry"""
+
+    __slots__ = ("registry", "start")
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.registry = registry
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.serialization.observe(perf_counter() - self.start)
+        return False
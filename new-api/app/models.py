@@ -19,6 +19,12 @@ class PriorityEnum(str, Enum):
     LOW = "Low"
 
 
+class ExportFormat(str, Enum):
+    """Serialization formats supported by the bulk export endpoint"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class StudentRequest(BaseModel):
     """
     Represents a request submitted by a student.
@@ -44,3 +50,14 @@ class StudentRequest(BaseModel):
                 "notes": "Urgent reanimation assistance required"
             }
         }
+
+
+class BatchGetRequest(BaseModel):
+    """Request body for fetching several Student Requests in one round trip"""
+    ids: list[int] = Field(..., min_length=1, max_length=1000, description="IDs of the Student Requests to fetch")
+
+
+class BatchGetResponse(BaseModel):
+    """Found Student Requests plus the requested IDs that do not exist"""
+    requests: list[StudentRequest] = Field(..., description="Student Requests found, in request order")
+    missing: list[int] = Field(..., description="Requested IDs with no matching Student Request")
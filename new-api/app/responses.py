@@ -0,0 +1,69 @@
+"""
+High-performance JSON serialization for Student Request endpoints.
+
+The default FastAPI path validates the return value against the
+response_model, converts it to plain Python objects and then runs
+json.dumps over the result. Records in the store are already validated
+StudentRequest instances, so the fast mode serializes them straight to
+bytes with pydantic-core and skips the intermediate objects entirely.
+
+Enable with the FAST_JSON=1 environment variable.
+"""
+
+import os
+from functools import lru_cache
+from typing import Any, Sequence
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.metrics import timed_serialization
+from app.models import StudentRequest
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+FAST_JSON_ENABLED = os.getenv("FAST_JSON", "0") == "1"
+
+JSON_MEDIA_TYPE = "application/json"
+
+@lru_cache(maxsize=1)
+def _request_list_adapter() -> TypeAdapter:
+    """Bulk list serializer, built on first use to keep cold start cheap"""
+    return TypeAdapter(list[StudentRequest])
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records its render time in the metrics registry"""
+
+    def render(self, content: Any) -> bytes:
+        with timed_serialization():
+            return self._dump(content)
+
+    def _dump(self, content: Any) -> bytes:
+        return super().render(content)
+
+
+class FastJSONResponse(TimedJSONResponse):
+    """JSONResponse rendered with orjson when it is installed"""
+
+    def _dump(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return super()._dump(content)
+
+
+def render_model(model: BaseModel) -> Response:
+    """Serialize a single model (e.g. a Student Request) directly to a JSON response"""
+    with timed_serialization():
+        content = model.model_dump_json()
+    return Response(content=content, media_type=JSON_MEDIA_TYPE)
+
+
+def render_requests(requests: Sequence[StudentRequest]) -> Response:
+    """Serialize a list of Student Requests to a JSON array in one pass"""
+    with timed_serialization():
+        content = _request_list_adapter().dump_json(list(requests))
+    return Response(content=content, media_type=JSON_MEDIA_TYPE)
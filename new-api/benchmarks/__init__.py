@@ -0,0 +1 @@
+# Benchmarks for the Strangler Studio API
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: time from process start to first 200.
+
+Launches a fresh uvicorn process per run and polls the API until /health,
+/ready and a data route answer 200, recording the elapsed time for each.
+Pass environment overrides to compare eager seeding, LAZY_SEED=1 and
+SNAPSHOT_PATH restores.
+
+Usage (from the new-api directory):
+    python -m benchmarks.bench_cold_start
+    python -m benchmarks.bench_cold_start --env LAZY_SEED=1 --runs 10
+    python -m app.data.snapshot /tmp/requests.snap --rows 100000
+    python -m benchmarks.bench_cold_start --env SNAPSHOT_PATH=/tmp/requests.snap
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.common import environment_info, write_results
+
+PROBE_PATHS = ["/health", "/ready", "/requests/1"]
+POLL_INTERVAL = 0.005
+
+
+def free_port() -> int:
+    """Ask the OS for an unused TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_ok(url: str, deadline: float) -> Optional[float]:
+    """Poll `url` until it returns 200; return the monotonic time it did"""
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.monotonic()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(POLL_INTERVAL)
+    return None
+
+
+def cold_start(env: Dict[str, str], timeout: float) -> Dict[str, Optional[float]]:
+    """Start one server process and time each probe path's first 200 (ms)"""
+    port = free_port()
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        timings = {}
+        deadline = started + timeout
+        for path in PROBE_PATHS:
+            ok_at = first_ok(f"http://127.0.0.1:{port}{path}", deadline)
+            timings[path] = round((ok_at - started) * 1000, 2) if ok_at else None
+        return timings
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait per start")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Extra environment variable")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/cold_start.json"))
+    args = parser.parse_args()
+
+    overrides = dict(item.split("=", 1) for item in args.env)
+    env = {**os.environ, **overrides}
+
+    runs: List[Dict[str, Optional[float]]] = []
+    for run in range(1, args.runs + 1):
+        timings = cold_start(env, args.timeout)
+        runs.append(timings)
+        print(f"Run {run}: " + ", ".join(f"{path} {ms} ms" for path, ms in timings.items()))
+
+    medians = {}
+    for path in PROBE_PATHS:
+        samples = [run[path] for run in runs if run[path] is not None]
+        medians[path] = round(statistics.median(samples), 2) if samples else None
+    print("Median time to first 200: " + ", ".join(f"{path} {ms} ms" for path, ms in medians.items()))
+
+    write_results({
+        "benchmark": "cold_start",
+        "environment": environment_info(),
+        "overrides": overrides,
+        "median_ms": medians,
+        "runs": runs,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Overhead of the contract validation middleware.
+
+Drives a stub ASGI app directly (no HTTP, no FastAPI routing). The stub
+answers GET /requests with a pre-serialized list of Student Requests.
+Each request runs with and without ContractMiddleware, at 100% sampling
+(every request validated) and at 1% (one in 100), and the benchmark
+reports the added cost per request. Checks run as background tasks, so the
+timing includes draining them. The pending-check bound is lifted, so every
+sample is checked rather than skipped.
+
+Usage (from the new-api directory):
+    python -m benchmarks.bench_contract_overhead --rows 7
+    python -m benchmarks.bench_contract_overhead --rows 1000 --iterations 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from app.contract import ContractMiddleware, load_contract
+from app.data.seed_data import get_synthetic_data
+from app.metrics import MetricsRegistry
+from benchmarks.common import environment_info, write_results
+
+
+class _Route:
+    path = "/requests"
+
+
+_ROUTE = _Route()
+
+
+def make_app(rows: int):
+    """Stub for the routed app: sets the route and sends a fixed JSON body"""
+    body = json.dumps([request.model_dump(mode="json") for request in get_synthetic_data(rows)]).encode()
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    async def app(scope, receive, send):
+        scope["route"] = _ROUTE
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    return app, len(body)
+
+
+async def drive(app, iterations: int) -> float:
+    """Average seconds per request for `app`, including any checks it left running"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app({"type": "http", "method": "GET", "path": "/requests"}, receive, send)
+    if isinstance(app, ContractMiddleware):
+        await app.drain()
+    return (time.perf_counter() - start) / iterations
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=7, help="Records in each response body")
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/contract_overhead.json"))
+    args = parser.parse_args()
+
+    contract = load_contract()
+    app, body_bytes = make_app(args.rows)
+
+    baseline = asyncio.run(drive(app, args.iterations))
+    results = {}
+    for label, sample_every in (("100%", 1), ("1%", 100)):
+        registry = MetricsRegistry()
+        middleware = ContractMiddleware(app, contract=contract, sample_every=sample_every, registry=registry,
+                                        max_pending_checks=args.iterations)
+        per_request = asyncio.run(drive(middleware, args.iterations))
+        violations = sum(count for (_, _, result), count in registry.contract_checks.items() if result != "ok")
+        assert violations == 0, f"Stub responses violated the contract: {registry.contract_checks}"
+        results[label] = {
+            "sample_every": sample_every,
+            "per_request_ns": round(per_request * 1e9, 1),
+            "overhead_ns": round((per_request - baseline) * 1e9, 1),
+            "checks": sum(registry.contract_checks.values()),
+        }
+
+    print(f"Response body: {args.rows} records, {body_bytes} bytes")
+    print(f"Unvalidated request:      {baseline * 1e9:10.0f} ns")
+    for label, result in results.items():
+        print(f"Sampling {label:>4}:            {result['per_request_ns']:10.0f} ns "
+              f"(+{result['overhead_ns']:.0f} ns per request)")
+
+    write_results({
+        "benchmark": "contract_overhead",
+        "environment": environment_info(),
+        "rows": args.rows,
+        "body_bytes": body_bytes,
+        "iterations": args.iterations,
+        "baseline_ns": round(baseline * 1e9, 1),
+        "sampling": results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main_cli()
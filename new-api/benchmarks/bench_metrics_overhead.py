@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Overhead of the metrics middleware.
+
+Drives a trivial ASGI app directly (no HTTP, no FastAPI routing) with and
+without MetricsMiddleware and reports the added cost per request, plus the
+raw cost of a single histogram observation.
+
+Usage (from the new-api directory):
+    python -m benchmarks.bench_metrics_overhead
+"""
+
+import argparse
+import asyncio
+import time
+import timeit
+from pathlib import Path
+
+from app.metrics import Histogram, MetricsMiddleware, MetricsRegistry
+from benchmarks.common import environment_info, write_results
+
+
+class _Route:
+    path = "/requests/{id}"
+
+
+_ROUTE = _Route()
+
+
+async def noop_app(scope, receive, send):
+    """Stand-in for the routed app: sets the route and sends an empty 200"""
+    scope["route"] = _ROUTE
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def drive(app, iterations: int) -> float:
+    """Average seconds per request for `app`"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app({"type": "http", "method": "GET", "path": "/requests/1"}, receive, send)
+    return (time.perf_counter() - start) / iterations
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/metrics_overhead.json"))
+    args = parser.parse_args()
+
+    histogram = Histogram()
+    observe_ns = timeit.timeit(lambda: histogram.observe(0.003), number=args.iterations) / args.iterations * 1e9
+
+    baseline = asyncio.run(drive(noop_app, args.iterations))
+    instrumented = asyncio.run(drive(MetricsMiddleware(noop_app, MetricsRegistry()), args.iterations))
+    overhead_ns = (instrumented - baseline) * 1e9
+
+    print(f"Histogram.observe:        {observe_ns:8.0f} ns")
+    print(f"Uninstrumented request:   {baseline * 1e9:8.0f} ns")
+    print(f"Instrumented request:     {instrumented * 1e9:8.0f} ns")
+    print(f"Middleware overhead:      {overhead_ns:8.0f} ns per request")
+
+    write_results({
+        "benchmark": "metrics_overhead",
+        "environment": environment_info(),
+        "observe_ns": round(observe_ns, 1),
+        "baseline_ns": round(baseline * 1e9, 1),
+        "instrumented_ns": round(instrumented * 1e9, 1),
+        "overhead_ns": round(overhead_ns, 1),
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the Student Request endpoints.
+
+Measures requests/sec and latency percentiles for GET /requests and
+GET /requests/{id} with the default FastAPI serializer and with the opt-in
+FAST_JSON mode, at several store sizes. Requests are issued in-process
+through httpx's ASGI transport so network noise does not mask
+serialization cost.
+
+FAST_JSON is read when the app is imported (it picks the app's default
+response class), so each mode runs in its own process with the
+environment variable set.
+
+Usage (from the new-api directory):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --rows 10 10000 --duration 2
+    python -m benchmarks.bench_serialization --mode fast --rows 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+import app.main as main
+from benchmarks.common import environment_info, populate_store, summarize, write_results
+
+DEFAULT_ROWS = [10, 10_000, 1_000_000]
+MODES = ["default", "fast"]
+MODE_ENV = {"default": "0", "fast": "1"}
+
+# Full-list responses at 1M rows take seconds each; always take a few samples
+MIN_SAMPLES = 3
+
+
+async def run_scenario(client: httpx.AsyncClient, paths: List[str], duration: float) -> Dict[str, float]:
+    """Issue requests sequentially for `duration` seconds and summarize latency"""
+    latencies: List[float] = []
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration or len(latencies) < MIN_SAMPLES:
+        path = random.choice(paths)
+        request_start = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - request_start)
+        assert response.status_code == 200, f"{path} returned {response.status_code}"
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run(rows_list: List[int], duration: float, mode: str) -> List[Dict]:
+    """Benchmark every (rows, endpoint) combination in this process's mode"""
+    if main.FAST_JSON_ENABLED != (mode == "fast"):
+        raise SystemExit(f"Mode {mode!r} needs FAST_JSON={MODE_ENV[mode]} set before the app is imported")
+    results = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for rows in rows_list:
+            print(f"Populating store with {rows:,} rows...")
+            populate_store(rows)
+            id_paths = [f"/requests/{random.randint(1, rows)}" for _ in range(1000)]
+            for endpoint, paths in (("/requests", ["/requests"]), ("/requests/{id}", id_paths)):
+                stats = await run_scenario(client, paths, duration)
+                results.append({"rows": rows, "mode": mode, "endpoint": endpoint, **stats})
+                print(
+                    f"  {mode:<8} {endpoint:<16} {stats['requests_per_sec']:>10} req/s"
+                    f"  p99 {stats['p99_ms']} ms"
+                )
+    return results
+
+
+def run_mode_process(mode: str, rows_list: List[int], duration: float) -> List[Dict]:
+    """Run one mode in a fresh interpreter with FAST_JSON set and return its results"""
+    with tempfile.TemporaryDirectory() as scratch:
+        output = Path(scratch) / f"{mode}.json"
+        command = [
+            sys.executable, "-m", "benchmarks.bench_serialization",
+            "--mode", mode, "--duration", str(duration), "--output", str(output),
+            "--rows", *(str(rows) for rows in rows_list),
+        ]
+        subprocess.run(command, env={**os.environ, "FAST_JSON": MODE_ENV[mode]}, check=True)
+        return json.loads(output.read_text())["results"]
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Store sizes to benchmark")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario")
+    parser.add_argument("--mode", choices=MODES, help="Run only this mode in the current process")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/serialization.json"))
+    args = parser.parse_args()
+
+    if args.mode:
+        results = asyncio.run(run(args.rows, args.duration, args.mode))
+    else:
+        results = [result for mode in MODES for result in run_mode_process(mode, args.rows, args.duration)]
+        results.sort(key=lambda result: result["rows"])
+    write_results({"benchmark": "serialization", "environment": environment_info(), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,54 @@
+"""
+Shared helpers for the Strangler Studio API benchmarks.
+"""
+
+import json
+import math
+import platform
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import app.main as main
+from app.data.seed_data import get_synthetic_data
+
+
+def populate_store(rows: int) -> None:
+    """Replace the in-memory store with `rows` synthetic Student Requests"""
+    main.load_student_requests(get_synthetic_data(rows))
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list of samples"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Summarize per-request latencies (seconds) into throughput and percentiles"""
+    samples = sorted(latencies)
+    return {
+        "requests": len(samples),
+        "requests_per_sec": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3) if samples else 0.0,
+    }
+
+
+def environment_info() -> Dict[str, str]:
+    """Details needed to compare results across machines and commits"""
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+def write_results(results: Dict, output: Path) -> None:
+    """Write benchmark results as pretty-printed JSON"""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {output}")
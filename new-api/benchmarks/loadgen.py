@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Asyncio load generator for the Strangler Studio stack.
+
+Drives a weighted mix of routes at a fixed concurrency and reports
+throughput and p50/p95/p99 latency overall and per route. It can target the
+new API in-process (httpx ASGI transport, no sockets) or a running gateway,
+where it also exercises the legacy PHP routes.
+
+Results are written as JSON. Pass --baseline with an earlier result file to
+print per-route deltas; the run fails if any route's p99 regresses by more
+than --max-regression.
+
+Usage (from the new-api directory):
+    python -m benchmarks.loadgen --target asgi --rows 10000 --concurrency 32
+    python -m benchmarks.loadgen --target http://localhost:8888 --duration 30
+    python -m benchmarks.loadgen --target asgi --baseline benchmarks/results/loadgen-main.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.common import environment_info, summarize, write_results
+
+ASGI_TARGET = "asgi"
+
+# (route label, path template, weight); {id} is filled with a random ID
+NEW_API_ROUTES = [
+    ("GET /requests", "{prefix}/requests", 1),
+    ("GET /requests/{id}", "{prefix}/requests/{id}", 8),
+]
+
+LEGACY_ROUTES = [
+    ("GET / (legacy)", "/", 1),
+    ("GET /requests?use_new=0 (legacy)", "/requests?use_new=0", 1),
+    ("GET /requests?use_new=1 (legacy via API)", "/requests?use_new=1", 1),
+]
+
+
+def build_route_mix(target: str, include_legacy: bool) -> List[Tuple[str, str, int]]:
+    """Routes to exercise; gateway targets reach the new API under /api"""
+    prefix = "" if target == ASGI_TARGET else "/api"
+    routes = [(label, path.replace("{prefix}", prefix), weight) for label, path, weight in NEW_API_ROUTES]
+    if include_legacy and target != ASGI_TARGET:
+        routes += LEGACY_ROUTES
+    return routes
+
+
+def make_client(target: str, concurrency: int, rows: int) -> httpx.AsyncClient:
+    """Client bound to the in-process app or to a base URL with pooled connections"""
+    if target == ASGI_TARGET:
+        import app.main as main
+        from app.data.seed_data import get_synthetic_data
+
+        main.load_student_requests(get_synthetic_data(rows))
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://loadgen")
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return httpx.AsyncClient(base_url=target, limits=limits, timeout=30.0)
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    routes: List[Tuple[str, str, int]],
+    max_id: int,
+    deadline: float,
+    rng: random.Random,
+    latencies: Dict[str, List[float]],
+    statuses: Dict[str, Dict[str, int]],
+) -> None:
+    """Issue requests back-to-back until the deadline"""
+    labels = [route[0] for route in routes]
+    paths = [route[1] for route in routes]
+    weights = [route[2] for route in routes]
+    while time.perf_counter() < deadline:
+        index = rng.choices(range(len(routes)), weights=weights)[0]
+        label = labels[index]
+        path = paths[index].replace("{id}", str(rng.randint(1, max_id)))
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            outcome = str(response.status_code)
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        latencies[label].append(time.perf_counter() - start)
+        statuses[label][outcome] = statuses[label].get(outcome, 0) + 1
+
+
+async def run_load(args: argparse.Namespace) -> Dict:
+    """Run the configured load and return the result document"""
+    routes = build_route_mix(args.target, args.legacy)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[str, int]] = defaultdict(dict)
+    rng = random.Random(args.seed)
+
+    async with make_client(args.target, args.concurrency, args.rows) as client:
+        if args.warmup > 0:
+            warmup_deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(
+                worker(client, routes, args.max_id, warmup_deadline, random.Random(rng.random()),
+                       defaultdict(list), defaultdict(dict))
+                for _ in range(args.concurrency)
+            ))
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            worker(client, routes, args.max_id, deadline, random.Random(rng.random()), latencies, statuses)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "benchmark": "loadgen",
+        "environment": environment_info(),
+        "commit": current_commit(),
+        "config": {
+            "target": args.target,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "rows": args.rows if args.target == ASGI_TARGET else None,
+            "seed": args.seed,
+        },
+        "overall": summarize(all_latencies, elapsed),
+        "routes": {
+            label: {**summarize(samples, elapsed), "statuses": statuses[label]}
+            for label, samples in sorted(latencies.items())
+        },
+    }
+
+
+def current_commit() -> Optional[str]:
+    """Short hash of HEAD, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def relative_change(current: float, baseline: float) -> float:
+    """Fractional change from baseline (0.1 == 10% higher)"""
+    return (current - baseline) / baseline if baseline else 0.0
+
+
+def compare_to_baseline(result: Dict, baseline: Dict, max_regression: float) -> bool:
+    """Print per-route deltas; return False if any p99 regressed past the limit"""
+    ok = True
+    print(f"\nComparison with baseline ({baseline.get('commit') or 'unknown commit'}):")
+    for label, stats in result["routes"].items():
+        base = baseline.get("routes", {}).get(label)
+        if not base:
+            print(f"  {label}: no baseline")
+            continue
+        rps_delta = relative_change(stats["requests_per_sec"], base["requests_per_sec"])
+        p99_delta = relative_change(stats["p99_ms"], base["p99_ms"])
+        regressed = p99_delta > max_regression
+        ok = ok and not regressed
+        marker = "REGRESSION" if regressed else "ok"
+        print(f"  {label}: rps {rps_delta:+.1%}, p99 {p99_delta:+.1%} [{marker}]")
+    return ok
+
+
+def print_report(result: Dict) -> None:
+    overall = result["overall"]
+    print(f"Target: {result['config']['target']}  concurrency: {result['config']['concurrency']}")
+    print(
+        f"Overall: {overall['requests']} requests, {overall['requests_per_sec']} req/s, "
+        f"p50 {overall['p50_ms']} ms, p95 {overall['p95_ms']} ms, p99 {overall['p99_ms']} ms"
+    )
+    for label, stats in result["routes"].items():
+        print(
+            f"  {label:<42} {stats['requests_per_sec']:>9} req/s  p50 {stats['p50_ms']:>8} ms"
+            f"  p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms  {stats['statuses']}"
+        )
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default=ASGI_TARGET, help="'asgi' for in-process, or a base URL such as http://localhost:8888")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--rows", type=int, default=10_000, help="Store size for the in-process target")
+    parser.add_argument("--max-id", type=int, default=None, help="Highest ID to request (default: --rows, or 7 for a gateway)")
+    parser.add_argument("--no-legacy", dest="legacy", action="store_false", help="Skip legacy PHP routes on gateway targets")
+    parser.add_argument("--seed", type=int, default=1031)
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/loadgen.json"))
+    parser.add_argument("--baseline", type=Path, help="Earlier result JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="Allowed p99 increase (fraction)")
+    args = parser.parse_args()
+    if args.max_id is None:
+        args.max_id = args.rows if args.target == ASGI_TARGET else 7
+
+    result = asyncio.run(run_load(args))
+    print_report(result)
+    write_results(result, args.output)
+
+    if args.baseline and not compare_to_baseline(result, json.loads(args.baseline.read_text()), args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
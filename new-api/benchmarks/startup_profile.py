@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Import-time breakdown for the Strangler Studio API.
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter and
+reports the slowest modules and the cumulative cost per top-level package,
+so cold-start regressions can be traced to a specific import.
+
+Usage (from the new-api directory):
+    python -m benchmarks.startup_profile
+    python -m benchmarks.startup_profile --top 30 --output benchmarks/results/startup.json
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.common import environment_info, write_results
+
+TARGET_MODULE = "app.main"
+
+
+def collect_import_times(module: str, env: Dict[str, str]) -> List[Dict]:
+    """Import `module` in a subprocess and parse the -X importtime report"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return entries
+
+
+def by_package(entries: List[Dict]) -> Dict[str, int]:
+    """Total self time per top-level package, in microseconds"""
+    totals: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        totals[entry["module"].split(".")[0]] += entry["self_us"]
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default=TARGET_MODULE, help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Number of slowest modules to show")
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/startup_profile.json"))
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    entries = collect_import_times(args.module, env)
+    total_us = sum(entry["self_us"] for entry in entries)
+    slowest = sorted(entries, key=lambda entry: entry["self_us"], reverse=True)[:args.top]
+    packages = by_package(entries)
+
+    print(f"Total import time for {args.module}: {total_us / 1000:.1f} ms ({len(entries)} modules)\n")
+    print("Top packages (self time):")
+    for package, package_us in list(packages.items())[:args.top]:
+        print(f"  {package_us / 1000:>8.1f} ms  {package}")
+    print("\nSlowest modules (self time):")
+    for entry in slowest:
+        print(f"  {entry['self_us'] / 1000:>8.1f} ms  {entry['module']}")
+
+    write_results({
+        "benchmark": "startup_profile",
+        "environment": environment_info(),
+        "module": args.module,
+        "total_ms": round(total_us / 1000, 3),
+        "packages_ms": {name: round(us / 1000, 3) for name, us in packages.items()},
+        "slowest_modules": slowest,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main_cli()
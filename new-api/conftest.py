@@ -0,0 +1,45 @@
+"""
+Pytest configuration for the New API test suites.
+
+Adds test sharding so the property suites can be split across processes or
+CI jobs: `--shard=2/4` (or PYTEST_SHARD=2/4) keeps every fourth collected
+test starting with the second. Tests are dealt out by sorted node ID, so
+each shard is stable across runs and the shards together cover the suite
+exactly once. run_tests.py runs all shards in parallel locally.
+"""
+
+import os
+
+import pytest
+
+
+def parse_shard(value: str):
+    """'2/4' -> (1, 4): zero-based shard index and shard count"""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise pytest.UsageError(f"Invalid shard '{value}', expected INDEX/COUNT such as 1/4")
+    if count < 1 or not 1 <= index <= count:
+        raise pytest.UsageError(f"Invalid shard '{value}', INDEX must be between 1 and COUNT")
+    return index - 1, count
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--shard",
+        default=os.getenv("PYTEST_SHARD"),
+        help="Run only shard INDEX/COUNT of the collected tests (1-based), e.g. 2/4",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    value = config.getoption("--shard")
+    if not value:
+        return
+    index, count = parse_shard(value)
+    ordered = sorted(items, key=lambda item: item.nodeid)
+    selected_ids = {item.nodeid for position, item in enumerate(ordered) if position % count == index}
+    deselected = [item for item in items if item.nodeid not in selected_ids]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected_ids]
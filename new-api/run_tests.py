@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Run the New API test suites sharded across parallel processes.
+
+Each shard is a separate pytest process (see conftest.py), so every shard
+gets its own app instance, TestClient and Hypothesis engine. Output of each
+shard is printed when it finishes; the exit code is non-zero if any shard
+failed.
+
+Usage (from the new-api directory):
+    python run_tests.py                       # tests/, one shard per CPU
+    python run_tests.py --shards 4 tests/test_property_export.py -x
+Extra arguments go to pytest.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# pytest exit code when a shard ends up with no tests
+NO_TESTS_COLLECTED = 5
+
+
+def run_shard(index: int, count: int, pytest_args) -> tuple:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", f"--shard={index}/{count}", *pytest_args],
+        capture_output=True,
+        text=True,
+    )
+    return index, completed.returncode, completed.stdout + completed.stderr, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="Number of parallel shards")
+    args, pytest_args = parser.parse_known_args()
+    if not any(not arg.startswith("-") for arg in pytest_args):
+        pytest_args.append("tests")
+
+    started = time.perf_counter()
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.shards) as pool:
+        futures = [pool.submit(run_shard, index, args.shards, pytest_args) for index in range(1, args.shards + 1)]
+        for future in futures:
+            index, returncode, output, elapsed = future.result()
+            print(f"--- shard {index}/{args.shards} (exit {returncode}, {elapsed:.1f}s) ---")
+            print(output.rstrip())
+            if returncode not in (0, NO_TESTS_COLLECTED):
+                failed.append(index)
+
+    print(f"\n{args.shards} shards finished in {time.perf_counter() - started:.1f}s")
+    if failed:
+        print(f"✗ Failed shards: {', '.join(map(str, failed))}")
+        return 1
+    print("✓ All shards passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
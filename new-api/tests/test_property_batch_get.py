@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Property-based test for batch lookup correctness.
+
+Feature: strangler-studio, Property 8: Batch lookup partitions requested IDs
+
+This test validates that for any list of requested IDs, POST /requests:batchGet
+returns every existing ID exactly once (in first-seen order) under `requests`,
+every unknown ID under `missing`, and that GET /requests?ids= returns the same
+found records.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hypothesis import given, settings, strategies as st
+from fastapi.testclient import TestClient
+from app.main import app
+from app.data.seed_data import get_seed_data
+from app.contract import load_contract
+
+# Initialize test client
+client = TestClient(app)
+
+# Manually trigger startup to load seed data
+with client:
+    pass
+
+contract = load_contract()
+
+seed_data = get_seed_data()
+valid_ids = [request.id for request in seed_data]
+
+# Mix of existing and unknown IDs, including duplicates
+requested_ids = st.lists(
+    st.one_of(st.sampled_from(valid_ids), st.integers(min_value=1000, max_value=9999)),
+    min_size=1,
+    max_size=50,
+)
+
+
+@given(requested_ids)
+@settings(max_examples=100)
+def test_property_batch_get_partitions_ids(ids: list[int]):
+    """
+    Property 8a: Found and missing IDs partition the de-duplicated request
+    """
+    response = client.post("/requests:batchGet", json={"ids": ids})
+
+    assert response.status_code == 200, \
+        f"Expected status 200, got {response.status_code}"
+
+    data = response.json()
+    contract.validate_response("/requests:batchGet", "post", 200, data)
+    found_ids = [request["id"] for request in data["requests"]]
+    unique_ids = list(dict.fromkeys(ids))
+
+    assert found_ids == [i for i in unique_ids if i in valid_ids], \
+        f"Found IDs {found_ids} do not match existing IDs in {unique_ids}"
+    assert data["missing"] == [i for i in unique_ids if i not in valid_ids], \
+        f"Missing IDs {data['missing']} do not match unknown IDs in {unique_ids}"
+
+
+@given(requested_ids)
+@settings(max_examples=100)
+def test_property_ids_query_matches_batch_get(ids: list[int]):
+    """
+    Property 8b: GET /requests?ids= returns the same records as batchGet
+    """
+    query_response = client.get("/requests", params={"ids": ",".join(map(str, ids))})
+    batch_response = client.post("/requests:batchGet", json={"ids": ids})
+
+    assert query_response.status_code == 200
+    assert query_response.json() == batch_response.json()["requests"]
+
+
+def test_invalid_ids_query_is_rejected():
+    """Non-integer IDs produce a 400 with the standard Error shape"""
+    response = client.get("/requests", params={"ids": "1,abc"})
+
+    assert response.status_code == 400
+    assert isinstance(response.json()["detail"], str)
+
+
+def test_ids_query_follows_the_contract_pattern():
+    """Whitespace, empty items and signs are rejected like the contract's ^\\d+(,\\d+)*$"""
+    for raw_ids in ("1, 2", "1,2,", ",1", "1,,2", "-1", "+1", ""):
+        response = client.get("/requests", params={"ids": raw_ids})
+        assert response.status_code == 400, raw_ids
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Property-Based Test: Batch Lookup Correctness")
+    print("=" * 70)
+
+    try:
+        test_property_batch_get_partitions_ids()
+        test_property_ids_query_matches_batch_get()
+        test_invalid_ids_query_is_rejected()
+        test_ids_query_follows_the_contract_pattern()
+        print("\n✓ PROPERTY TEST PASSED")
+    except AssertionError as e:
+        print(f"\n✗ PROPERTY TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Property-based test for the compiled contract validator.
+
+Feature: strangler-studio, Property 11: Compiled contract validator fidelity
+
+This test validates that every Student Request the API model can produce is
+accepted by the compiled StudentRequest schema, that any single-field
+violation of the contract is rejected with the offending location, and that
+compiled contracts are cached.
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from app.contract import ContractViolation, load_contract
+from app.models import PriorityEnum, StatusEnum, StudentRequest
+
+contract = load_contract()
+validate_request = contract.schema_validator("StudentRequest")
+
+student_requests = st.builds(
+    StudentRequest,
+    id=st.integers(min_value=1, max_value=10**9),
+    student_name=st.text(min_size=1, max_size=200),
+    school=st.text(min_size=1, max_size=200),
+    status=st.sampled_from(StatusEnum),
+    created_at=st.datetimes(
+        min_value=datetime(1970, 1, 1), max_value=datetime(2100, 1, 1), timezones=st.just(timezone.utc)
+    ),
+    priority=st.sampled_from(PriorityEnum),
+    notes=st.text(max_size=1000),
+)
+
+# (field, invalid value) pairs, each breaking exactly one contract rule
+violations = st.sampled_from([
+    ("id", 0),
+    ("id", "1"),
+    ("id", True),
+    ("student_name", ""),
+    ("student_name", "x" * 201),
+    ("school", None),
+    ("status", "Active"),
+    ("priority", "Urgent"),
+    ("created_at", "yesterday"),
+    ("notes", "x" * 1001),
+])
+
+
+@given(student_requests)
+@settings(max_examples=200)
+def test_property_model_output_satisfies_contract(request: StudentRequest):
+    """
+    Property 11a: Serialized StudentRequest models always validate
+    """
+    validate_request(request.model_dump(mode="json"))
+    contract.validate_response("/requests", "get", 200, [request.model_dump(mode="json")])
+
+
+@given(student_requests, violations)
+@settings(max_examples=200)
+def test_property_single_field_violation_is_located(request: StudentRequest, violation):
+    """
+    Property 11b: Breaking one field is reported at that field
+    """
+    field, value = violation
+    data = {**request.model_dump(mode="json"), field: value}
+
+    with pytest.raises(ContractViolation) as excinfo:
+        contract.validate_response("/requests", "get", 200, [data])
+    assert str(excinfo.value).startswith(f"At response[0].{field}:"), str(excinfo.value)
+
+
+def test_missing_required_field_and_undocumented_status():
+    """Required fields and undocumented responses are enforced"""
+    with pytest.raises(ContractViolation, match="Missing required field 'priority'"):
+        validate_request({"id": 1, "student_name": "a", "school": "b", "status": "Pending",
+                          "created_at": "2024-10-31T23:59:59Z"})
+    with pytest.raises(ContractViolation, match="not documented"):
+        contract.validate_response("/requests", "get", 418, {})
+
+
+def test_contract_is_compiled_once():
+    """Repeated loads share one compiled contract"""
+    assert load_contract() is contract
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Property-Based Test: Compiled Contract Validator Fidelity")
+    print("=" * 70)
+
+    try:
+        test_property_model_output_satisfies_contract()
+        test_property_single_field_violation_is_located()
+        test_missing_required_field_and_undocumented_status()
+        test_contract_is_compiled_once()
+        print("\n✓ PROPERTY TEST PASSED")
+    except AssertionError as e:
+        print(f"\n✗ PROPERTY TEST FAILED: {e}")
+        sys.exit(1)
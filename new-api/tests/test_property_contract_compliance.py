@@ -15,6 +15,7 @@ import sys
 import os
 import yaml
 import json
+from pathlib import Path
 
 # Add parent directory to path to import app module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -25,6 +26,7 @@ from openapi_spec_validator import validate_spec
 from openapi_spec_validator.validation.exceptions import OpenAPIValidationError
 from app.main import app
 from app.data.seed_data import get_seed_data
+from app.contract import ContractViolation, load_contract
 
 # Initialize test client
 client = TestClient(app)
@@ -46,106 +48,8 @@ seed_data = get_seed_data()
 valid_ids = [request.id for request in seed_data]
 
 
-def validate_against_schema(data, schema, path=""):
-    """
-    Validate data against an OpenAPI schema definition.
-    
-    Args:
-        data: The data to validate
-        schema: The OpenAPI schema definition
-        path: Current path in the data structure (for error messages)
-    
-    Raises:
-        AssertionError: If validation fails
-    """
-    schema_type = schema.get('type')
-    
-    # Handle $ref references
-    if '$ref' in schema:
-        ref_path = schema['$ref']
-        if ref_path.startswith('#/components/schemas/'):
-            schema_name = ref_path.split('/')[-1]
-            referenced_schema = openapi_spec['components']['schemas'][schema_name]
-            validate_against_schema(data, referenced_schema, path)
-            return
-    
-    # Validate type
-    if schema_type == 'object':
-        assert isinstance(data, dict), \
-            f"At {path}: Expected object, got {type(data).__name__}"
-        
-        # Check required fields
-        required_fields = schema.get('required', [])
-        for field in required_fields:
-            assert field in data, \
-                f"At {path}: Missing required field '{field}'"
-        
-        # Validate properties
-        properties = schema.get('properties', {})
-        for field_name, field_value in data.items():
-            if field_name in properties:
-                field_schema = properties[field_name]
-                validate_against_schema(
-                    field_value,
-                    field_schema,
-                    f"{path}.{field_name}" if path else field_name
-                )
-    
-    elif schema_type == 'array':
-        assert isinstance(data, list), \
-            f"At {path}: Expected array, got {type(data).__name__}"
-        
-        # Validate items
-        items_schema = schema.get('items', {})
-        for idx, item in enumerate(data):
-            validate_against_schema(
-                item,
-                items_schema,
-                f"{path}[{idx}]"
-            )
-    
-    elif schema_type == 'string':
-        assert isinstance(data, str), \
-            f"At {path}: Expected string, got {type(data).__name__}"
-        
-        # Check enum values
-        if 'enum' in schema:
-            assert data in schema['enum'], \
-                f"At {path}: Value '{data}' not in allowed enum values {schema['enum']}"
-        
-        # Check format
-        if 'format' in schema:
-            format_type = schema['format']
-            if format_type == 'date-time':
-                # Basic ISO 8601 validation
-                assert 'T' in data or 't' in data, \
-                    f"At {path}: Expected ISO 8601 date-time format, got '{data}'"
-        
-        # Check length constraints
-        if 'minLength' in schema:
-            assert len(data) >= schema['minLength'], \
-                f"At {path}: String length {len(data)} < minimum {schema['minLength']}"
-        
-        if 'maxLength' in schema:
-            assert len(data) <= schema['maxLength'], \
-                f"At {path}: String length {len(data)} > maximum {schema['maxLength']}"
-    
-    elif schema_type == 'integer':
-        assert isinstance(data, int) and not isinstance(data, bool), \
-            f"At {path}: Expected integer, got {type(data).__name__}"
-        
-        # Check minimum
-        if 'minimum' in schema:
-            assert data >= schema['minimum'], \
-                f"At {path}: Value {data} < minimum {schema['minimum']}"
-    
-    elif schema_type == 'number':
-        assert isinstance(data, (int, float)) and not isinstance(data, bool), \
-            f"At {path}: Expected number, got {type(data).__name__}"
-    
-    elif schema_type == 'boolean':
-        assert isinstance(data, bool), \
-            f"At {path}: Expected boolean, got {type(data).__name__}"
+# Compiled once per process and shared with the other contract suites
+contract = load_contract(Path(OPENAPI_SPEC_PATH))
 
 
 def validate_response_against_openapi(endpoint_path, method, status_code, response_data):
@@ -161,37 +65,10 @@ def validate_response_against_openapi(endpoint_path, method, status_code, respon
     Raises:
         AssertionError: If validation fails
     """
-    # Get the path specification
-    path_spec = openapi_spec['paths'].get(endpoint_path)
-    assert path_spec is not None, \
-        f"Endpoint {endpoint_path} not found in OpenAPI spec"
-    
-    # Get the method specification
-    method_spec = path_spec.get(method.lower())
-    assert method_spec is not None, \
-        f"Method {method} not found for endpoint {endpoint_path} in OpenAPI spec"
-    
-    # Get the response specification
-    responses = method_spec.get('responses', {})
-    response_spec = responses.get(str(status_code))
-    assert response_spec is not None, \
-        f"Status code {status_code} not defined for {method} {endpoint_path} in OpenAPI spec"
-    
-    # Get the schema for the response
-    content = response_spec.get('content', {})
-    json_content = content.get('application/json')
-    
-    if json_content is None:
-        # No schema defined, nothing to validate
-        return
-    
-    schema = json_content.get('schema')
-    if schema is None:
-        # No schema defined, nothing to validate
-        return
-    
-    # Validate the response data against the schema
-    validate_against_schema(response_data, schema, "response")
+    try:
+        contract.validate_response(endpoint_path, method, status_code, response_data)
+    except ContractViolation as e:
+        raise AssertionError(str(e)) from e
 
 
 @settings(max_examples=100)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Property-based test for runtime contract validation sampling.
+
+Feature: strangler-studio, Property 12: Contract middleware sampling and accounting
+
+This test validates that ContractMiddleware checks exactly one request in
+every N, counts conforming responses as ok, and counts a response that
+breaks the contract as a violation without altering what the client
+receives.
+"""
+
+import sys
+import os
+import threading
+from contextlib import contextmanager
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hypothesis import given, settings, strategies as st
+from fastapi.testclient import TestClient
+import app.main as main
+from app.contract import (
+    CHECK_OK,
+    CHECK_RESPONSE_VIOLATION,
+    CHECK_SKIPPED,
+    CHECK_TOO_LARGE,
+    ContractMiddleware,
+    load_contract,
+)
+from app.data.seed_data import get_seed_data
+from app.metrics import MetricsRegistry
+from app.models import StudentRequest
+
+# Manually trigger startup to load seed data
+with TestClient(main.app):
+    pass
+
+contract = load_contract()
+valid_ids = [request.id for request in get_seed_data()]
+
+
+@contextmanager
+def validating_client(sample_every: int, middleware_class=ContractMiddleware, **kwargs):
+    """
+    Client for the app wrapped in a middleware with its own registry.
+
+    Checks run as background tasks on the client's event loop, so the loop
+    is kept for the whole block and drained before it closes.
+    """
+    registry = MetricsRegistry()
+    middleware = middleware_class(main.app, contract=contract, sample_every=sample_every, registry=registry, **kwargs)
+    with TestClient(middleware) as client:
+        yield client, registry
+        client.portal.call(middleware.drain)
+
+
+class BlockedMiddleware(ContractMiddleware):
+    """Middleware whose checks wait until `release` is set"""
+
+    release = threading.Event()
+
+    def _check(self, *args):
+        self.release.wait(timeout=10)
+        return super()._check(*args)
+
+
+@given(st.integers(min_value=1, max_value=10), st.integers(min_value=0, max_value=40))
+@settings(max_examples=30, deadline=None)
+def test_property_one_in_n_requests_is_checked(sample_every: int, requests: int):
+    """
+    Property 12a: N-way sampling checks floor(requests / N) requests, all ok
+    """
+    with validating_client(sample_every, max_pending_checks=requests + 1) as (client, registry):
+        for index in range(requests):
+            client.get(f"/requests/{valid_ids[index % len(valid_ids)]}")
+
+    assert sum(registry.contract_checks.values()) == requests // sample_every
+    assert all(result == CHECK_OK for (_, _, result) in registry.contract_checks)
+
+
+def test_all_documented_routes_conform():
+    """Every documented route the app serves passes at 100% sampling"""
+    with validating_client(1) as (client, registry):
+        client.get("/requests")
+        client.get("/requests/1")
+        client.get("/requests/999999")
+        client.post("/requests:batchGet", json={"ids": [1, 999999]})
+        client.get("/health")
+
+    assert registry.contract_checks == {
+        ("GET", "/requests", CHECK_OK): 1,
+        ("GET", "/requests/{id}", CHECK_OK): 2,
+        ("POST", "/requests:batchGet", CHECK_OK): 1,
+    }
+
+
+def test_violation_is_counted_without_changing_response():
+    """A record outside the contract is served unchanged and counted"""
+    with validating_client(1) as (client, registry):
+        original = main.student_requests[1]
+        # model_construct skips validation, as a buggy code path might
+        main.student_requests[1] = StudentRequest.model_construct(**{**original.model_dump(), "status": "Active"})
+        try:
+            response = client.get("/requests/1")
+        finally:
+            main.student_requests[1] = original
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "Active"
+    assert registry.contract_checks == {("GET", "/requests/{id}", CHECK_RESPONSE_VIOLATION): 1}
+    assert "strangler_contract_checks_total" in registry.render()
+
+
+def test_oversized_bodies_are_not_buffered():
+    """A response over the buffer cap is served whole and counted as too_large"""
+    with validating_client(1, max_body_bytes=64) as (client, registry):
+        response = client.get("/requests")
+
+    assert response.status_code == 200
+    assert len(response.content) > 64
+    assert registry.contract_checks == {("GET", "/requests", CHECK_TOO_LARGE): 1}
+
+
+def test_check_runs_off_the_event_loop():
+    """Validation happens in a worker thread, not on the thread serving requests"""
+    threads = {}
+
+    class RecordingMiddleware(ContractMiddleware):
+        async def __call__(self, scope, receive, send):
+            threads["loop"] = threading.get_ident()
+            await super().__call__(scope, receive, send)
+
+        def _check(self, *args):
+            threads["check"] = threading.get_ident()
+            return super()._check(*args)
+
+    with validating_client(1, RecordingMiddleware) as (client, registry):
+        client.get("/requests/1")
+
+    assert registry.contract_checks == {("GET", "/requests/{id}", CHECK_OK): 1}
+    assert threads["check"] != threads["loop"]
+
+
+def test_response_does_not_wait_for_the_check():
+    """The client is answered while its check is still running"""
+    BlockedMiddleware.release.clear()
+    try:
+        with validating_client(1, BlockedMiddleware) as (client, registry):
+            response = client.get("/requests/1")
+            assert response.status_code == 200
+            assert registry.contract_checks == {}
+            BlockedMiddleware.release.set()
+    finally:
+        BlockedMiddleware.release.set()
+
+    assert registry.contract_checks == {("GET", "/requests/{id}", CHECK_OK): 1}
+
+
+def test_samples_beyond_the_pending_bound_are_skipped():
+    """With the backlog full, a sample is counted as skipped, not queued"""
+    BlockedMiddleware.release.clear()
+    try:
+        with validating_client(1, BlockedMiddleware, max_pending_checks=1) as (client, registry):
+            for _ in range(3):
+                assert client.get("/requests/1").status_code == 200
+            BlockedMiddleware.release.set()
+    finally:
+        BlockedMiddleware.release.set()
+
+    assert registry.contract_checks == {
+        ("GET", "/requests/{id}", CHECK_OK): 1,
+        ("GET", "/requests/{id}", CHECK_SKIPPED): 2,
+    }
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Property-Based Test: Contract Middleware Sampling and Accounting")
+    print("=" * 70)
+
+    try:
+        test_property_one_in_n_requests_is_checked()
+        test_all_documented_routes_conform()
+        test_violation_is_counted_without_changing_response()
+        test_oversized_bodies_are_not_buffered()
+        test_check_runs_off_the_event_loop()
+        test_response_does_not_wait_for_the_check()
+        test_samples_beyond_the_pending_bound_are_skipped()
+        print("\n✓ PROPERTY TEST PASSED")
+    except AssertionError as e:
+        print(f"\n✗ PROPERTY TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Property-based test for streaming export watermark correctness.
+
+Feature: strangler-studio, Property 6: Export watermark correctness
+
+This test validates that for any `since` watermark, the /requests/export
+endpoint streams exactly the Student Requests whose created_at is strictly
+after the watermark, in both NDJSON and CSV formats, and that every exported
+record carries all contract fields.
+"""
+
+import sys
+import os
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hypothesis import given, settings, strategies as st
+from fastapi.testclient import TestClient
+from app.main import app, EXPORT_FIELDS
+from app.data.seed_data import get_seed_data
+
+# Initialize test client
+client = TestClient(app)
+
+# Manually trigger startup to load seed data
+with client:
+    pass
+
+seed_data = get_seed_data()
+oldest = min(request.created_at for request in seed_data)
+newest = max(request.created_at for request in seed_data)
+
+# Watermarks spanning a day either side of the seed data range
+watermarks = st.datetimes(
+    min_value=oldest - timedelta(days=1),
+    max_value=newest + timedelta(days=1),
+)
+
+
+def expected_ids(since: datetime) -> list[int]:
+    """IDs of seed requests created strictly after the watermark"""
+    return [request.id for request in seed_data if request.created_at > since]
+
+
+@given(watermarks)
+@settings(max_examples=100)
+def test_property_ndjson_export_respects_watermark(since: datetime):
+    """
+    Property 6a: NDJSON export returns exactly the records after `since`
+    """
+    response = client.get("/requests/export", params={"since": since.isoformat()})
+
+    assert response.status_code == 200, \
+        f"Expected status 200, got {response.status_code}"
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    records = [json.loads(line) for line in response.text.splitlines() if line]
+
+    assert [record["id"] for record in records] == expected_ids(since), \
+        f"Watermark {since.isoformat()} exported wrong records"
+
+    for record in records:
+        assert set(EXPORT_FIELDS) <= set(record), \
+            f"Exported record {record.get('id')} missing fields"
+
+
+@given(watermarks)
+@settings(max_examples=100)
+def test_property_csv_export_respects_watermark(since: datetime):
+    """
+    Property 6b: CSV export has a header row plus one row per record after `since`
+    """
+    response = client.get(
+        "/requests/export",
+        params={"format": "csv", "since": since.isoformat()},
+    )
+
+    assert response.status_code == 200, \
+        f"Expected status 200, got {response.status_code}"
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert [int(row["id"]) for row in rows] == expected_ids(since), \
+        f"Watermark {since.isoformat()} exported wrong CSV rows"
+
+
+def test_export_without_watermark_streams_everything():
+    """Without `since`, the export contains every stored request"""
+    response = client.get("/requests/export")
+
+    assert response.status_code == 200
+    lines = [line for line in response.text.splitlines() if line]
+    assert len(lines) == len(seed_data)
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Property-Based Test: Export Watermark Correctness")
+    print("=" * 70)
+
+    try:
+        test_property_ndjson_export_respects_watermark()
+        test_property_csv_export_respects_watermark()
+        test_export_without_watermark_streams_everything()
+        print("\n✓ PROPERTY TEST PASSED")
+    except AssertionError as e:
+        print(f"\n✗ PROPERTY TEST FAILED: {e}")
+        sys.exit(1)
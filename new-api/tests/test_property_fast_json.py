@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Property-based test for fast JSON response equivalence.
+
+Feature: strangler-studio, Property 7: Fast JSON response equivalence
+
+This test validates that enabling the opt-in FAST_JSON serialization mode
+never changes what clients receive: for any Student Request endpoint, the
+response body is byte-for-byte identical to the default FastAPI response.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hypothesis import given, settings, strategies as st
+from fastapi.testclient import TestClient
+import app.main as main
+from app.data.seed_data import get_seed_data
+
+# Initialize test client
+client = TestClient(main.app)
+
+# Manually trigger startup to load seed data
+with client:
+    pass
+
+seed_data = get_seed_data()
+valid_ids = [request.id for request in seed_data]
+
+
+def fetch_both_modes(path: str):
+    """Fetch a path with the default serializer and again in fast mode"""
+    default_response = client.get(path)
+    main.FAST_JSON_ENABLED = True
+    try:
+        fast_response = client.get(path)
+    finally:
+        main.FAST_JSON_ENABLED = False
+    return default_response, fast_response
+
+
+@given(st.sampled_from(valid_ids + [1000, 9999]))
+@settings(max_examples=100)
+def test_property_fast_json_single_request_equivalence(request_id: int):
+    """
+    Property 7a: /requests/{id} is identical in default and fast modes
+    """
+    default_response, fast_response = fetch_both_modes(f"/requests/{request_id}")
+
+    assert fast_response.status_code == default_response.status_code
+    assert fast_response.content == default_response.content, \
+        f"Fast mode changed the body for ID {request_id}"
+    assert fast_response.headers["content-type"] == default_response.headers["content-type"]
+
+
+def test_fast_json_list_equivalence():
+    """
+    Property 7b: /requests is identical in default and fast modes
+    """
+    default_response, fast_response = fetch_both_modes("/requests")
+
+    assert fast_response.status_code == 200
+    assert fast_response.content == default_response.content
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Property-Based Test: Fast JSON Response Equivalence")
+    print("=" * 70)
+
+    try:
+        test_property_fast_json_single_request_equivalence()
+        test_fast_json_list_equivalence()
+        print("\n✓ PROPERTY TEST PASSED")
+    except AssertionError as e:
+        print(f"\n✗ PROPERTY TEST FAILED: {e}")
+        sys.exit(1)
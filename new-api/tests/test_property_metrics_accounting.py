@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Property-based test for metrics accounting.
+
+Feature: strangler-studio, Property 10: Metrics count every request once
+
+This test validates that for any sequence of requests, the metrics
+middleware records exactly one observation per request under the matched
+route template and response status, and leaves no request in flight.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hypothesis import given, settings, strategies as st
+from fastapi.testclient import TestClient
+from app.main import app
+from app.metrics import REGISTRY, UNMATCHED_ROUTE
+from app.data.seed_data import get_seed_data
+
+# Initialize test client
+client = TestClient(app)
+
+# Manually trigger startup to load seed data
+with client:
+    pass
+
+valid_ids = [request.id for request in get_seed_data()]
+
+# (path, expected route template, expected status)
+request_cases = st.one_of(
+    st.just(("/requests", "/requests", 200)),
+    st.sampled_from(valid_ids).map(lambda i: (f"/requests/{i}", "/requests/{id}", 200)),
+    st.integers(min_value=1000, max_value=9999).map(lambda i: (f"/requests/{i}", "/requests/{id}", 404)),
+    st.just(("/no-such-route", UNMATCHED_ROUTE, 404)),
+)
+
+
+def snapshot_counts() -> dict:
+    """Copy of the per (method, route, status) response counters"""
+    return dict(REGISTRY.responses)
+
+
+@given(st.lists(request_cases, min_size=1, max_size=20))
+@settings(max_examples=100)
+def test_property_metrics_count_each_request_once(cases):
+    """
+    Property 10: Counters and histograms grow by exactly the requests made
+    """
+    before = snapshot_counts()
+    histogram_before = {key: h.count for key, h in REGISTRY.request_latency.items()}
+
+    expected: dict = {}
+    for path, template, status in cases:
+        response = client.get(path)
+        assert response.status_code == status, \
+            f"{path} returned {response.status_code}, expected {status}"
+        key = ("GET", template, status)
+        expected[key] = expected.get(key, 0) + 1
+
+    after = snapshot_counts()
+    for key, count in expected.items():
+        assert after.get(key, 0) - before.get(key, 0) == count, \
+            f"Counter {key} grew by {after.get(key, 0) - before.get(key, 0)}, expected {count}"
+
+    per_route: dict = {}
+    for (method, template, _), count in expected.items():
+        per_route[(method, template)] = per_route.get((method, template), 0) + count
+    for key, count in per_route.items():
+        grown = REGISTRY.request_latency[key].count - histogram_before.get(key, 0)
+        assert grown == count, f"Histogram {key} grew by {grown}, expected {count}"
+
+    assert REGISTRY.in_flight == 0, "Requests left in flight after completion"
+
+
+def test_metrics_endpoint_exposes_store_cardinality():
+    """The scrape output includes the number of stored requests"""
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert f"strangler_store_requests {len(valid_ids)}" in response.text
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Property-Based Test: Metrics Accounting")
+    print("=" * 70)
+
+    try:
+        test_property_metrics_count_each_request_once()
+        test_metrics_endpoint_exposes_store_cardinality()
+        print("\n✓ PROPERTY TEST PASSED")
+    except AssertionError as e:
+        print(f"\n✗ PROPERTY TEST FAILED: {e}")
+        sys.exit(1)
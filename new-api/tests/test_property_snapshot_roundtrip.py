@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Property-based test for snapshot round-trips and readiness.
+
+Feature: strangler-studio, Property 9: Snapshot restore fidelity
+
+This test validates that for any dataset size, writing a snapshot and
+restoring it yields exactly the same Student Requests, and that the API
+reports ready with the restored record count.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from hypothesis import given, settings, strategies as st
+from fastapi.testclient import TestClient
+import app.main as main
+from app.data.seed_data import get_seed_data, get_synthetic_data
+from app.data.snapshot import SnapshotError, load_snapshot, write_snapshot
+
+# Initialize test client
+client = TestClient(main.app)
+
+# Manually trigger startup to load seed data
+with client:
+    pass
+
+
+@given(st.integers(min_value=0, max_value=500))
+@settings(max_examples=50, deadline=None)
+def test_property_snapshot_roundtrip(rows: int):
+    """
+    Property 9a: load_snapshot(write_snapshot(data)) == data
+    """
+    requests = get_synthetic_data(rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "requests.snap"
+        write_snapshot(requests, path)
+        restored = load_snapshot(path)
+
+    assert restored == requests, f"Snapshot of {rows} rows did not round-trip"
+
+
+def test_ready_reports_restored_store():
+    """
+    Property 9b: /ready reports the number of records in the restored store
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "requests.snap"
+        write_snapshot(get_synthetic_data(25), path)
+        main.load_student_requests(load_snapshot(path))
+        try:
+            response = client.get("/ready")
+            assert response.status_code == 200
+            assert response.json()["requests"] == 25
+            assert client.get("/requests/25").status_code == 200
+        finally:
+            main.load_student_requests(get_seed_data())
+
+
+def test_invalid_snapshot_is_rejected():
+    """Files without the snapshot header are refused"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "bogus.snap"
+        path.write_bytes(b"[]")
+        with pytest.raises(SnapshotError):
+            load_snapshot(path)
+
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("Property-Based Test: Snapshot Restore Fidelity")
+    print("=" * 70)
+
+    try:
+        test_property_snapshot_roundtrip()
+        test_ready_reports_restored_store()
+        test_invalid_snapshot_is_rejected()
+        print("\n✓ PROPERTY TEST PASSED")
+    except AssertionError as e:
+        print(f"\n✗ PROPERTY TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,321 @@
+"""
+Access Log Analyzer
+Streams nginx access logs and ranks analyzed routes by real traffic for migration
+
+Reads the gateway's `strangler_timed` log format (combined plus
+`rt=$request_time`, see gateway/nginx.conf). Plain combined logs work too,
+without latency figures. Gzip-rotated files are read transparently; every
+file is streamed line by line and each worker keeps one fixed-size record
+per route, so memory does not grow with log size.
+
+Usage (from the backend directory):
+    python -m analyzers.access_log --analysis analysis.json /var/log/nginx/access.log*
+    python -m analyzers.access_log --analysis analysis.json logs/*.gz --workers 8 --output ranking.json
+"""
+
+import argparse
+import gzip
+import io
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from analyzers.route_trie import RouteTrie
+
+# Latency histogram: bucket i holds requests up to HISTOGRAM_BASE_MS * GROWTH**i
+HISTOGRAM_BASE_MS = 0.1
+HISTOGRAM_GROWTH = 1.1
+HISTOGRAM_BUCKETS = 160
+PATH_CACHE_SIZE = 65536
+MAX_UNMATCHED = 1000
+OTHER = "(other)"
+READ_BUFFER = 1024 * 1024
+NUMERIC_SEGMENT = re.compile(rb"/\d+(?=/|$)")
+
+
+def parse_line(line: bytes) -> Optional[Tuple[bytes, bytes, int, int, Optional[float]]]:
+    """
+    (method, path, status, body_bytes, request_time_ms) from one log line,
+    or None if it is not a request line. Uses plain byte searches instead
+    of a full regex so user agents cannot make it backtrack.
+    """
+    start = line.find(b'"')
+    end = line.find(b'" ', start + 1)
+    if start == -1 or end == -1:
+        return None
+    request = line[start + 1:end].split(b" ")
+    if len(request) < 2:
+        return None
+    fields = line[end + 2:end + 40].split(b" ", 2)
+    try:
+        status = int(fields[0])
+        body_bytes = int(fields[1]) if fields[1] != b"-" else 0
+    except (IndexError, ValueError):
+        return None
+    request_time = None
+    marker = line.rfind(b" rt=")
+    if marker != -1:
+        try:
+            request_time = float(line[marker + 4:].split(b" ", 1)[0]) * 1000
+        except ValueError:
+            pass
+    return request[0], request[1].split(b"?", 1)[0], status, body_bytes, request_time
+
+
+def histogram_bucket(ms: float) -> int:
+    if ms <= HISTOGRAM_BASE_MS:
+        return 0
+    return min(int(math.log(ms / HISTOGRAM_BASE_MS, HISTOGRAM_GROWTH)) + 1, HISTOGRAM_BUCKETS - 1)
+
+
+def bucket_upper_ms(bucket: int) -> float:
+    return HISTOGRAM_BASE_MS * HISTOGRAM_GROWTH ** bucket
+
+
+class RouteStats:
+    """Hit, error, byte and latency totals for one route, in constant space"""
+
+    __slots__ = ("hits", "client_errors", "server_errors", "bytes", "timed", "time_ms", "histogram")
+
+    def __init__(self):
+        self.hits = 0
+        self.client_errors = 0
+        self.server_errors = 0
+        self.bytes = 0
+        self.timed = 0
+        self.time_ms = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, status: int, body_bytes: int, request_time_ms: Optional[float]):
+        self.hits += 1
+        if status >= 500:
+            self.server_errors += 1
+        elif status >= 400:
+            self.client_errors += 1
+        self.bytes += body_bytes
+        if request_time_ms is not None:
+            self.timed += 1
+            self.time_ms += request_time_ms
+            self.histogram[histogram_bucket(request_time_ms)] += 1
+
+    def merge(self, other: "RouteStats"):
+        self.hits += other.hits
+        self.client_errors += other.client_errors
+        self.server_errors += other.server_errors
+        self.bytes += other.bytes
+        self.timed += other.timed
+        self.time_ms += other.time_ms
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.timed:
+            return None
+        target = fraction * self.timed
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= target:
+                return round(bucket_upper_ms(bucket), 2)
+        return round(bucket_upper_ms(HISTOGRAM_BUCKETS - 1), 2)
+
+    def __getstate__(self):
+        return [getattr(self, slot) for slot in self.__slots__]
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+
+class LogAggregate:
+    """Per-route statistics for one or more log files"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.unmatched: Dict[str, int] = {}
+        self.lines = 0
+        self.skipped = 0
+        self.bytes_read = 0
+
+    def count_unmatched(self, method: bytes, path: bytes):
+        # Collapse ids so one missing route shows up once, and cap the table
+        key = f"{method.decode('latin-1')} {NUMERIC_SEGMENT.sub(b'/{id}', path).decode('latin-1')}"
+        if key not in self.unmatched and len(self.unmatched) >= MAX_UNMATCHED:
+            key = OTHER
+        self.unmatched[key] = self.unmatched.get(key, 0) + 1
+
+    def merge(self, other: "LogAggregate"):
+        for key, stats in other.routes.items():
+            if key in self.routes:
+                self.routes[key].merge(stats)
+            else:
+                self.routes[key] = stats
+        for key, count in other.unmatched.items():
+            if key not in self.unmatched and len(self.unmatched) >= MAX_UNMATCHED:
+                key = OTHER
+            self.unmatched[key] = self.unmatched.get(key, 0) + count
+        self.lines += other.lines
+        self.skipped += other.skipped
+        self.bytes_read += other.bytes_read
+
+
+def open_log(path: Path):
+    """Binary reader for a plain or gzip-compressed log (detected by magic bytes)"""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    if compressed:
+        return io.BufferedReader(gzip.open(path, "rb"), buffer_size=READ_BUFFER)
+    return open(path, "rb", buffering=READ_BUFFER)
+
+
+def ingest(lines: Iterable[bytes], trie: RouteTrie, strip_prefixes: Tuple[bytes, ...] = (),
+           aggregate: Optional[LogAggregate] = None) -> LogAggregate:
+    """Add log lines to `aggregate` (a new one by default)"""
+    aggregate = aggregate or LogAggregate()
+    routes = aggregate.routes
+    # Most traffic repeats a few thousand exact paths; skip the trie for those
+    cache: Dict[Tuple[bytes, bytes], Optional[Tuple[str, str]]] = {}
+    for line in lines:
+        aggregate.lines += 1
+        aggregate.bytes_read += len(line)
+        parsed = parse_line(line)
+        if parsed is None:
+            aggregate.skipped += 1
+            continue
+        method, path, status, body_bytes, request_time = parsed
+        cache_key = (method, path)
+        key = cache.get(cache_key, False)
+        if key is False:
+            lookup = path
+            for prefix in strip_prefixes:
+                if lookup.startswith(prefix):
+                    lookup = lookup[len(prefix) - 1:] if prefix.endswith(b"/") else lookup[len(prefix):]
+                    break
+            method_name = method.decode("latin-1")
+            template = trie.match(method_name, lookup.decode("utf-8", errors="replace"))
+            key = (method_name.upper(), template) if template is not None else None
+            if len(cache) >= PATH_CACHE_SIZE:
+                cache.clear()
+            cache[cache_key] = key
+        if key is None:
+            aggregate.count_unmatched(method, path)
+            continue
+        stats = routes.get(key)
+        if stats is None:
+            stats = routes[key] = RouteStats()
+        stats.add(status, body_bytes, request_time)
+    return aggregate
+
+
+def ingest_file(path: str, routes: List[Dict], strip_prefixes: Tuple[bytes, ...] = ()) -> LogAggregate:
+    """Aggregate one log file (runs in a worker process)"""
+    trie = RouteTrie.from_routes(routes)
+    with open_log(Path(path)) as f:
+        return ingest(f, trie, strip_prefixes)
+
+
+def ingest_files(paths: List[str], routes: List[Dict], strip_prefixes: Tuple[bytes, ...] = (),
+                 workers: int = 1) -> LogAggregate:
+    """Aggregate many log files, one worker process per file"""
+    total = LogAggregate()
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            total.merge(ingest_file(path, routes, strip_prefixes))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for aggregate in pool.map(ingest_file, paths, [routes] * len(paths), [strip_prefixes] * len(paths)):
+            total.merge(aggregate)
+    return total
+
+
+def rank_routes(aggregate: LogAggregate, routes: List[Dict], sort: str = "time") -> List[Dict]:
+    """
+    Migration priority of every analyzed route, most valuable first.
+
+    `time` ranks by total time spent serving the route (hits x mean
+    latency; hits when the log has no timings), `hits` by request count and
+    `p99` by tail latency. Routes with no traffic are listed last.
+    """
+    total_hits = sum(stats.hits for stats in aggregate.routes.values()) or 1
+    rows = []
+    for route in RouteTrie.from_routes(routes).routes:
+        key = (route["method"], route["template"])
+        stats = aggregate.routes.get(key, RouteStats())
+        mean_ms = round(stats.time_ms / stats.timed, 2) if stats.timed else None
+        rows.append({
+            "method": key[0],
+            "path": key[1],
+            "hits": stats.hits,
+            "share": round(stats.hits / total_hits, 4),
+            "client_errors": stats.client_errors,
+            "server_errors": stats.server_errors,
+            "bytes": stats.bytes,
+            "mean_ms": mean_ms,
+            "p50_ms": stats.percentile(0.50),
+            "p95_ms": stats.percentile(0.95),
+            "p99_ms": stats.percentile(0.99),
+            "total_time_s": round(stats.time_ms / 1000, 3),
+        })
+    sort_keys = {
+        "time": lambda row: (row["total_time_s"] if row["mean_ms"] is not None else 0, row["hits"]),
+        "hits": lambda row: (row["hits"], row["total_time_s"]),
+        "p99": lambda row: (row["p99_ms"] or 0, row["hits"]),
+    }
+    rows.sort(key=sort_keys[sort], reverse=True)
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("logs", nargs="+", help="Access log files (plain or .gz)")
+    parser.add_argument("--analysis", required=True, type=Path,
+                        help="JSON from POST /api/analyze (only `routes` is used)")
+    parser.add_argument("--strip-prefix", action="append", default=[],
+                        help="Path prefix the gateway adds in front of legacy routes (repeatable)")
+    parser.add_argument("--sort", choices=("time", "hits", "p99"), default="time")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top", type=int, default=20, help="Rows to print")
+    parser.add_argument("--output", type=Path, help="Write the full ranking as JSON")
+    args = parser.parse_args(argv)
+
+    routes = json.loads(args.analysis.read_text())["routes"]
+    strip_prefixes = tuple(prefix.encode() for prefix in args.strip_prefix)
+
+    started = time.perf_counter()
+    aggregate = ingest_files(args.logs, routes, strip_prefixes, args.workers)
+    elapsed = time.perf_counter() - started
+    ranking = rank_routes(aggregate, routes, args.sort)
+    unmatched = sorted(aggregate.unmatched.items(), key=lambda item: item[1], reverse=True)
+
+    print(f"{aggregate.lines} lines ({aggregate.bytes_read / 1e6:.1f} MB) in {elapsed:.1f}s, "
+          f"{aggregate.lines / max(elapsed, 1e-9):,.0f} lines/s, {aggregate.skipped} skipped")
+    print(f"{'rank':>4}  {'hits':>10}  {'share':>6}  {'p95 ms':>8}  {'5xx':>6}  route")
+    for row in ranking[:args.top]:
+        p95 = f"{row['p95_ms']:.1f}" if row["p95_ms"] is not None else "-"
+        print(f"{row['rank']:>4}  {row['hits']:>10}  {row['share']:>6.1%}  {p95:>8}  {row['server_errors']:>6}  "
+              f"{row['method']} {row['path']}")
+    if unmatched:
+        print("\nBusiest paths with no analyzed route:")
+        for key, count in unmatched[:10]:
+            print(f"  {count:>10}  {key}")
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "lines": aggregate.lines,
+            "skipped": aggregate.skipped,
+            "elapsed_s": round(elapsed, 3),
+            "routes": ranking,
+            "unmatched": dict(unmatched),
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
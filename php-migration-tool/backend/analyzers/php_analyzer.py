@@ -5,9 +5,18 @@ Extracts routes, models, and business logic from PHP code
 
 import re
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 import json
 
+from analyzers.symbol_index import SymbolIndex, parse_symbols
+from analyzers.reachability import DependencyGraph, route_roots
+from analyzers.route_trie import RouteTrie
+from analyzers.profiling import AnalysisProfiler, NullProfiler
+from analyzers.spill_store import SpillStore
+
+# Cheap check for files that may define routes
+ROUTE_HINT = re.compile(r"Route::|\$app->|REQUEST_URI|REQUEST_METHOD", re.IGNORECASE)
+
 class PHPAnalyzer:
     """Analyzes PHP code to extract structure and patterns"""
     
@@ -16,43 +25,216 @@ class PHPAnalyzer:
         self.models = []
         self.dependencies = []
         self.file_count = 0
+        self.symbol_index = None
+        self.directory = None
+        self.index_path = None
+        self.reachability = None
+        self.route_conflicts = []
+        self.counts = {}
+        self.store = None
+        self.profiler = NullProfiler()
     
-    def analyze_directory(self, directory: Path) -> Dict:
-        """Analyze entire PHP project directory"""
+    def analyze_directory(self, directory: Path, index_path: Optional[Path] = None,
+                          reachable_only: bool = False, profile: bool = False,
+                          profiler: Optional[AnalysisProfiler] = None,
+                          spill_path: Optional[Path] = None) -> Dict:
+        """
+        Analyze entire PHP project directory
+        
+        With `reachable_only`, only classes reachable from the routes are
+        parsed and reported as models. With `profile` (or an explicit
+        `profiler`), phase and per-file timings are returned under `profile`.
+        
+        The project's symbol index is built only when needed: for
+        `reachable_only`, or to resolve class dependencies to files. It is
+        loaded from `index_path` when given (and saved back there), so
+        re-analysis only re-indexes changed files.
+        
+        With `spill_path`, each file's results are moved to a SpillStore at
+        that path as soon as the file is done, so memory stays bounded on huge
+        projects. The returned lists are then empty and `store` holds the
+        counts; read the results back with `SpillStore.open(spill_path)`.
+        The symbol index then lives in the store too, and `index_path` is
+        not used.
+        """
         self.routes = []
         self.models = []
         self.dependencies = []
         self.file_count = 0
+        self.reachability = None
+        self.route_conflicts = []
+        self.store = SpillStore.create(spill_path) if spill_path else None
+        self.symbol_index = None
+        self.directory = directory
+        self.index_path = index_path
+        self.profiler = profiler or (AnalysisProfiler() if profile else NullProfiler())
+        self.profiler.start()
         
         # Find all PHP files
-        php_files = list(directory.rglob("*.php"))
+        with self.profiler.phase('glob'):
+            php_files = list(directory.rglob("*.php"))
         self.file_count = len(php_files)
         
-        for php_file in php_files:
-            try:
-                content = php_file.read_text(encoding='utf-8', errors='ignore')
-                self._analyze_file(content, php_file.name)
-            except Exception as e:
-                print(f"Error analyzing {php_file}: {e}")
+        if reachable_only:
+            self._analyze_reachable(directory, php_files)
+        else:
+            for php_file in php_files:
+                try:
+                    relative_path = php_file.relative_to(directory).as_posix()
+                    content = self._read_file(php_file, relative_path)
+                    routes_before = len(self.routes)
+                    models_before = len(self.models)
+                    self._analyze_file(content, php_file.name)
+                    self._tag_routes(self.routes[routes_before:], relative_path)
+                    if len(self.models) > models_before:
+                        self._qualify_models(self.models[models_before:], relative_path, parse_symbols(content))
+                except Exception as e:
+                    print(f"Error analyzing {php_file}: {e}")
+                finally:
+                    self.profiler.end_file()
+                    self._spill()
+        
+        if self.store is None:
+            # Normalize templates, merge duplicates and flag colliding routes
+            with self.profiler.phase('normalize'):
+                route_trie = RouteTrie.from_routes(self.routes)
+                self.routes = route_trie.routes
+                self.route_conflicts = route_trie.conflicts
+            
+            with self.profiler.phase('resolve'):
+                dependencies = sorted(set(self.dependencies))
+                dependency_files = self._resolve_dependencies(dependencies)
+            self.counts = {
+                'routes': len(self.routes),
+                'models': len(self.models),
+                'route_conflicts': len(self.route_conflicts),
+            }
+        else:
+            # Already normalized and deduplicated on insert
+            with self.profiler.phase('resolve'):
+                self.store.set_dependency_files(self._resolve_dependencies(self.store.dependencies()))
+            dependencies, dependency_files = [], {}
+            self.counts = dict(self.store.counts)
+            self.store.close()
         
+        self.profiler.stop()
         return {
             'routes': self.routes,
+            'route_conflicts': self.route_conflicts,
             'models': self.models,
-            'dependencies': list(set(self.dependencies)),
+            'dependencies': dependencies,
+            'dependency_files': dependency_files,
             'file_count': self.file_count,
+            'reachability': self.reachability,
+            'profile': self.profiler.report(),
+            'store': self.counts if self.store is not None else None,
             'summary': self._generate_summary()
         }
     
+    def _index(self) -> SymbolIndex:
+        """The project's symbol index, built on first use"""
+        if self.symbol_index is None:
+            with self.profiler.phase('index'):
+                if self.store is not None:
+                    self.symbol_index = SymbolIndex.open(self.directory, **self.store.symbol_tables())
+                else:
+                    self.symbol_index = SymbolIndex.open(self.directory, self.index_path)
+        return self.symbol_index
+    
+    def _spill(self):
+        """Move results collected so far into the spill store, if spilling"""
+        if self.store is None:
+            return
+        with self.profiler.phase('spill'):
+            self.store.add_routes(self.routes)
+            self.store.add_models(self.models)
+            self.store.add_dependencies(self.dependencies)
+        self.routes = []
+        self.models = []
+        self.dependencies = []
+    
+    def _read_file(self, php_file: Path, relative_path: str) -> str:
+        """Read a source file, timed and attributed to it when profiling"""
+        with self.profiler.phase('read'):
+            content = php_file.read_text(encoding='utf-8', errors='ignore')
+        self.profiler.begin_file(relative_path, len(content))
+        return content
+    
+    def _analyze_reachable(self, directory: Path, php_files: List[Path]):
+        """
+        Find routes first, then parse only the classes reachable from their
+        handlers and route files
+        """
+        route_files = []
+        for php_file in php_files:
+            try:
+                relative_path = php_file.relative_to(directory).as_posix()
+                content = self._read_file(php_file, relative_path)
+                with self.profiler.phase('routes'):
+                    if not ROUTE_HINT.search(content):
+                        continue
+                    routes_before = len(self.routes)
+                    self._extract_routes(content, php_file.name)
+                if len(self.routes) > routes_before:
+                    self._tag_routes(self.routes[routes_before:], relative_path)
+                    with self.profiler.phase('deps'):
+                        self._extract_dependencies(content)
+                    route_files.append(relative_path)
+            except Exception as e:
+                print(f"Error analyzing {php_file}: {e}")
+            finally:
+                self.profiler.end_file()
+                self._spill()
+        
+        index = self._index()
+        with self.profiler.phase('reachability'):
+            graph = DependencyGraph(index)
+            routes = self.routes if self.store is None else list(self.store.routes())
+            roots = route_roots(graph, routes, directory)
+            reachable = graph.reachable(roots)
+        
+        dependency_files = set(route_files)
+        for key in reachable:
+            symbol = index.symbols[key]
+            try:
+                self.profiler.begin_file(symbol['file'], 0)
+                with self.profiler.phase('read'):
+                    source = index.source(symbol['fqcn'])
+                with self.profiler.phase('models'):
+                    models_before = len(self.models)
+                    self._extract_models(source, Path(symbol['file']).name)
+                    self._qualify_models(self.models[models_before:], symbol['file'],
+                                         index.declared_in(symbol['file']))
+                if symbol['file'] not in dependency_files:
+                    dependency_files.add(symbol['file'])
+                    content = self._read_file(directory / symbol['file'], symbol['file'])
+                    with self.profiler.phase('deps'):
+                        self._extract_dependencies(content)
+            except Exception as e:
+                print(f"Error analyzing {symbol['fqcn']}: {e}")
+            finally:
+                self.profiler.end_file()
+                self._spill()
+        
+        self.reachability = {
+            'entry_points': len(roots),
+            'reachable_classes': len(reachable),
+            'total_classes': len(index.symbols),
+        }
+    
     def _analyze_file(self, content: str, filename: str):
         """Analyze a single PHP file"""
         # Extract routes
-        self._extract_routes(content, filename)
+        with self.profiler.phase('routes'):
+            self._extract_routes(content, filename)
         
         # Extract models/classes
-        self._extract_models(content, filename)
+        with self.profiler.phase('models'):
+            self._extract_models(content, filename)
         
         # Extract dependencies
-        self._extract_dependencies(content)
+        with self.profiler.phase('deps'):
+            self._extract_dependencies(content)
     
     def _extract_routes(self, content: str, filename: str):
         """Extract route definitions from PHP code"""
@@ -206,6 +388,33 @@ class PHPAnalyzer:
         for match in matches:
             self.dependencies.append(match.group(2))
     
+    def _tag_routes(self, routes: List[Dict], relative_path: str):
+        """Record the project-relative file each route was found in"""
+        for route in routes:
+            route['source_file'] = relative_path
+    
+    def _qualify_models(self, models: List[Dict], relative_path: str, symbols: Iterable[Dict]):
+        """Attach the FQCN and line span of the file's declarations to models found in it"""
+        declared = {}
+        for symbol in symbols:
+            declared.setdefault(symbol['fqcn'].rsplit('\\', 1)[-1], symbol)
+        for model in models:
+            symbol = declared.get(model['name'])
+            if symbol:
+                model['fqcn'] = symbol['fqcn']
+                model['path'] = relative_path
+                model['span'] = symbol['span']
+    
+    def _resolve_dependencies(self, dependencies: Iterable[str]) -> Dict[str, str]:
+        """Map `use` dependencies that are declared in the project to their files"""
+        resolved = {}
+        for dependency in dependencies:
+            if '\\' in dependency or dependency[:1].isupper():
+                path = self._index().locate(dependency)
+                if path:
+                    resolved[dependency] = path
+        return resolved
+    
     def _extract_handler_near(self, content: str, position: int) -> str:
         """Extract handler name near a route definition"""
         # Look for controller@method pattern
@@ -219,4 +428,9 @@ class PHPAnalyzer:
     
     def _generate_summary(self) -> str:
         """Generate analysis summary"""
-        return f"Found {len(self.routes)} routes, {len(self.models)} models/classes, and {self.file_count} PHP files"
+        summary = f"Found {self.counts['routes']} routes, {self.counts['models']} models/classes, and {self.file_count} PHP files"
+        if self.counts['route_conflicts']:
+            summary += f", {self.counts['route_conflicts']} conflicting routes skipped"
+        if self.reachability:
+            summary += f" ({self.reachability['reachable_classes']} of {self.reachability['total_classes']} classes reachable from routes)"
+        return summary
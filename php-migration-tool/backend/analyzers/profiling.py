@@ -0,0 +1,185 @@
+"""
+Analysis Profiler
+Per-phase and per-file timings for PHPAnalyzer runs
+
+Usage (from the backend directory):
+    python -m analyzers.profiling path/to/project
+    python -m analyzers.profiling path/to/project --folded analysis.folded --top 20
+    flamegraph.pl analysis.folded > analysis.svg
+
+The folded output is the collapsed-stack format read by flamegraph.pl,
+speedscope and inferno: one `analyze;phase;file microseconds` line each.
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_NULL_CONTEXT = nullcontext()
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every hook is a no-op"""
+
+    enabled = False
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def phase(self, name: str):
+        return _NULL_CONTEXT
+
+    def begin_file(self, path: str, size: int):
+        pass
+
+    def end_file(self):
+        pass
+
+    def report(self) -> Optional[Dict]:
+        return None
+
+
+class AnalysisProfiler:
+    """
+    Collects wall time per analysis phase (glob, read, routes, models,
+    deps, ...), per file and phase, bytes analyzed and peak memory.
+
+    Peak memory is the tracemalloc peak of Python allocations during the
+    run (tracing slows analysis somewhat, so use it to find hotspots rather
+    than to quote absolute times) plus the process's max RSS.
+    """
+
+    enabled = True
+
+    def __init__(self, slowest: int = 10, trace_memory: bool = True):
+        self.slowest = slowest
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, float] = {}
+        self.files: Dict[str, Dict] = {}
+        self.bytes = 0
+        self._current: Optional[Dict] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+        self._peak_memory = None
+        self._owns_tracing = False
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        elif tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def stop(self):
+        self._elapsed = time.perf_counter() - self._started
+        if tracemalloc.is_tracing():
+            self._peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block as `name`, attributed to the current file if any"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            if self._current is not None:
+                phases = self._current["phases"]
+                phases[name] = phases.get(name, 0.0) + elapsed
+
+    def begin_file(self, path: str, size: int):
+        self._current = self.files.setdefault(path, {"bytes": 0, "phases": {}})
+        self._current["bytes"] += size
+        self.bytes += size
+
+    def end_file(self):
+        self._current = None
+
+    def report(self) -> Dict:
+        slowest = heapq.nlargest(self.slowest, self.files.items(), key=lambda item: sum(item[1]["phases"].values()))
+        return {
+            "total_s": round(self._elapsed, 4),
+            "phases_s": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "files": len(self.files),
+            "bytes": self.bytes,
+            "bytes_per_sec": round(self.bytes / self._elapsed) if self._elapsed else None,
+            "peak_memory_bytes": self._peak_memory,
+            "max_rss_bytes": _max_rss_bytes(),
+            "slowest_files": [
+                {
+                    "file": path,
+                    "seconds": round(sum(entry["phases"].values()), 4),
+                    "bytes": entry["bytes"],
+                    "phases_s": {name: round(seconds, 4) for name, seconds in entry["phases"].items()},
+                }
+                for path, entry in slowest
+            ],
+        }
+
+    def folded(self) -> str:
+        """Collapsed stacks (microseconds) for flamegraph tools"""
+        lines = []
+        attributed: Dict[str, float] = {}
+        for path, entry in sorted(self.files.items()):
+            frame = path.replace(";", "_").replace(" ", "_")
+            for name, seconds in entry["phases"].items():
+                attributed[name] = attributed.get(name, 0.0) + seconds
+                lines.append(f"analyze;{name};{frame} {max(int(seconds * 1e6), 1)}")
+        # Time spent in phases outside any file (glob, indexing, ...)
+        for name, seconds in self.phases.items():
+            remainder = int((seconds - attributed.get(name, 0.0)) * 1e6)
+            if remainder > 0:
+                lines.append(f"analyze;{name} {remainder}")
+        return "\n".join(lines) + "\n"
+
+
+def _max_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    from analyzers.php_analyzer import PHPAnalyzer
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path, help="PHP project to analyze")
+    parser.add_argument("--reachable-only", action="store_true", help="Profile the reachability-pruned mode")
+    parser.add_argument("--top", type=int, default=10, help="Slowest files to report")
+    parser.add_argument("--folded", type=Path, help="Write collapsed stacks for flamegraph.pl / speedscope")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory)")
+    args = parser.parse_args(argv)
+
+    profiler = AnalysisProfiler(slowest=args.top, trace_memory=not args.no_memory)
+    analysis = PHPAnalyzer().analyze_directory(args.directory, reachable_only=args.reachable_only, profiler=profiler)
+    print(analysis["summary"])
+    print(json.dumps(analysis["profile"], indent=2))
+    if args.folded:
+        args.folded.write_text(profiler.folded())
+        print(f"Folded stacks written to {args.folded}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,123 @@
+"""
+Reachability Analysis
+Finds the classes reachable from route entry points through a lazily built dependency graph
+"""
+
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from analyzers.symbol_index import (
+    NAMESPACE_PATTERN,
+    USE_PATTERN,
+    IMPORT_CLAUSE,
+    SymbolIndex,
+    parse_use_clause,
+    resolve_name,
+)
+
+NAME = r"\\?[A-Za-z_][\w\\]*"
+REFERENCE_PATTERNS = [
+    re.compile(rf"\bnew\s+({NAME})"),
+    re.compile(rf"({NAME})\s*::"),
+    re.compile(rf"\binstanceof\s+({NAME})"),
+    re.compile(rf"\bcatch\s*\(\s*({NAME}(?:\s*\|\s*{NAME})*)"),
+    # Parameter and property types: `User $user`, `?Post &$post`
+    re.compile(rf"({NAME})\s+&?(?:\.\.\.)?\$\w+"),
+    # Return types: `): User`, `): ?Post`
+    re.compile(rf"\)\s*:\s*\??({NAME})"),
+    # Trait uses inside a class body
+    re.compile(rf"^\s*use\s+({NAME}(?:\s*,\s*{NAME})*)\s*;", re.MULTILINE),
+]
+PSEUDO_CLASSES = {"self", "static", "parent"}
+
+
+def referenced_names(source: str) -> Set[str]:
+    """Class names as written in a chunk of PHP source"""
+    names = set()
+    for pattern in REFERENCE_PATTERNS:
+        for match in pattern.finditer(source):
+            for name in re.split(r"[|,]", match.group(1)):
+                name = name.strip()
+                if name and name.lower() not in PSEUDO_CLASSES:
+                    names.add(name)
+    return names
+
+
+def file_context(content: str) -> Tuple[str, Dict[str, str]]:
+    """Namespace and imports of top-level code, e.g. a routes file"""
+    namespace = NAMESPACE_PATTERN.search(content)
+    imports = {}
+    for match in USE_PATTERN.finditer(content):
+        if not match.group(1) and IMPORT_CLAUSE.match(match.group(2)):
+            imports.update(parse_use_clause(match.group(2)))
+    return (namespace.group(1) if namespace else ""), imports
+
+
+class DependencyGraph:
+    """
+    Class-to-class dependency edges, computed the first time a class is
+    visited by scanning only that class's span. Classes that are never
+    reached are never scanned.
+    """
+
+    def __init__(self, index: SymbolIndex):
+        self.index = index
+        self._edges: Dict[str, List[str]] = {}
+        self._short_names: Optional[Dict[str, List[str]]] = None
+
+    def edges(self, key: str) -> List[str]:
+        """Indexed classes that the class `key` (lower-cased FQCN) depends on"""
+        if key not in self._edges:
+            symbol = self.index.symbols[key]
+            names = set(symbol["extends"]) | set(symbol["implements"])
+            source = self.index.source(symbol["fqcn"]) or ""
+            names |= {resolve_name(name, symbol["namespace"], symbol["imports"]) for name in referenced_names(source)}
+            self._edges[key] = self._indexed(names, exclude=key)
+        return self._edges[key]
+
+    def file_references(self, content: str) -> List[str]:
+        """Indexed classes referenced by top-level code such as a routes file"""
+        namespace, imports = file_context(content)
+        return self._indexed(resolve_name(name, namespace, imports) for name in referenced_names(content))
+
+    def by_short_name(self, name: str) -> List[str]:
+        """Classes with the given unqualified name, e.g. a route's `UserController`"""
+        if self._short_names is None:
+            self._short_names = {}
+            for key in self.index.symbols:
+                self._short_names.setdefault(key.rsplit("\\", 1)[-1], []).append(key)
+        return self._short_names.get(name.lower(), [])
+
+    def reachable(self, roots: Iterable[str]) -> List[str]:
+        """Breadth-first closure of `roots` over the dependency edges"""
+        seen = dict.fromkeys(roots)
+        queue = deque(seen)
+        while queue:
+            for dependency in self.edges(queue.popleft()):
+                if dependency not in seen:
+                    seen[dependency] = None
+                    queue.append(dependency)
+        return list(seen)
+
+    def _indexed(self, fqcns: Iterable[str], exclude: Optional[str] = None) -> List[str]:
+        keys = []
+        for fqcn in fqcns:
+            key = fqcn.lower()
+            if key != exclude and key not in keys and key in self.index.symbols:
+                keys.append(key)
+        return keys
+
+
+def route_roots(graph: DependencyGraph, routes: List[Dict], project_dir: Path) -> List[str]:
+    """Entry-point classes: route handler controllers plus classes the route files use"""
+    roots = []
+    for route in routes:
+        handler = route.get("handler", "unknown")
+        if handler not in ("unknown", "inline_function"):
+            roots.extend(graph.by_short_name(handler.split(".", 1)[0]))
+    for source_file in dict.fromkeys(route["source_file"] for route in routes if route.get("source_file")):
+        content = (project_dir / source_file).read_text(encoding="utf-8", errors="ignore")
+        roots.extend(graph.file_references(content))
+    return list(dict.fromkeys(roots))
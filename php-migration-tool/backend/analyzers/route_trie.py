@@ -0,0 +1,183 @@
+"""
+Route Trie
+Normalizes, deduplicates and matches route templates in time proportional to path length
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# `{id}`, `{id:\d+}`, `:id` and `<int:id>` all mark a path parameter
+PARAM_SEGMENT = re.compile(r"^(?:\{(\w+)(?::[^}]*)?\}|:(\w+)|<(?:\w+:)?(\w+)>)$")
+
+
+def split_path(path: str) -> List[str]:
+    """Path segments without the query string, empty segments or trailing slash"""
+    path = path.split("?", 1)[0]
+    return [segment for segment in path.split("/") if segment]
+
+
+def param_name(segment: str) -> Optional[str]:
+    """Parameter name if the template segment is a parameter, else None"""
+    if segment[0] not in "{:<":
+        return None
+    match = PARAM_SEGMENT.match(segment)
+    if match is None:
+        return None
+    return match.group(1) or match.group(2) or match.group(3)
+
+
+def normalize_template(path: str) -> Tuple[str, List[str]]:
+    """
+    Canonical form of a route template and its parameter names:
+    `/users/:id/` and `/users/{id:\\d+}` both become `/users/{id}`
+    """
+    segments = []
+    params = []
+    for segment in split_path(path):
+        name = param_name(segment)
+        if name is None:
+            segments.append(segment)
+        else:
+            segments.append(f"{{{name}}}")
+            params.append(name)
+    return "/" + "/".join(segments), params
+
+
+def sample_path(template: str, value: str = "1") -> str:
+    """Concrete request path for a template, with every parameter set to `value`"""
+    return "/" + "/".join(value if param_name(segment) is not None else segment for segment in split_path(template))
+
+
+class _Node:
+    __slots__ = ("literals", "param", "routes")
+
+    def __init__(self):
+        self.literals: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.routes: Dict[str, Dict] = {}
+
+
+class RouteTrie:
+    """
+    Prefix tree of route templates, one level per path segment.
+
+    Adding a route normalizes its template in the same walk that inserts
+    it, so building the trie is linear in the total length of all paths.
+    Two routes ending on the same node with the same method are the same
+    route: identical templates (`/users/:id` and `/users/{id}`) are merged,
+    while different parameter names (`/users/:id` and `/users/{user}`) are
+    recorded as a conflict and the first one is kept.
+
+    Literal segments are looked up in a dict and take precedence over a
+    parameter at the same position; matching falls back to the parameter
+    branch only when the literal branch does not lead to a route. The cost
+    of a match is proportional to the number of segments in the path, not
+    the number of routes.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        self.routes: List[Dict] = []
+        self.conflicts: List[Dict] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.routes)
+
+    @classmethod
+    def from_routes(cls, routes: Iterable[Dict]) -> "RouteTrie":
+        """Trie of analyzer routes (dicts with `method` and `path`)"""
+        trie = cls()
+        for route in routes:
+            trie.add_route(route)
+        return trie
+
+    def add(self, method: str, template: str) -> Optional[Dict]:
+        return self.add_route({"method": method, "path": template})
+
+    def add_route(self, route: Dict) -> Optional[Dict]:
+        """
+        Insert a route. Returns a copy of it with `method` upper-cased and
+        `template`/`params` filled in, or None if it duplicates or conflicts
+        with a route already in the trie.
+        """
+        node = self.root
+        segments = []
+        params = []
+        for segment in split_path(route["path"]):
+            name = param_name(segment)
+            if name is not None:
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+                segments.append(f"{{{name}}}")
+                params.append(name)
+            else:
+                node = node.literals.setdefault(segment, _Node())
+                segments.append(segment)
+        template = "/" + "/".join(segments)
+        method = route.get("method", "GET").upper()
+
+        existing = node.routes.get(method)
+        if existing is not None:
+            if existing["template"] != template:
+                self.conflicts.append({
+                    "method": method,
+                    "template": existing["template"],
+                    "conflicting_template": template,
+                    "path": route["path"],
+                    "file": route.get("file", "unknown"),
+                })
+            return None
+
+        entry = {**route, "method": method, "template": template, "params": params}
+        node.routes[method] = entry
+        self.routes.append(entry)
+        return entry
+
+    def specific_first(self) -> List[Dict]:
+        """
+        Routes ordered so that at every segment literals come before a
+        parameter, e.g. `/users/me` before `/users/{id}`. Frameworks that
+        match routes in registration order need this order.
+        """
+        ordered = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            ordered.extend(node.routes.values())
+            if node.param is not None:
+                stack.append(node.param)
+            stack.extend(reversed(list(node.literals.values())))
+        return ordered
+
+    def match(self, method: str, path: str) -> Optional[str]:
+        """Normalized template of the route serving `method path`, or None"""
+        route = self._match(self.root, split_path(path), 0, method.upper(), None)
+        return route["template"] if route else None
+
+    def resolve(self, method: str, path: str) -> Optional[Tuple[Dict, Dict[str, str]]]:
+        """The route serving `method path` and its parameter values, or None"""
+        values: List[str] = []
+        route = self._match(self.root, split_path(path), 0, method.upper(), values)
+        if route is None:
+            return None
+        return route, dict(zip(route["params"], values))
+
+    def _match(self, node: _Node, segments: List[str], depth: int, method: str,
+               values: Optional[List[str]]) -> Optional[Dict]:
+        if depth == len(segments):
+            return node.routes.get(method)
+        child = node.literals.get(segments[depth])
+        if child is not None:
+            route = self._match(child, segments, depth + 1, method, values)
+            if route is not None:
+                return route
+        if node.param is not None:
+            if values is not None:
+                values.append(segments[depth])
+            route = self._match(node.param, segments, depth + 1, method, values)
+            if route is None and values is not None:
+                values.pop()
+            return route
+        return None
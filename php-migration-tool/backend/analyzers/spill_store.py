@@ -0,0 +1,206 @@
+"""
+Analysis Spill Store
+Keeps per-file analysis results in SQLite so huge projects analyze in bounded memory
+"""
+
+import json
+import re
+import sqlite3
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+from analyzers.route_trie import normalize_template
+
+PARAM_PLACEHOLDER = re.compile(r"\{\w+\}")
+VIEWS = ("routes", "models", "dependencies", "route_conflicts")
+
+SCHEMA = """
+CREATE TABLE routes (
+    id INTEGER PRIMARY KEY,
+    method TEXT NOT NULL,
+    shape TEXT NOT NULL,
+    template TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (method, shape)
+);
+CREATE TABLE route_conflicts (id INTEGER PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE models (id INTEGER PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE dependencies (name TEXT PRIMARY KEY, file TEXT) WITHOUT ROWID;
+CREATE TABLE index_symbols (key TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE index_files (key TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID;
+"""
+
+
+def _dumps(value: Dict) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class JsonTable(MutableMapping):
+    """
+    Dict-like view of a key/JSON table, so a SymbolIndex can keep its
+    symbols and files on disk. Values are copies: store a changed value
+    back by assigning it.
+    """
+
+    def __init__(self, db: sqlite3.Connection, table: str):
+        self.db = db
+        self.table = table
+
+    def __getitem__(self, key: str) -> Any:
+        row = self.db.execute(f"SELECT data FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __setitem__(self, key: str, value: Any):
+        self.db.execute(f"INSERT OR REPLACE INTO {self.table} (key, data) VALUES (?, ?)", (key, _dumps(value)))
+
+    def __delitem__(self, key: str):
+        if not self.db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,)).rowcount:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return self.db.execute(f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, in self.db.execute(f"SELECT key FROM {self.table} ORDER BY key"))
+
+    def __len__(self) -> int:
+        return self.db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class SpillStore:
+    """
+    On-disk analysis results for one project.
+
+    The analyzer hands over each file's routes, models and dependencies as
+    soon as the file is done, so only one file's results are held in memory
+    at a time. Routes are normalized and deduplicated on insert with the
+    same rules as RouteTrie: a (method, template shape) pair is stored once,
+    and a second route with different parameter names is recorded as a
+    conflict. Counts are kept as running counters, so summaries never scan
+    the tables.
+
+    Results are read back a page at a time with `page()`, or all at once
+    with `to_analysis()` for the generators.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, counts: Dict[str, int]):
+        self.db = connection
+        self.counts = counts
+
+    @classmethod
+    def create(cls, path: Path) -> "SpillStore":
+        """Empty store at `path`, replacing the results of an earlier analysis"""
+        path.unlink(missing_ok=True)
+        db = sqlite3.connect(path)
+        # Derived data: if the process dies mid-analysis, analyze again
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.executescript(SCHEMA)
+        return cls(db, dict.fromkeys(VIEWS, 0))
+
+    @classmethod
+    def open(cls, path: Path) -> "SpillStore":
+        """Store written by an earlier analysis"""
+        if not path.exists():
+            raise FileNotFoundError(path)
+        db = sqlite3.connect(path)
+        counts = {view: db.execute(f"SELECT COUNT(*) FROM {view}").fetchone()[0] for view in VIEWS}
+        return cls(db, counts)
+
+    def add_routes(self, routes: Iterable[Dict]):
+        for route in routes:
+            template, params = normalize_template(route["path"])
+            method = route.get("method", "GET").upper()
+            shape = PARAM_PLACEHOLDER.sub("{}", template)
+            entry = {**route, "method": method, "template": template, "params": params}
+            inserted = self.db.execute(
+                "INSERT OR IGNORE INTO routes (method, shape, template, data) VALUES (?, ?, ?, ?)",
+                (method, shape, template, _dumps(entry)),
+            ).rowcount
+            if inserted:
+                self.counts["routes"] += 1
+                continue
+            existing = self.db.execute(
+                "SELECT template FROM routes WHERE method = ? AND shape = ?", (method, shape)
+            ).fetchone()[0]
+            if existing != template:
+                self.db.execute("INSERT INTO route_conflicts (data) VALUES (?)", (_dumps({
+                    "method": method,
+                    "template": existing,
+                    "conflicting_template": template,
+                    "path": route["path"],
+                    "file": route.get("file", "unknown"),
+                }),))
+                self.counts["route_conflicts"] += 1
+
+    def add_models(self, models: Iterable[Dict]):
+        rows = [(_dumps(model),) for model in models]
+        self.db.executemany("INSERT INTO models (data) VALUES (?)", rows)
+        self.counts["models"] += len(rows)
+
+    def add_dependencies(self, names: Iterable[str]):
+        for name in names:
+            self.counts["dependencies"] += self.db.execute(
+                "INSERT OR IGNORE INTO dependencies (name) VALUES (?)", (name,)
+            ).rowcount
+
+    def symbol_tables(self) -> Dict[str, JsonTable]:
+        """Storage for a SymbolIndex built during a bounded analysis: SymbolIndex(root, **tables)"""
+        return {"symbols": JsonTable(self.db, "index_symbols"), "files": JsonTable(self.db, "index_files")}
+
+    def set_dependency_files(self, files: Dict[str, str]):
+        self.db.executemany(
+            "UPDATE dependencies SET file = ? WHERE name = ?", [(path, name) for name, path in files.items()]
+        )
+
+    def routes(self, offset: int = 0, limit: int = -1) -> Iterator[Dict]:
+        """Routes in the order they were found"""
+        return self._rows("SELECT data FROM routes ORDER BY id LIMIT ? OFFSET ?", limit, offset)
+
+    def models(self, offset: int = 0, limit: int = -1) -> Iterator[Dict]:
+        return self._rows("SELECT data FROM models ORDER BY id LIMIT ? OFFSET ?", limit, offset)
+
+    def route_conflicts(self, offset: int = 0, limit: int = -1) -> Iterator[Dict]:
+        return self._rows("SELECT data FROM route_conflicts ORDER BY id LIMIT ? OFFSET ?", limit, offset)
+
+    def dependencies(self, offset: int = 0, limit: int = -1) -> Iterator[str]:
+        """Dependency names, sorted"""
+        cursor = self.db.execute("SELECT name FROM dependencies ORDER BY name LIMIT ? OFFSET ?", (limit, offset))
+        return (name for name, in cursor)
+
+    def dependency_files(self) -> Dict[str, str]:
+        cursor = self.db.execute("SELECT name, file FROM dependencies WHERE file IS NOT NULL ORDER BY name")
+        return dict(cursor)
+
+    def page(self, view: str, offset: int = 0, limit: int = 100) -> Dict:
+        """One page of a result table, e.g. for the analysis views API"""
+        if view not in VIEWS:
+            raise KeyError(view)
+        if view == "dependencies":
+            cursor = self.db.execute(
+                "SELECT name, file FROM dependencies ORDER BY name LIMIT ? OFFSET ?", (limit, offset)
+            )
+            items = [{"name": name, "file": file} for name, file in cursor]
+        else:
+            items = list(getattr(self, view)(offset, limit))
+        return {"view": view, "total": self.counts[view], "offset": offset, "limit": limit, "items": items}
+
+    def to_analysis(self) -> Dict[str, object]:
+        """Everything in the store, shaped like an in-memory analysis result"""
+        return {
+            "routes": list(self.routes()),
+            "route_conflicts": list(self.route_conflicts()),
+            "models": list(self.models()),
+            "dependencies": list(self.dependencies()),
+            "dependency_files": self.dependency_files(),
+        }
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def _rows(self, query: str, limit: int, offset: int) -> Iterator[Dict]:
+        return (json.loads(data) for data, in self.db.execute(query, (limit, offset)))
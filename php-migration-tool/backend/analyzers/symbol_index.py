@@ -0,0 +1,286 @@
+"""
+PHP Symbol Index
+Maps fully qualified class names to the file and span that declare them
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, MutableMapping, Optional, Tuple
+
+NAMESPACE_PATTERN = re.compile(r"^\s*namespace\s+([\w\\]+)\s*[;{]", re.MULTILINE)
+DECLARATION_PATTERN = re.compile(
+    r"^[ \t]*(?:(?:abstract|final|readonly)\s+)*(class|interface|trait|enum)\s+(\w+)"
+    r"(?:\s*:\s*\w+)?"
+    r"(?:\s+extends\s+([\w\\]+(?:\s*,\s*[\w\\]+)*))?"
+    r"(?:\s+implements\s+([\w\\]+(?:\s*,\s*[\w\\]+)*))?",
+    re.MULTILINE,
+)
+USE_PATTERN = re.compile(r"^\s*use\s+(function\s+|const\s+)?([^;]+);", re.MULTILINE)
+IMPORT_CLAUSE = re.compile(r"^[\w\\{},\s]+$")
+SKIP_DIRS = {".git", "node_modules"}
+INDEX_VERSION = 1
+
+
+def find_block_end(content: str, position: int) -> int:
+    """Offset just past the brace block that opens at or after `position`"""
+    brace_start = content.find('{', position)
+    if brace_start == -1:
+        return len(content)
+    depth = 0
+    for pos in range(brace_start, len(content)):
+        if content[pos] == '{':
+            depth += 1
+        elif content[pos] == '}':
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+    return len(content)
+
+
+def parse_use_clause(clause: str) -> Dict[str, str]:
+    """
+    Aliases imported by one `use` clause, e.g. `App\\Models\\User as U`
+    or the group form `App\\Models\\{User, Post as P}`
+    """
+    imports = {}
+    clause = clause.strip()
+    group = re.match(r"([\w\\]*)\\?\{(.*)\}", clause, re.DOTALL)
+    if group:
+        prefix = group.group(1).strip("\\")
+        parts = [f"{prefix}\\{part.strip()}" for part in group.group(2).split(",") if part.strip()]
+    else:
+        parts = [part.strip() for part in clause.split(",")]
+    for part in parts:
+        name, _, alias = part.partition(" as ")
+        name = name.strip().lstrip("\\")
+        if name:
+            imports[(alias.strip() or name.rsplit("\\", 1)[-1]).lower()] = name
+    return imports
+
+
+def resolve_name(name: str, namespace: str, imports: Dict[str, str]) -> str:
+    """Resolve a class name as written in source to its FQCN (PHP rules)"""
+    if name.startswith("\\"):
+        return name[1:]
+    head, _, rest = name.partition("\\")
+    imported = imports.get(head.lower())
+    if imported:
+        return f"{imported}\\{rest}" if rest else imported
+    if name.lower().startswith("namespace\\"):
+        name = name[len("namespace\\"):]
+    return f"{namespace}\\{name}" if namespace else name
+
+
+def parse_symbols(content: str) -> List[Dict]:
+    """Class-like declarations in one file with their namespace, imports and span"""
+    namespaces = [(match.start(), match.group(1)) for match in NAMESPACE_PATTERN.finditer(content)]
+
+    def namespace_at(position: int) -> str:
+        current = ""
+        for start, name in namespaces:
+            if start > position:
+                break
+            current = name
+        return current
+
+    declarations = [(match, find_block_end(content, match.end())) for match in DECLARATION_PATTERN.finditer(content)]
+
+    imports_by_namespace: Dict[str, Dict[str, str]] = {}
+    for match in USE_PATTERN.finditer(content):
+        # `use SomeTrait;` inside a class body is not an import
+        if match.group(1) or not IMPORT_CLAUSE.match(match.group(2)) \
+                or any(decl.start() < match.start() < end for decl, end in declarations):
+            continue
+        imports_by_namespace.setdefault(namespace_at(match.start()), {}).update(parse_use_clause(match.group(2)))
+
+    symbols = []
+    for match, end in declarations:
+        namespace = namespace_at(match.start())
+        imports = imports_by_namespace.get(namespace, {})
+        name = match.group(2)
+        symbols.append({
+            "fqcn": f"{namespace}\\{name}" if namespace else name,
+            "kind": match.group(1),
+            "namespace": namespace,
+            "imports": imports,
+            "extends": [resolve_name(n.strip(), namespace, imports) for n in (match.group(3) or "").split(",") if n.strip()],
+            "implements": [resolve_name(n.strip(), namespace, imports) for n in (match.group(4) or "").split(",") if n.strip()],
+            "offsets": [match.start(), end],
+            "span": [content.count("\n", 0, match.start()) + 1, content.count("\n", 0, end) + 1],
+        })
+    return symbols
+
+
+class SymbolIndex:
+    """
+    Persistent FQCN -> file -> span index for one PHP project.
+
+    Lookups are a single dict access on the lower-cased FQCN (PHP class names
+    are case-insensitive). update() re-parses only files whose size or mtime
+    changed since the last run, and drops symbols from deleted files, so
+    re-analyzing an upload is close to free. The PSR-4 map from the
+    project's composer.json locates classes that have not been indexed yet.
+
+    `symbols` and `files` are plain dicts unless other mappings are passed
+    in, such as the SQLite-backed tables of a SpillStore.
+    """
+
+    def __init__(self, root: Path, index_path: Optional[Path] = None,
+                 symbols: Optional[MutableMapping[str, Dict]] = None,
+                 files: Optional[MutableMapping[str, Dict]] = None):
+        self.root = Path(root)
+        self.index_path = Path(index_path) if index_path else None
+        self.psr4: List[Tuple[str, List[str]]] = []
+        self.symbols: MutableMapping[str, Dict] = {} if symbols is None else symbols
+        self.files: MutableMapping[str, Dict] = {} if files is None else files
+
+    # -- persistence -------------------------------------------------------
+
+    @classmethod
+    def open(cls, root: Path, index_path: Optional[Path] = None, **tables) -> "SymbolIndex":
+        """Load the saved index if there is one and bring it up to date"""
+        index = cls(root, index_path, **tables)
+        if index.index_path and index.index_path.exists():
+            try:
+                data = json.loads(index.index_path.read_text())
+                if data.get("version") == INDEX_VERSION:
+                    index.files.update(data["files"])
+                    index.symbols.update(data["symbols"])
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: rebuilding unreadable symbol index: {e}")
+        if index.update() and index.index_path:
+            index.save()
+        return index
+
+    def save(self):
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"version": INDEX_VERSION, "files": dict(self.files), "symbols": dict(self.symbols)}))
+        tmp_path.replace(self.index_path)
+
+    # -- building ----------------------------------------------------------
+
+    def load_composer(self):
+        """Read the PSR-4 prefixes of the project's composer.json (autoload and autoload-dev)"""
+        self.psr4 = []
+        composer = self._find_composer()
+        if composer is None:
+            return
+        try:
+            data = json.loads(composer.read_text(encoding="utf-8", errors="ignore"))
+        except ValueError as e:
+            print(f"Warning: cannot parse {composer}: {e}")
+            return
+        base = composer.parent.relative_to(self.root)
+        for section in ("autoload", "autoload-dev"):
+            for prefix, dirs in (data.get(section) or {}).get("psr-4", {}).items():
+                dirs = [dirs] if isinstance(dirs, str) else dirs
+                self.psr4.append((prefix.strip("\\").lower(), [(base / d).as_posix().rstrip("/") for d in dirs]))
+        # Longest prefix wins
+        self.psr4.sort(key=lambda entry: len(entry[0]), reverse=True)
+
+    def _find_composer(self) -> Optional[Path]:
+        if (self.root / "composer.json").exists():
+            return self.root / "composer.json"
+        candidates = [path for path in self.root.rglob("composer.json") if "vendor" not in path.parts]
+        return min(candidates, key=lambda path: len(path.parts)) if candidates else None
+
+    def update(self) -> bool:
+        """Re-index changed files and forget deleted ones; returns True if anything changed"""
+        self.load_composer()
+        seen = set()
+        changed = False
+        for path, stat in self._php_files():
+            relative = path.relative_to(self.root).as_posix()
+            seen.add(relative)
+            known = self.files.get(relative)
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                continue
+            self.update_file(relative, stat)
+            changed = True
+        for relative in set(self.files) - seen:
+            self.remove_file(relative)
+            changed = True
+        return changed
+
+    def update_file(self, relative: str, stat: Optional[os.stat_result] = None):
+        """(Re-)index one file given relative to the project root"""
+        path = self.root / relative
+        stat = stat or path.stat()
+        self.remove_file(relative)
+        try:
+            content = path.read_text(encoding="utf-8", errors="ignore")
+        except OSError as e:
+            print(f"Error indexing {path}: {e}")
+            return
+        keys = []
+        for symbol in parse_symbols(content):
+            symbol["file"] = relative
+            key = symbol["fqcn"].lower()
+            self.symbols[key] = symbol
+            keys.append(key)
+        self.files[relative] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "symbols": keys}
+
+    def remove_file(self, relative: str):
+        entry = self.files.pop(relative, None)
+        for key in entry["symbols"] if entry else []:
+            if self.symbols.get(key, {}).get("file") == relative:
+                del self.symbols[key]
+
+    def _php_files(self) -> Iterable[Tuple[Path, os.stat_result]]:
+        for directory, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                if name.endswith(".php"):
+                    path = Path(directory) / name
+                    yield path, path.stat()
+
+    # -- lookups -----------------------------------------------------------
+
+    def declared_in(self, relative: str) -> List[Dict]:
+        """Declarations indexed for one file"""
+        entry = self.files.get(relative)
+        return [self.symbols[key] for key in entry["symbols"] if key in self.symbols] if entry else []
+
+    def lookup(self, fqcn: str) -> Optional[Dict]:
+        """Declaration of a class, interface, trait or enum, or None"""
+        return self.symbols.get(fqcn.lstrip("\\").lower())
+
+    def locate(self, fqcn: str) -> Optional[str]:
+        """
+        File declaring `fqcn`: the indexed file if known, otherwise the
+        PSR-4 path for it when that file exists
+        """
+        symbol = self.lookup(fqcn)
+        if symbol:
+            return symbol["file"]
+        for candidate in self.psr4_paths(fqcn):
+            if (self.root / candidate).is_file():
+                self.update_file(candidate)
+                return candidate
+        return None
+
+    def psr4_paths(self, fqcn: str) -> List[str]:
+        """Candidate files for `fqcn` under the composer PSR-4 map"""
+        fqcn = fqcn.lstrip("\\")
+        lowered = fqcn.lower()
+        for prefix, dirs in self.psr4:
+            if prefix and not lowered.startswith(prefix + "\\"):
+                continue
+            relative = fqcn[len(prefix) + 1 if prefix else 0:].replace("\\", "/") + ".php"
+            return [f"{d}/{relative}" if d not in ("", ".") else relative for d in dirs]
+        return []
+
+    def resolve(self, name: str, namespace: str = "", imports: Optional[Dict[str, str]] = None) -> Optional[Dict]:
+        """Declaration for a name as written in a file with the given namespace and imports"""
+        return self.lookup(resolve_name(name, namespace, imports or {}))
+
+    def source(self, fqcn: str) -> Optional[str]:
+        """Source text of a declaration, read from its span"""
+        symbol = self.lookup(fqcn)
+        if not symbol:
+            return None
+        content = (self.root / symbol["file"]).read_text(encoding="utf-8", errors="ignore")
+        start, end = symbol["offsets"]
+        return content[start:end]
@@ -0,0 +1,237 @@
+"""
+PHP Migration Tool - Command Line
+Analyzes local PHP repositories or archives and generates their FastAPI projects, many in parallel
+
+Usage (from the backend directory):
+    python cli.py path/to/repo another.zip legacy.tar.gz --output migrations
+    python cli.py --repos-file portfolio.txt --output migrations --workers 8 --no-generate
+
+Each source is analyzed and generated in its own worker process, straight
+from disk: no upload, zip round-trip or HTTP. Results go to
+`<output>/<name>/`: `analysis.json`, the symbol index (re-analysis only
+re-indexes changed files), the generated project under `generated/` and
+its validation report (`validation.json`, see CodeValidator).
+A run report with per-repo status, timings and counts is written to
+`<output>/report.json`; the exit status is 1 if any source failed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from analyzers.php_analyzer import PHPAnalyzer
+from analyzers.spill_store import SpillStore
+from generators.project_writer import ProjectWriter
+from generators.code_validator import CodeValidator
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+def archive_name(source: Path) -> Optional[str]:
+    """Source name without its archive suffix, or None if it is not an archive"""
+    for suffix in ARCHIVE_SUFFIXES:
+        if source.name.lower().endswith(suffix):
+            return source.name[:-len(suffix)]
+    return None
+
+
+@contextmanager
+def extracted(source: Path) -> Iterator[Path]:
+    """Directory with the source's files; archives are unpacked to a temp dir for the duration"""
+    if source.is_dir():
+        yield source
+        return
+    with tempfile.TemporaryDirectory(prefix="php-migration-") as temp_dir:
+        target = Path(temp_dir)
+        if source.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(source) as archive:
+                archive.extractall(target)
+        else:
+            with tarfile.open(source) as archive:
+                if hasattr(tarfile, "data_filter"):
+                    archive.extractall(target, filter="data")
+                else:
+                    archive.extractall(target)
+        yield target
+
+
+def job_names(sources: List[Path]) -> List[str]:
+    """Unique output directory name per source"""
+    names = []
+    seen: Dict[str, int] = {}
+    for source in sources:
+        name = archive_name(source) or source.resolve().name or "project"
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}-{seen[name]}")
+    return names
+
+
+def run_job(source: str, output_dir: str, options: Dict) -> Dict:
+    """Analyze (and generate) one source; never raises, failures are reported"""
+    started = time.perf_counter()
+    output = Path(output_dir)
+    result = {"source": source, "output": output_dir, "status": "ok"}
+    try:
+        output.mkdir(parents=True, exist_ok=True)
+        spill_path = output / "analysis.db" if options.get("memory_bounded") else None
+        with extracted(Path(source)) as project_dir:
+            # An archive is unpacked somewhere new on every run
+            index_path = output / "symbols.json" if Path(source).is_dir() else None
+            analysis = PHPAnalyzer().analyze_directory(
+                project_dir,
+                index_path=index_path,
+                reachable_only=options.get("reachable_only", False),
+                profile=options.get("profile", False),
+                spill_path=spill_path,
+            )
+        with open(output / "analysis.json", "w") as handle:
+            json.dump(analysis, handle)
+
+        counts = analysis["store"] or {
+            "routes": len(analysis["routes"]),
+            "models": len(analysis["models"]),
+            "route_conflicts": len(analysis["route_conflicts"]),
+        }
+        result.update({
+            "file_count": analysis["file_count"],
+            "routes": counts["routes"],
+            "models": counts["models"],
+            "route_conflicts": counts["route_conflicts"],
+            "summary": analysis["summary"],
+        })
+        if analysis["profile"]:
+            result["profile"] = {key: analysis["profile"][key] for key in ("total_s", "phases_s", "bytes_per_sec")}
+
+        if options.get("generate", True):
+            if spill_path:
+                store = SpillStore.open(spill_path)
+                try:
+                    analysis = {**analysis, **store.to_analysis()}
+                finally:
+                    store.close()
+            result["files"] = ProjectWriter().write(analysis, output / "generated", options.get("generation"))
+            if options.get("validate", True):
+                validation = CodeValidator().validate(output / "generated", options.get("validate_import", False))
+                (output / "validation.json").write_text(json.dumps(validation, indent=2))
+                result["validation"] = {key: validation[key] for key in ("ok", "errors", "warnings")}
+                if validation["import"]:
+                    result["validation"]["import_s"] = validation["import"]["seconds"]
+    except Exception as e:
+        result.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def run_batch(sources: List[Path], output_dir: Path, options: Dict, workers: int = 1) -> Dict:
+    """Run every source and return the run report, results in input order"""
+    started = time.perf_counter()
+    jobs = [(str(source), str(output_dir / name)) for source, name in zip(sources, job_names(sources))]
+    results: List[Optional[Dict]] = [None] * len(jobs)
+
+    def finished(index: int, result: Dict):
+        results[index] = result
+        done = sum(1 for r in results if r is not None)
+        detail = result.get("summary") if result["status"] == "ok" else result["error"]
+        if result.get("validation") and not result["validation"]["ok"]:
+            detail += f" [generated code: {result['validation']['errors']} validation errors]"
+        print(f"[{done}/{len(jobs)}] {result['status']:<6} {result['seconds']:>7.1f}s  {result['source']}: {detail}",
+              flush=True)
+
+    if workers <= 1 or len(jobs) <= 1:
+        for index, (source, output) in enumerate(jobs):
+            finished(index, run_job(source, output, options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_job, source, output, options): index
+                       for index, (source, output) in enumerate(jobs)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:  # worker process died
+                    result = {"source": jobs[index][0], "output": jobs[index][1], "status": "failed",
+                              "error": f"{type(e).__name__}: {e}", "seconds": 0.0}
+                finished(index, result)
+
+    succeeded = [result for result in results if result["status"] == "ok"]
+    return {
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "workers": workers,
+        "sources": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "invalid": sum(1 for result in succeeded if result.get("validation") and not result["validation"]["ok"]),
+        "totals": {
+            key: sum(result[key] for result in succeeded)
+            for key in ("file_count", "routes", "models", "route_conflicts")
+        },
+        "options": options,
+        "results": results,
+    }
+
+
+def read_sources(paths: List[str], repos_file: Optional[Path]) -> List[Path]:
+    sources = [Path(path) for path in paths]
+    if repos_file:
+        for line in repos_file.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                sources.append(Path(line))
+    return sources
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="php-migration-tool", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="*", help="PHP project directories or .zip/.tar(.gz) archives")
+    parser.add_argument("--repos-file", type=Path, help="File with one source per line (# comments allowed)")
+    parser.add_argument("--output", type=Path, default=Path("migrations"), help="Output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel worker processes")
+    parser.add_argument("--no-generate", action="store_true", help="Only analyze")
+    parser.add_argument("--reachable-only", action="store_true", help="Only parse classes reachable from routes")
+    parser.add_argument("--memory-bounded", action="store_true", help="Spill analysis results to SQLite")
+    parser.add_argument("--profile", action="store_true", help="Include phase timings in the report")
+    parser.add_argument("--no-validate", action="store_true", help="Skip validating the generated code")
+    parser.add_argument("--import-check", action="store_true",
+                        help="Also import the generated app in a subprocess (runs the generated code)")
+    parser.add_argument("--options", type=Path, help="JSON generation options, as in POST /api/generate")
+    parser.add_argument("--report", type=Path, help="Run report path (default <output>/report.json)")
+    args = parser.parse_args(argv)
+
+    sources = read_sources(args.sources, args.repos_file)
+    if not sources:
+        parser.error("no sources given")
+    missing = [str(source) for source in sources if not source.is_dir() and not (source.is_file() and archive_name(source))]
+    if missing:
+        parser.error(f"not a directory or supported archive: {', '.join(missing)}")
+
+    options = {
+        "generate": not args.no_generate,
+        "reachable_only": args.reachable_only,
+        "memory_bounded": args.memory_bounded,
+        "profile": args.profile,
+        "validate": not args.no_validate,
+        "validate_import": args.import_check,
+        "generation": json.loads(args.options.read_text()) if args.options else {},
+    }
+    args.output.mkdir(parents=True, exist_ok=True)
+    report = run_batch(sources, args.output, options, workers=args.workers)
+
+    report_path = args.report or args.output / "report.json"
+    report_path.write_text(json.dumps(report, indent=2))
+    print(f"{report['succeeded']}/{report['sources']} succeeded in {report['elapsed_s']:.1f}s "
+          f"({report['totals']['routes']} routes, {report['totals']['models']} models); report: {report_path}")
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
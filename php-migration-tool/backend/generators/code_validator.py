@@ -0,0 +1,282 @@
+"""
+Generated Code Validator
+Checks a generated FastAPI project with `ast` before it is deployed
+"""
+
+import ast
+import json
+import keyword
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from analyzers.route_trie import RouteTrie
+from generators.python_source import HTTP_METHODS
+
+ERROR = "error"
+WARNING = "warning"
+
+# Parse files in worker processes only when there is enough source to pay for them
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
+DEFINITION = re.compile(r"[ \t]*(?:async[ \t]+)?(def|class)[ \t]+([A-Za-z_]\w*)[ \t]*(?:\(([^)]*)\))?")
+# `name: Type` annotations; `else:` and friends end the line after the colon
+FIELD = re.compile(r"[ \t]+([A-Za-z_]\w*)[ \t]*:[ \t]*[A-Za-z_]")
+
+# Names pydantic's BaseModel already uses; a field with one of these names
+# shadows the BaseModel attribute
+BASEMODEL_ATTRIBUTES = {
+    "construct", "copy", "dict", "fields", "from_orm", "json", "parse_file", "parse_obj",
+    "parse_raw", "schema", "schema_json", "update_forward_refs", "validate",
+}
+
+# Packages the generated app depends on; if one is missing the import is skipped
+RUNTIME_PACKAGES = {"fastapi", "pydantic", "starlette", "httpx", "orjson"}
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+try:
+    import main
+except BaseException as e:
+    print(json.dumps({"error": f"{type(e).__name__}: {e}", "missing": getattr(e, "name", None)}))
+    sys.exit(1)
+print(json.dumps({"seconds": time.perf_counter() - started}))
+"""
+
+
+def _issue(severity: str, kind: str, file: str, line: Optional[int], message: str) -> Dict:
+    return {"severity": severity, "kind": kind, "file": file, "line": line, "message": message}
+
+
+def check_source(filename: str, source: str) -> Dict:
+    """
+    Parse one generated module. Returns its issues, top-level definitions,
+    imported names and route registrations as plain data, so it can run in
+    a worker process.
+    """
+    started = time.perf_counter()
+    issues = _keyword_names(filename, source)
+    try:
+        tree = ast.parse(source, filename=filename)
+    except SyntaxError as e:
+        # A keyword used as a name is already reported with a clearer message
+        if not any(issue["line"] == e.lineno for issue in issues):
+            issues.append(_issue(ERROR, "syntax_error", filename, e.lineno, e.msg))
+        return {"file": filename, "parsed": False, "issues": issues, "definitions": [], "routes": [],
+                "include_line": None, "parse_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    imported = {}
+    definitions = []
+    routes = []
+    include_line = None
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name != "*":
+                    imported[(alias.asname or alias.name).split(".")[0]] = node.lineno
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            kind = "class" if isinstance(node, ast.ClassDef) else "function"
+            definitions.append({"name": node.name, "kind": kind, "line": node.lineno})
+            if node.name in imported:
+                issues.append(_issue(ERROR, "shadowed_import", filename, node.lineno,
+                                     f"{kind} {node.name} replaces the name imported on line {imported[node.name]}"))
+            if isinstance(node, ast.ClassDef):
+                issues.extend(_field_issues(filename, node))
+            else:
+                routes.extend(_route_decorators(node))
+        elif include_line is None and _is_include_router(node):
+            include_line = node.lineno
+
+    seen = {}
+    for definition in definitions:
+        first = seen.setdefault(definition["name"], definition)
+        if first is not definition:
+            issues.append(_issue(ERROR, "duplicate_definition", filename, definition["line"],
+                                 f"{definition['kind']} {definition['name']} is already defined on line {first['line']}"))
+
+    return {"file": filename, "parsed": True, "issues": issues, "definitions": definitions, "routes": routes,
+            "include_line": include_line, "parse_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+def _keyword_names(filename: str, source: str) -> List[Dict]:
+    """Python keywords used as class, function, parameter or field names"""
+    issues = []
+    for line, text in enumerate(source.splitlines(), 1):
+        match = DEFINITION.match(text)
+        if match:
+            names = [match.group(2)]
+            if match.group(1) == "def" and match.group(3):
+                names += [param.split(":")[0].split("=")[0].strip().lstrip("*") for param in match.group(3).split(",")]
+            for name in names:
+                if keyword.iskeyword(name):
+                    issues.append(_issue(ERROR, "keyword_name", filename, line, f"'{name}' is a Python keyword"))
+            continue
+        match = FIELD.match(text)
+        if match and keyword.iskeyword(match.group(1)):
+            issues.append(_issue(ERROR, "keyword_name", filename, line, f"field '{match.group(1)}' is a Python keyword"))
+    return issues
+
+
+def _field_issues(filename: str, node: ast.ClassDef) -> List[Dict]:
+    """Model fields pydantic will not treat as ordinary fields"""
+    issues = []
+    for statement in node.body:
+        if not (isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name)):
+            continue
+        name = statement.target.id
+        if name.startswith("_"):
+            message = f"{node.name}.{name} starts with an underscore, so pydantic treats it as private, not a field"
+        elif name in BASEMODEL_ATTRIBUTES or name.startswith("model_"):
+            message = f"{node.name}.{name} shadows a pydantic BaseModel attribute"
+        else:
+            continue
+        issues.append(_issue(WARNING, "model_field", filename, statement.lineno, message))
+    return issues
+
+
+def _route_decorators(node: ast.AST) -> List[Dict]:
+    """`@router.get("/path")`-style registrations on one handler"""
+    routes = []
+    for decorator in node.decorator_list:
+        if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)):
+            continue
+        method = decorator.func.attr
+        if method not in HTTP_METHODS or not decorator.args:
+            continue
+        path = decorator.args[0]
+        if isinstance(path, ast.Constant) and isinstance(path.value, str):
+            routes.append({"method": method.upper(), "path": path.value, "handler": node.name,
+                           "line": decorator.lineno})
+    return routes
+
+
+def _is_include_router(node: ast.AST) -> bool:
+    return (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Attribute) and node.value.func.attr == "include_router")
+
+
+class CodeValidator:
+    """
+    Post-generation checks for a migrated project.
+
+    Every module is parsed with `ast` (in worker processes for large
+    projects). The checks find keywords used as names, duplicate handler or
+    model definitions, models that replace imported names, fields pydantic
+    will not accept, and route collisions. A route collision is two handlers
+    for the same method and path shape. A route is shadowed when an earlier
+    parameterized route already matches every request meant for it.
+    With `import_check`, `main.py` is also imported in a subprocess while the
+    checks run, and the import time is reported. Importing executes the
+    generated code, so only ask for it when the analysis it was generated
+    from is trusted (the CLI on a local project, never an HTTP request).
+    """
+
+    def validate(self, project_dir: Path, import_check: bool = False, timeout: float = 30.0) -> Dict:
+        """Validation report for the generated project in `project_dir`"""
+        started = time.perf_counter()
+        probe = self._start_import(project_dir) if import_check and (project_dir / "main.py").exists() else None
+
+        sources = {path.name: path.read_text(encoding="utf-8") for path in sorted(project_dir.glob("*.py"))}
+        results = self._check_sources(sources)
+
+        issues = [issue for result in results.values() for issue in result["issues"]]
+        routes = self._registration_order(results)
+        issues.extend(self._route_issues(routes))
+
+        report = {
+            "ok": not any(issue["severity"] == ERROR for issue in issues),
+            "errors": sum(1 for issue in issues if issue["severity"] == ERROR),
+            "warnings": sum(1 for issue in issues if issue["severity"] == WARNING),
+            "issues": issues,
+            "handlers": len(routes),
+            "models": sum(1 for definition in results.get("models.py", {}).get("definitions", [])
+                          if definition["kind"] == "class"),
+            "files": {name: {"parsed": result["parsed"], "parse_ms": result["parse_ms"]}
+                      for name, result in results.items()},
+            "import": self._finish_import(probe, timeout) if probe else None,
+        }
+        if report["import"] and report["import"]["error"] and not report["import"]["skipped"]:
+            report["ok"] = False
+        report["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return report
+
+    def _check_sources(self, sources: Dict[str, str]) -> Dict[str, Dict]:
+        if len(sources) > 1 and sum(len(source) for source in sources.values()) >= PARALLEL_MIN_BYTES:
+            with ProcessPoolExecutor(max_workers=min(len(sources), 4)) as pool:
+                results = pool.map(check_source, sources.keys(), sources.values())
+                return {result["file"]: result for result in results}
+        return {name: check_source(name, source) for name, source in sources.items()}
+
+    def _registration_order(self, results: Dict[str, Dict]) -> List[Dict]:
+        """
+        Routes in the order FastAPI registers them: main.py's own routes
+        declared before `include_router`, then routes.py, then the rest of
+        main.py
+        """
+        main = results.get("main.py", {"routes": [], "include_line": None})
+        router = [{**route, "file": "routes.py"} for route in results.get("routes.py", {}).get("routes", [])]
+        include_line = main["include_line"]
+        before, after = [], []
+        for route in main["routes"]:
+            route = {**route, "file": "main.py"}
+            (before if include_line is not None and route["line"] < include_line else after).append(route)
+        if include_line is None:
+            return router + after
+        return before + router + after
+
+    def _route_issues(self, routes: List[Dict]) -> List[Dict]:
+        issues = []
+        trie = RouteTrie()
+        registered: Dict[Tuple[str, str], Dict] = {}
+        for route in routes:
+            template = trie.match(route["method"], route["path"])
+            if template is not None:
+                first = registered[(route["method"], template)]
+                where = f"{first['handler']} ({first['file']}:{first['line']})"
+                if self._shape(template) == self._shape(route["path"]):
+                    issues.append(_issue(ERROR, "route_collision", route["file"], route["line"],
+                                         f"{route['method']} {route['path']} ({route['handler']}) is already "
+                                         f"registered as {template} by {where}"))
+                else:
+                    issues.append(_issue(WARNING, "shadowed_route", route["file"], route["line"],
+                                         f"{route['method']} {route['path']} ({route['handler']}) is unreachable: "
+                                         f"{template} from {where} matches first"))
+            entry = trie.add(route["method"], route["path"])
+            if entry is not None:
+                registered[(entry["method"], entry["template"])] = route
+        return issues
+
+    def _shape(self, template: str) -> str:
+        return re.sub(r"\{\w+\}", "{}", template.rstrip("/") or "/")
+
+    def _start_import(self, project_dir: Path) -> subprocess.Popen:
+        return subprocess.Popen(
+            [sys.executable, "-c", IMPORT_PROBE],
+            cwd=project_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+    def _finish_import(self, probe: subprocess.Popen, timeout: float) -> Dict:
+        """Import time of main.py, or why it could not be imported"""
+        try:
+            stdout, _ = probe.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            probe.kill()
+            probe.communicate()
+            return {"seconds": None, "error": f"import took longer than {timeout:.0f}s", "skipped": False}
+        try:
+            result = json.loads(stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            return {"seconds": None, "error": f"import probe exited with status {probe.returncode}", "skipped": False}
+        if "error" in result:
+            # The generated app's own requirements are not installed here
+            skipped = result.get("missing") in RUNTIME_PACKAGES
+            return {"seconds": None, "error": result["error"], "skipped": skipped}
+        return {"seconds": round(result["seconds"], 4), "error": None, "skipped": False}
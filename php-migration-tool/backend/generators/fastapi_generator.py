@@ -3,19 +3,58 @@ FastAPI Code Generator
 Generates Python/FastAPI code from PHP analysis
 """
 
-from typing import Dict
+from typing import Dict, Optional
 import yaml
 
+from analyzers.route_trie import RouteTrie
+from generators.python_source import HTTP_METHODS, identifier, literal, text
+
+PRODUCTION = "production"
+
+DEFAULT_RUNTIME = {
+    "profile": "development",
+    "workers": None,  # one per CPU core available at startup
+    "gzip_minimum_size": 1024,
+    "gzip_compresslevel": 5,
+    "cors_origins": [],
+    "legacy_base_url": "http://legacy-php:80",
+    "legacy_max_connections": 100,
+    "legacy_timeout": 10.0,
+}
+
+
+def runtime_options(options: Optional[Dict] = None) -> Dict:
+    """The `runtime` generation option with DEFAULT_RUNTIME filled in"""
+    return {**DEFAULT_RUNTIME, **((options or {}).get('runtime') or {})}
+
+
 class FastAPIGenerator:
     """Generates FastAPI Python code"""
     
-    def generate(self, analysis: Dict, openapi_spec: str) -> Dict[str, str]:
-        """Generate FastAPI code files"""
+    def generate(self, analysis: Dict, openapi_spec: str, options: Optional[Dict] = None) -> Dict[str, str]:
+        """
+        Generate FastAPI code files
+        
+        With the `runtime` option `{"profile": "production", ...}` (keys as in
+        DEFAULT_RUNTIME), main.py is generated for production and two files
+        are added: `gunicorn` (gunicorn.conf.py) and `legacy` (a pooled
+        client for the legacy PHP app).
+        """
+        runtime = runtime_options(options)
+        
+        if runtime['profile'] != PRODUCTION:
+            return {
+                'main': self._generate_main(analysis),
+                'models': self._generate_models(analysis),
+                'routes': self._generate_routes(analysis)
+            }
         
         return {
-            'main': self._generate_main(analysis),
+            'main': self._generate_production_main(runtime),
             'models': self._generate_models(analysis),
-            'routes': self._generate_routes(analysis)
+            'routes': self._generate_routes(analysis),
+            'gunicorn': self._generate_gunicorn_config(runtime),
+            'legacy': self._generate_legacy_client(runtime)
         }
     
     def _generate_main(self, analysis: Dict) -> str:
@@ -63,6 +102,219 @@ if __name__ == "__main__":
         
         return code
     
+    def _generate_production_main(self, runtime: Dict) -> str:
+        """Generate main.py tuned for serving: fast JSON, gzip, pooled legacy client"""
+        
+        cors_origins = literal(','.join(str(origin) for origin in runtime['cors_origins']))
+        
+        return f'''"""
+Migrated FastAPI Application (production runtime profile)
+Generated from PHP project
+
+Serve with: gunicorn -c gunicorn.conf.py main:app
+"""
+
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+import legacy
+import routes
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+CORS_ORIGINS = [origin for origin in os.getenv("CORS_ORIGINS", {cors_origins}).split(",") if origin]
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "{int(runtime['gzip_minimum_size'])}"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled legacy client per worker process
+    await legacy.startup()
+    yield
+    await legacy.shutdown()
+
+
+app = FastAPI(
+    title="Migrated API",
+    description="API migrated from PHP to Python",
+    version="1.0.0",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan,
+)
+
+# Compress responses above the threshold; small JSON is cheaper sent as is
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel={int(runtime['gzip_compresslevel'])})
+
+# Only the configured origins (comma-separated CORS_ORIGINS)
+if CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+# Include routers
+app.include_router(routes.router)
+
+@app.get("/")
+async def root():
+    """Health check endpoint"""
+    return {{
+        "status": "healthy",
+        "message": "Migrated API is running"
+    }}
+
+if __name__ == "__main__":
+    import importlib.util
+    import runpy
+    import uvicorn
+
+    # Same worker count as under gunicorn
+    config = runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py"))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=config["workers"],
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        proxy_headers=True,
+    )
+'''
+    
+    def _generate_gunicorn_config(self, runtime: Dict) -> str:
+        """Generate gunicorn.conf.py: uvicorn workers sized to the CPU cores"""
+        
+        workers = int(runtime['workers']) if runtime['workers'] else None
+        default_workers = str(workers) if workers else "_cpu_count()"
+        
+        return f'''"""
+Gunicorn configuration (production runtime profile)
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Each worker is a uvicorn event loop, so one worker per CPU core is enough.
+Uvicorn uses uvloop and httptools when they are installed (uvicorn[standard]).
+Override with WEB_CONCURRENCY, PORT and GUNICORN_TIMEOUT.
+"""
+
+import os
+
+
+def _cpu_count() -> int:
+    # Cores this process may run on (respects container CPU sets)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{{os.getenv('PORT', '8000')}}"
+workers = int(os.getenv("WEB_CONCURRENCY") or {default_workers})
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Keep gateway connections open between requests
+keepalive = 75
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+
+# Recycle workers now and then to bound memory growth
+max_requests = 10000
+max_requests_jitter = 1000
+
+forwarded_allow_ips = "*"
+accesslog = "-"
+'''
+    
+    def _generate_legacy_client(self, runtime: Dict) -> str:
+        """Generate legacy.py: one pooled async client per worker for the legacy PHP app"""
+        
+        max_connections = int(runtime['legacy_max_connections'])
+        
+        return f'''"""
+Legacy PHP Client
+Pooled async HTTP client for calling back into the legacy PHP app
+
+Use `await legacy.client().get("/path")` in a handler, or return
+`await legacy.forward(request)` to serve a route from the legacy app until
+it is ported. Set the app's address with LEGACY_BASE_URL.
+"""
+
+import os
+from typing import Optional
+
+import httpx
+from fastapi import Request, Response
+
+LEGACY_BASE_URL = os.getenv("LEGACY_BASE_URL", {literal(runtime['legacy_base_url'])})
+
+# Headers that describe one connection and must not be forwarded
+HOP_BY_HOP = {{
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade", "host", "content-length",
+}}
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=LEGACY_BASE_URL,
+        limits=httpx.Limits(
+            max_connections={max_connections},
+            max_keepalive_connections={max_connections},
+            keepalive_expiry=30.0,
+        ),
+        timeout=httpx.Timeout({float(runtime['legacy_timeout'])}, connect=2.0),
+    )
+
+
+async def startup():
+    global _client
+    if _client is None:
+        _client = _new_client()
+
+
+async def shutdown():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def client() -> httpx.AsyncClient:
+    """The worker's pooled client (created on first use outside the app lifespan)"""
+    global _client
+    if _client is None:
+        _client = _new_client()
+    return _client
+
+
+async def forward(request: Request) -> Response:
+    """Send the incoming request to the legacy app and relay its response"""
+    upstream = await client().request(
+        request.method,
+        request.url.path,
+        params=request.query_params,
+        content=await request.body(),
+        headers={{key: value for key, value in request.headers.items() if key.lower() not in HOP_BY_HOP}},
+    )
+    # httpx has already decoded the body
+    headers = {{
+        key: value for key, value in upstream.headers.items()
+        if key.lower() not in HOP_BY_HOP and key.lower() != "content-encoding"
+    }}
+    return Response(upstream.content, status_code=upstream.status_code, headers=headers)
+'''
+    
     def _generate_models(self, analysis: Dict) -> str:
         """Generate models.py with Pydantic models"""
         
@@ -78,14 +330,14 @@ from datetime import datetime
 '''
         
         for model in analysis.get('models', []):
-            class_name = model['name']
+            class_name = identifier(model['name'])
             
             code += f"\nclass {class_name}(BaseModel):\n"
-            code += f'    """Migrated from {model.get("file", "unknown")}"""\n'
+            code += f'    """Migrated from {text(model.get("file", "unknown"))}"""\n'
             
             if model.get('properties'):
                 for prop in model['properties']:
-                    prop_name = prop['name']
+                    prop_name = identifier(prop['name'])
                     prop_type = self._php_type_to_python(prop.get('type', 'str'))
                     
                     code += f"    {prop_name}: {prop_type}\n"
@@ -120,51 +372,56 @@ router = APIRouter()
 
 '''
         
-        for route in analysis.get('routes', []):
+        # Deduplicated routes with templates in FastAPI's {param} form
+        trie = RouteTrie.from_routes(analysis.get('routes', []))
+        for conflict in trie.conflicts:
+            code += text(f"# Skipped {conflict['method']} {conflict['path']} ({conflict['file']}): "
+                         f"collides with {conflict['template']}") + "\n"
+        
+        # Literal paths first, so /users/me is not captured by /users/{id}
+        for route in trie.specific_first():
             method = route['method'].lower()
+            if method not in HTTP_METHODS:
+                code += text(f"# Skipped {route['method']} {route['path']}: not an HTTP method") + "\n"
+                continue
             path = route['path']
-            handler = route.get('handler', 'unknown')
-            
-            # Convert PHP path params to FastAPI format
-            # /users/:id -> /users/{id}
-            fastapi_path = path.replace(':', '')
+            handler = text(route.get('handler', 'unknown'))
+            source_file = text(route.get('file', 'unknown'))
+            fastapi_path = route['template']
             
             # Generate function name from path
-            func_name = self._path_to_function_name(path, method)
+            func_name = self._path_to_function_name(fastapi_path, method)
             
-            # Determine if path has parameters
-            has_params = '{' in fastapi_path or ':' in path
-            
-            if has_params:
-                # Extract parameter name
-                param_name = self._extract_param_name(path)
+            if route['params']:
+                signature = ', '.join(f"{name}: str" for name in route['params'])
+                echoed = ',\n'.join(f'        "{name}": {name}' for name in route['params'])
                 
                 code += f'''
-@router.{method}("{fastapi_path}")
-async def {func_name}({param_name}: str):
+@router.{method}({literal(fastapi_path)})
+async def {func_name}({signature}):
     """
-    Migrated from: {route.get('file', 'unknown')}
+    Migrated from: {source_file}
     Original handler: {handler}
     """
     # TODO: Implement business logic
     return {{
         "message": "Endpoint migrated from PHP",
-        "{param_name}": {param_name}
+{echoed}
     }}
 
 '''
             else:
                 code += f'''
-@router.{method}("{fastapi_path}")
+@router.{method}({literal(fastapi_path)})
 async def {func_name}():
     """
-    Migrated from: {route.get('file', 'unknown')}
+    Migrated from: {source_file}
     Original handler: {handler}
     """
     # TODO: Implement business logic
     return {{
         "message": "Endpoint migrated from PHP",
-        "path": "{path}"
+        "path": {literal(path)}
     }}
 
 '''
@@ -184,19 +441,7 @@ async def {func_name}():
         if not name:
             name = f"{method}_root"
         
-        return name.lower()
-    
-    def _extract_param_name(self, path: str) -> str:
-        """Extract parameter name from path"""
-        import re
-        
-        # Match :param or {param}
-        match = re.search(r'[:{](\w+)[}]?', path)
-        
-        if match:
-            return match.group(1)
-        
-        return "id"
+        return identifier(name.lower())
     
     def _php_type_to_python(self, php_type: str) -> str:
         """Convert PHP type to Python type hint"""
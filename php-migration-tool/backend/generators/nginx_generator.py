@@ -0,0 +1,206 @@
+"""
+Nginx Gateway Generator
+Generates strangler-fig gateway routing config with per-route cutover
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from analyzers.route_trie import RouteTrie, normalize_template, param_name, split_path
+
+NEW = "new"
+LEGACY = "legacy"
+
+DEFAULT_GATEWAY = {
+    "legacy_upstream": "legacy-php:80",
+    "new_upstream": "new-api:8000",
+    "keepalive": 64,
+    "default_target": NEW,
+    "prefix_locations": False,
+}
+
+# Characters that would need quoting in an nginx location
+UNSAFE_PATH = re.compile(r"[\s;{}'\"\\#]")
+
+class NginxGenerator:
+    """Generates nginx.conf routing migrated routes to the new service"""
+
+    def generate(self, analysis: Dict, options: Optional[Dict] = None) -> str:
+        """
+        Generate nginx.conf for the strangler gateway.
+
+        Every analyzed route goes to the new service unless cut back to the
+        legacy app; anything not analyzed falls through to legacy.
+
+        Options (all optional, under the generate request's `gateway` key):
+            legacy_upstream / new_upstream: host:port of each service
+            keepalive: idle upstream connections kept per worker
+            default_target: "new" or "legacy" for routes not in `cutover`
+            cutover: {"/users/{id}": "legacy", ...} per-path target
+            prefix_locations: share `^~` prefixes between parameterized
+                routes; off by default, which keeps one anchored regex per
+                route
+
+        Locations without parameters are exact matches (`location =`), which
+        nginx resolves with a hash lookup. Parameterized routes become
+        anchored regex locations, so only analyzed paths leave the legacy
+        app. With `prefix_locations`, routes share a `^~` prefix location
+        when every route under that prefix goes to the same service, so no
+        regex is evaluated. That also sends unanalyzed paths under the
+        prefix to that service. A prefix is not used when another route
+        that still needs a regex could match below it, since `^~` would
+        hide that regex. Output is sorted, so the same analysis always
+        produces the same file.
+        """
+        options = {**DEFAULT_GATEWAY, **(options or {})}
+        targets = self._route_targets(analysis, options)
+
+        exact, prefixes, regexes = self._plan_locations(targets, options['prefix_locations'])
+
+        locations = []
+        for path, target in sorted(exact.items()):
+            locations.append(self._location(f"= {path}", target))
+        for prefix, target in sorted(prefixes.items()):
+            locations.append(self._location(f"^~ {prefix}", target))
+        # Regex locations are tried in file order: most specific first
+        for pattern, target in sorted(regexes, key=lambda item: (-item[0].count('/'), item[0])):
+            locations.append(self._location(f"~ {pattern}", target))
+
+        return f'''# Generated by PHP Migration Tool - strangler gateway routing
+# {len(targets)} analyzed paths: {sum(1 for t in targets.values() if t == NEW)} on the new service
+
+events {{
+    worker_connections 4096;
+}}
+
+http {{
+    upstream legacy_php {{
+        server {options['legacy_upstream']};
+        keepalive {int(options['keepalive'])};
+        keepalive_requests 10000;
+        keepalive_timeout 60s;
+    }}
+
+    upstream new_api {{
+        server {options['new_upstream']};
+        keepalive {int(options['keepalive'])};
+        keepalive_requests 10000;
+        keepalive_timeout 60s;
+    }}
+
+    server {{
+        listen 80;
+        server_name localhost;
+
+        # Reuse upstream connections (HTTP/1.1 without Connection: close)
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+
+        # JSON responses are small: buffer them whole and free the upstream fast
+        proxy_buffering on;
+        proxy_buffer_size 16k;
+        proxy_buffers 32 16k;
+        proxy_busy_buffers_size 64k;
+
+        gzip on;
+        gzip_types application/json;
+        gzip_min_length 1024;
+
+        proxy_connect_timeout 5s;
+        proxy_send_timeout 30s;
+        proxy_read_timeout 30s;
+
+{chr(10).join(locations)}
+        # Everything not migrated stays on the legacy app
+        location / {{
+            proxy_pass http://legacy_php;
+        }}
+    }}
+}}
+'''
+
+    def _route_targets(self, analysis: Dict, options: Dict) -> Dict[str, str]:
+        """Target service for each distinct (normalized) route path"""
+        cutover = {normalize_template(path)[0]: target for path, target in (options.get('cutover') or {}).items()}
+        default = options['default_target']
+        targets = {}
+        for route in RouteTrie.from_routes(analysis.get('routes', [])).routes:
+            path = route['template']
+            if path in targets:
+                continue
+            literals = [segment for segment in split_path(path) if param_name(segment) is None]
+            if any(UNSAFE_PATH.search(segment) for segment in literals):
+                print(f"Skipping route with unsupported characters: {route['path']}")
+                continue
+            targets[path] = cutover.get(path, default)
+        return targets
+
+    def _plan_locations(self, targets: Dict[str, str], use_prefixes: bool = True
+                        ) -> Tuple[Dict[str, str], Dict[str, str], List[Tuple[str, str]]]:
+        """Split routes into exact locations, shared prefix locations and regex locations"""
+        exact = {}
+        by_prefix: Dict[str, List[Tuple[str, str]]] = {}
+        # Targets of exact paths below each directory prefix
+        exact_below: Dict[str, set] = {}
+        for path, target in targets.items():
+            segments = split_path(path)
+            params = [i for i, segment in enumerate(segments) if param_name(segment) is not None]
+            if not params:
+                exact[path] = target
+                for depth in range(1, len(segments)):
+                    exact_below.setdefault('/' + ''.join(f"{segment}/" for segment in segments[:depth]), set()).add(target)
+            else:
+                prefix = '/' + ''.join(f"{segment}/" for segment in segments[:params[0]])
+                by_prefix.setdefault(prefix, []).append((path, target))
+
+        prefixes = {}
+        for prefix, routes in by_prefix.items():
+            # Exact paths under the prefix are matched first anyway, but any
+            # other request under it must also belong to the same service
+            shared = {target for _, target in routes}
+            shared |= exact_below.get(prefix, set())
+            if use_prefixes and len(shared) == 1 and prefix != '/':
+                prefixes[prefix] = shared.pop()
+
+        # A `^~` match skips every regex location, so drop prefixes that a
+        # regex route could match below; that can expose shorter prefixes
+        changed = True
+        while changed:
+            regex_paths = [path for prefix, routes in by_prefix.items() if prefix not in prefixes
+                           for path, _ in routes]
+            hidden = [prefix for prefix in prefixes
+                      if any(self._may_match_below(path, prefix) for path in regex_paths)]
+            for prefix in hidden:
+                del prefixes[prefix]
+            changed = bool(hidden)
+
+        regexes = [(self._regex(path), target) for prefix, routes in by_prefix.items() if prefix not in prefixes
+                   for path, target in routes]
+        return exact, prefixes, regexes
+
+    @staticmethod
+    def _may_match_below(path: str, prefix: str) -> bool:
+        """Whether some request under directory `prefix` could match route `path`"""
+        segments = split_path(path)
+        literals = split_path(prefix)
+        return len(segments) > len(literals) and all(
+            param_name(segment) is not None or segment == literal
+            for segment, literal in zip(segments, literals)
+        )
+
+    def _regex(self, path: str) -> str:
+        parts = []
+        for segment in split_path(path):
+            parts.append('[^/]+' if param_name(segment) is not None else re.escape(segment))
+        return '^/' + '/'.join(parts) + '$'
+
+    def _location(self, match: str, target: str) -> str:
+        upstream = 'new_api' if target == NEW else 'legacy_php'
+        return f'''        location {match} {{
+            proxy_pass http://{upstream};
+        }}
+'''
@@ -6,6 +6,8 @@ Generates OpenAPI 3.0 specs from PHP analysis
 import yaml
 from typing import Dict, List
 
+from analyzers.route_trie import RouteTrie
+
 class OpenAPIGenerator:
     """Generates OpenAPI specifications from PHP analysis"""
     
@@ -25,9 +27,9 @@ class OpenAPIGenerator:
             }
         }
         
-        # Generate paths from routes
-        for route in analysis.get('routes', []):
-            path = route['path']
+        # Generate paths from deduplicated, normalized routes
+        for route in RouteTrie.from_routes(analysis.get('routes', [])).routes:
+            path = route['template']
             method = route['method'].lower()
             
             if path not in spec['paths']:
@@ -57,9 +59,8 @@ class OpenAPIGenerator:
             }
             
             # Add path parameters if present
-            if '{' in path:
-                params = self._extract_path_params(path)
-                spec['paths'][path][method]['parameters'] = params
+            if route['params']:
+                spec['paths'][path][method]['parameters'] = self._path_params(route['params'])
         
         # Generate schemas from models
         for model in analysis.get('models', []):
@@ -86,17 +87,11 @@ class OpenAPIGenerator:
         
         return yaml.dump(spec, default_flow_style=False, sort_keys=False)
     
-    def _extract_path_params(self, path: str) -> List[Dict]:
-        """Extract path parameters from route path"""
-        import re
+    def _path_params(self, names: List[str]) -> List[Dict]:
+        """OpenAPI path parameter objects for a route's parameter names"""
         params = []
         
-        # Find {param} patterns
-        param_pattern = r'\{(\w+)\}'
-        matches = re.finditer(param_pattern, path)
-        
-        for match in matches:
-            param_name = match.group(1)
+        for param_name in names:
             params.append({
                 'name': param_name,
                 'in': 'path',
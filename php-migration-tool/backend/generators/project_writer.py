@@ -0,0 +1,150 @@
+"""
+Project Writer
+Runs every generator over an analysis and writes the migrated project to disk
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from generators.openapi_generator import OpenAPIGenerator
+from generators.fastapi_generator import PRODUCTION, FastAPIGenerator, runtime_options
+from generators.test_generator import TestGenerator
+from generators.nginx_generator import NginxGenerator
+
+# File written for each generated artifact
+PROJECT_FILES = {
+    "openapi": "openapi.yaml",
+    "main": "main.py",
+    "models": "models.py",
+    "routes": "routes.py",
+    "tests": "test_api.py",
+    "performance_tests": "test_performance.py",
+    "gateway": "nginx.conf",
+    "requirements": "requirements.txt",
+    "readme": "README.md",
+    # Production runtime profile only
+    "gunicorn": "gunicorn.conf.py",
+    "legacy": "legacy.py",
+}
+
+REQUIREMENTS = """fastapi==0.104.1
+uvicorn[standard]==0.24.0
+pydantic==2.5.0
+pytest==7.4.3
+hypothesis==6.92.1
+httpx==0.25.2
+"""
+
+# Serving stack of the production runtime profile; uvicorn[standard]
+# already brings uvloop and httptools
+PRODUCTION_REQUIREMENTS = """gunicorn==21.2.0
+orjson==3.9.10
+"""
+
+RUN_DEVELOPMENT = """```bash
+uvicorn main:app --reload
+```
+"""
+
+RUN_PRODUCTION = """```bash
+gunicorn -c gunicorn.conf.py main:app
+```
+
+One uvicorn worker per CPU core (`WEB_CONCURRENCY` overrides), uvloop and
+httptools, orjson responses and gzip above `GZIP_MINIMUM_SIZE` bytes. Set
+`CORS_ORIGINS` (comma-separated) to allow browser origins and
+`LEGACY_BASE_URL` for `legacy.py`, the pooled client for calling the legacy
+PHP app. For local development, `uvicorn main:app --reload` still works.
+"""
+
+README = """# Migrated Python API
+
+Generated from PHP project using PHP Migration Tool.
+
+## Setup
+
+```bash
+pip install -r requirements.txt
+```
+
+## Run
+
+{run}
+## Test
+
+```bash
+pytest test_api.py
+```
+
+## Performance
+
+```bash
+pytest test_performance.py
+```
+
+Each route is held to the latency budget from its SLO, and a throughput
+smoke test runs across all routes. Results are written in pytest-benchmark
+JSON format to `benchmark.json` (override with `PERF_RESULTS`). Tune the run
+with `PERF_ITERATIONS`, `PERF_THROUGHPUT_SECONDS` and `PERF_MIN_THROUGHPUT_RPS`.
+
+## Gateway
+
+`nginx.conf` routes every migrated path to this service and everything else
+to the legacy PHP app (strangler fig). Static paths use exact-match
+locations and upstreams keep pooled keepalive connections. Move individual
+routes back to the legacy app with the `gateway.cutover` generation option.
+
+## API Documentation
+
+Visit http://localhost:8000/docs for interactive API documentation.
+"""
+
+
+class ProjectWriter:
+    """Generates the migrated FastAPI project for one analysis"""
+
+    def generate(self, analysis: Dict, options: Optional[Dict] = None) -> Dict[str, str]:
+        """Contents of every project file, keyed like PROJECT_FILES"""
+        options = options or {}
+
+        # Generate OpenAPI spec
+        openapi_spec = OpenAPIGenerator().generate(analysis)
+
+        # Generate FastAPI code
+        python_code = FastAPIGenerator().generate(analysis, openapi_spec, options)
+        production = runtime_options(options)['profile'] == PRODUCTION
+
+        # Generate tests
+        test_gen = TestGenerator()
+        tests = test_gen.generate(analysis, openapi_spec)
+        perf_tests = test_gen.generate_performance(analysis, openapi_spec, options)
+
+        # Generate gateway routing
+        gateway_config = NginxGenerator().generate(analysis, options.get('gateway'))
+
+        return {
+            "openapi": openapi_spec,
+            **python_code,
+            "tests": tests,
+            "performance_tests": perf_tests,
+            "gateway": gateway_config,
+            "requirements": REQUIREMENTS + (PRODUCTION_REQUIREMENTS if production else ""),
+            "readme": README.format(run=RUN_PRODUCTION if production else RUN_DEVELOPMENT),
+        }
+
+    def write(self, analysis: Dict, output_dir: Path, options: Optional[Dict] = None) -> Dict[str, str]:
+        """
+        Generate the project into `output_dir`; returns the PROJECT_FILES
+        entries written. Files of another runtime profile left over from an
+        earlier generation into the same directory are removed.
+        """
+        contents = self.generate(analysis, options)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        files = {}
+        for key, filename in PROJECT_FILES.items():
+            if key in contents:
+                (output_dir / filename).write_text(contents[key])
+                files[key] = filename
+            else:
+                (output_dir / filename).unlink(missing_ok=True)
+        return files
@@ -0,0 +1,33 @@
+"""
+Python Source Helpers
+Escaping for analysis values (names, paths, files) embedded in generated code
+
+The analysis comes from the client, so every value written into a
+generated module goes through one of these: an identifier, a string
+literal, or text for a docstring or comment.
+"""
+
+import json
+import re
+
+HTTP_METHODS = {"get", "post", "put", "patch", "delete", "head", "options"}
+
+NON_IDENTIFIER = re.compile(r"\W", re.ASCII)
+
+
+def identifier(name: str) -> str:
+    """`name` with every character not allowed in an identifier replaced by `_`"""
+    name = NON_IDENTIFIER.sub("_", str(name))
+    if not name or name[0].isdigit():
+        name = f"_{name}"
+    return name
+
+
+def literal(value: str) -> str:
+    """Python string literal for `value`"""
+    return repr(str(value))
+
+
+def text(value: str) -> str:
+    """`value` on one line, safe inside a docstring or a comment"""
+    return json.dumps(str(value))[1:-1]
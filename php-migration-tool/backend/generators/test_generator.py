@@ -3,7 +3,17 @@ Test Generator
 Generates pytest tests for migrated API
 """
 
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+import pprint
+
+from analyzers.route_trie import RouteTrie, normalize_template, sample_path
+from generators.python_source import HTTP_METHODS, identifier, literal, text
+
+# Latency budget applied to routes missing from the SLO map (milliseconds)
+DEFAULT_SLO = {"p50_ms": 25.0, "p95_ms": 50.0, "p99_ms": 100.0}
+
+# Minimum requests/second for the throughput smoke test
+DEFAULT_MIN_THROUGHPUT = 100.0
 
 class TestGenerator:
     """Generates pytest tests"""
@@ -31,18 +41,20 @@ def test_root():
 '''
         
         # Generate tests for each route
-        for route in analysis.get('routes', []):
+        for route in RouteTrie.from_routes(analysis.get('routes', [])).routes:
             method = route['method'].lower()
-            path = route['path']
+            if method not in HTTP_METHODS:
+                continue
+            path = route['template']
             
             # Convert path params for testing
-            test_path = self._convert_path_for_test(path)
+            test_path = sample_path(path)
             func_name = self._path_to_test_name(path, method)
             
             code += f'''
 def test_{func_name}():
-    """Test {method.upper()} {path}"""
-    response = client.{method}("{test_path}")
+    """Test {method.upper()} {text(path)}"""
+    response = client.{method}({literal(test_path)})
     assert response.status_code in [200, 404]  # Allow 404 for unimplemented
     if response.status_code == 200:
         assert response.json() is not None
@@ -51,14 +63,198 @@ def test_{func_name}():
         
         return code
     
-    def _convert_path_for_test(self, path: str) -> str:
-        """Convert path with params to test path"""
-        import re
-        
-        # Replace :param or {param} with test value
-        path = re.sub(r'[:{](\w+)[}]?', '1', path)
-        
-        return path
+    def generate_performance(self, analysis: Dict, openapi_spec: str, options: Optional[Dict] = None) -> str:
+        """
+        Generate test_performance.py: per-route latency budgets, a throughput
+        smoke test and a pytest-benchmark style JSON report.
+
+        Options:
+            slo: {"GET /users/{id}": {"p95_ms": 20}, "default": {...}}; each
+                route's budget is the default overlaid with its own entry
+            min_throughput_rps: floor for the throughput smoke test
+            perf_methods: methods to benchmark (default GET only, since other
+                methods would need request bodies)
+        """
+        options = options or {}
+        slo = self._normalize_slo(options.get('slo') or {})
+        default_budget = {**DEFAULT_SLO, **slo.get('default', {})}
+        methods = [method.upper() for method in options.get('perf_methods', ['GET'])]
+        min_throughput = float(options.get('min_throughput_rps', DEFAULT_MIN_THROUGHPUT))
+
+        routes = self._perf_routes(analysis, methods)
+        budgets = {label: {**default_budget, **slo.get(label, {})} for label, _, _ in routes}
+
+        code = f'''"""
+API Performance Tests
+Generated latency budgets and throughput smoke test for migrated API
+
+Budgets come from the per-route SLO map given at generation time. Results
+are written in pytest-benchmark JSON format to PERF_RESULTS
+(default: benchmark.json) so runs can be compared over time.
+
+Run: pytest test_performance.py
+"""
+
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+client = TestClient(app)
+
+ITERATIONS = int(os.getenv("PERF_ITERATIONS", "200"))
+WARMUP = int(os.getenv("PERF_WARMUP", "20"))
+THROUGHPUT_SECONDS = float(os.getenv("PERF_THROUGHPUT_SECONDS", "2"))
+MIN_THROUGHPUT_RPS = float(os.getenv("PERF_MIN_THROUGHPUT_RPS", "{min_throughput}"))
+RESULTS_PATH = os.getenv("PERF_RESULTS", "benchmark.json")
+
+# (label, method, request path)
+ROUTES = {pprint.pformat(routes)}
+
+# Latency budgets in milliseconds, keyed by route label
+BUDGETS = {pprint.pformat(budgets)}
+
+BENCHMARKS = []
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of already sorted samples"""
+    index = max(0, math.ceil(fraction * len(sorted_samples)) - 1)
+    return sorted_samples[index]
+
+
+def measure(method, path):
+    """Latencies in seconds of ITERATIONS sequential requests, after warmup"""
+    for _ in range(WARMUP):
+        client.request(method, path)
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        response = client.request(method, path)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code < 500
+    return samples
+
+
+def record_benchmark(name, samples, extra_info):
+    ordered = sorted(samples)
+    q1, q3 = percentile(ordered, 0.25), percentile(ordered, 0.75)
+    BENCHMARKS.append({{
+        "name": name,
+        "fullname": f"test_performance.py::{{name}}",
+        "stats": {{
+            "min": ordered[0],
+            "max": ordered[-1],
+            "mean": statistics.fmean(ordered),
+            "stddev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+            "median": statistics.median(ordered),
+            "q1": q1,
+            "q3": q3,
+            "iqr": q3 - q1,
+            "rounds": len(ordered),
+            "iterations": 1,
+            "total": sum(ordered),
+            "ops": len(ordered) / sum(ordered) if sum(ordered) else 0.0,
+        }},
+        "extra_info": extra_info,
+    }})
+
+
+@pytest.fixture(scope="session", autouse=True)
+def benchmark_report():
+    """Write collected results once all performance tests have run"""
+    yield
+    if not BENCHMARKS:
+        return
+    report = {{
+        "machine_info": {{
+            "node": platform.node(),
+            "machine": platform.machine(),
+            "python_implementation": platform.python_implementation(),
+            "python_version": platform.python_version(),
+            "system": platform.system(),
+        }},
+        "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "version": "generated",
+        "benchmarks": BENCHMARKS,
+    }}
+    with open(RESULTS_PATH, "w") as results:
+        json.dump(report, results, indent=2)
+
+
+@pytest.mark.parametrize("label,method,path", ROUTES, ids=[route[0] for route in ROUTES])
+def test_latency_budget(label, method, path):
+    """p50/p95/p99 latency stays within the route's SLO budget"""
+    ordered = sorted(measure(method, path))
+    observed = {{
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+    }}
+    budget = BUDGETS[label]
+    record_benchmark(f"test_latency_budget[{{label}}]", ordered, {{"observed": observed, "budget": budget}})
+
+    over = {{
+        name: (round(observed[name], 3), limit)
+        for name, limit in budget.items()
+        if name in observed and observed[name] > limit
+    }}
+    assert not over, f"{{label}} over budget (observed ms, budget ms): {{over}}"
+
+
+def test_throughput_smoke():
+    """Round-robin over all routes sustains the minimum request rate"""
+    targets = [(method, path) for _, method, path in ROUTES]
+    samples = []
+    deadline = time.perf_counter() + THROUGHPUT_SECONDS
+    index = 0
+    started = time.perf_counter()
+    while time.perf_counter() < deadline:
+        method, path = targets[index % len(targets)]
+        start = time.perf_counter()
+        client.request(method, path)
+        samples.append(time.perf_counter() - start)
+        index += 1
+    elapsed = time.perf_counter() - started
+    requests_per_sec = len(samples) / elapsed
+    record_benchmark("test_throughput_smoke", samples, {{"requests_per_sec": requests_per_sec}})
+
+    assert requests_per_sec >= MIN_THROUGHPUT_RPS, (
+        f"{{requests_per_sec:.1f}} req/s below the {{MIN_THROUGHPUT_RPS}} req/s floor"
+    )
+'''
+
+        return code
+
+    def _perf_routes(self, analysis: Dict, methods: List[str]) -> List[Tuple[str, str, str]]:
+        """Unique (label, method, request path) entries, health check first"""
+        routes = [("GET /", "GET", "/")]
+        seen = {"GET /"}
+        for route in RouteTrie.from_routes(analysis.get('routes', [])).routes:
+            method = route['method']
+            label = f"{method} {route['template']}"
+            if method not in methods or label in seen:
+                continue
+            seen.add(label)
+            routes.append((label, method, sample_path(route['template'])))
+        return routes
+
+    def _normalize_slo(self, slo: Dict) -> Dict:
+        """SLO map keyed by "METHOD template", so `:id` and `{id}` keys both apply"""
+        normalized = {}
+        for key, budget in slo.items():
+            method, _, path = key.partition(' ')
+            if path:
+                key = f"{method.upper()} {normalize_template(path)[0]}"
+            normalized[key] = budget
+        return normalized
     
     def _path_to_test_name(self, path: str, method: str) -> str:
         """Convert path to test function name"""
@@ -69,4 +265,4 @@ def test_{func_name}():
         if not name:
             name = f"{method}_root"
         
-        return name.lower()
+        return identifier(name.lower())
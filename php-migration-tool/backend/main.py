@@ -2,17 +2,19 @@
 PHP to Python Migration Tool - Backend API
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, Response
+from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
+import asyncio
 import zipfile
+import io
 import tempfile
 import os
 import shutil
 from pathlib import Path
-import requests
+import json
 import subprocess
 
 # Set git environment before importing
@@ -27,9 +29,12 @@ except Exception as e:
     GIT_AVAILABLE = False
 
 from analyzers.php_analyzer import PHPAnalyzer
-from generators.openapi_generator import OpenAPIGenerator
-from generators.fastapi_generator import FastAPIGenerator
-from generators.test_generator import TestGenerator
+from analyzers.spill_store import SpillStore, VIEWS
+from generators.project_writer import ProjectWriter
+from generators.code_validator import CodeValidator
+from services.health_prober import HealthProber, HealthWatch
+from services.artifact_lifecycle import ArtifactLifecycle, UPLOAD, OUTPUT, ARCHIVE, MB
+from services.preview import PreviewCache, parse_byte_range
 
 app = FastAPI(
     title="PHP Migration Tool API",
@@ -49,9 +54,14 @@ app.add_middleware(
 # Models
 class AnalysisResult(BaseModel):
     routes: List[Dict]
+    route_conflicts: List[Dict] = []
     models: List[Dict]
     dependencies: List[str]
+    dependency_files: Dict[str, str] = {}
     file_count: int
+    reachability: Optional[Dict] = None
+    profile: Optional[Dict] = None
+    store: Optional[Dict] = None
     summary: str
 
 class GenerateRequest(BaseModel):
@@ -66,12 +76,43 @@ class PreviewRequest(BaseModel):
     port: int
     project_id: str
 
+class PortsCheckRequest(BaseModel):
+    ports: List[int] = Field(..., min_length=1, max_length=64)
+
+# Shared pooled prober for preview server checks
+health_prober = HealthProber()
+health_watch = HealthWatch(health_prober)
+
 # Storage for temporary files
 UPLOAD_DIR = Path("uploads")
 OUTPUT_DIR = Path("outputs")
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Uploads and outputs are deleted after a TTL or when over the disk quota
+artifacts = ArtifactLifecycle(
+    UPLOAD_DIR,
+    OUTPUT_DIR,
+    ttl_seconds=float(os.getenv("ARTIFACT_TTL_HOURS", "24")) * 3600,
+    quota_bytes=int(float(os.getenv("ARTIFACT_QUOTA_MB", "5120")) * MB),
+    min_free_bytes=int(float(os.getenv("ARTIFACT_MIN_FREE_MB", "512")) * MB),
+    sweep_interval=float(os.getenv("ARTIFACT_SWEEP_SECONDS", "300")),
+)
+
+# Recently previewed file pages
+preview_cache = PreviewCache()
+
+def analysis_store_path(upload_id: str) -> Path:
+    """SQLite store of a memory-bounded analysis"""
+    return UPLOAD_DIR / upload_id / "analysis.db"
+
+def storage_full(detail: str) -> HTTPException:
+    return HTTPException(status_code=507, detail=f"{detail}. Try again later or free up space.")
+
+@app.on_event("startup")
+async def start_artifact_sweeper():
+    artifacts.start()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -92,6 +133,9 @@ async def clone_github_repo(request: GitHubRepoRequest):
             detail="Git is not available. Please rebuild the backend container with: docker-compose build --no-cache backend"
         )
     
+    if not await asyncio.to_thread(artifacts.admit, 0):
+        raise storage_full("Not enough storage to clone a repository")
+    
     temp_dir = None
     try:
         # Create temporary directory
@@ -142,6 +186,7 @@ async def clone_github_repo(request: GitHubRepoRequest):
             raise HTTPException(status_code=400, detail="No PHP files found in repository")
         
         print(f"Successfully cloned repository. Found {len(php_files)} PHP files")
+        artifacts.register(UPLOAD, Path(temp_dir).name)
         
         return {
             "upload_id": Path(temp_dir).name,
@@ -170,13 +215,23 @@ async def upload_php_project(file: UploadFile = File(...)):
     if not file.filename.endswith('.zip'):
         raise HTTPException(status_code=400, detail="Only ZIP files are supported")
     
+    content = await file.read()
+    
+    # Admit the archive plus its extracted size before anything touches disk
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as zip_ref:
+            extracted_size = sum(info.file_size for info in zip_ref.infolist())
+    except zipfile.BadZipFile as e:
+        raise HTTPException(status_code=400, detail=f"Failed to extract ZIP: {str(e)}")
+    if not await asyncio.to_thread(artifacts.admit, len(content) + extracted_size):
+        raise storage_full("Not enough storage for this upload")
+    
     # Create temporary directory for this upload
     temp_dir = tempfile.mkdtemp(dir=UPLOAD_DIR)
     zip_path = Path(temp_dir) / file.filename
     
     # Save uploaded file
     with open(zip_path, "wb") as buffer:
-        content = await file.read()
         buffer.write(content)
     
     # Extract zip
@@ -190,6 +245,8 @@ async def upload_php_project(file: UploadFile = File(...)):
         shutil.rmtree(temp_dir)
         raise HTTPException(status_code=400, detail=f"Failed to extract ZIP: {str(e)}")
     
+    artifacts.register(UPLOAD, Path(temp_dir).name)
+    
     return {
         "upload_id": Path(temp_dir).name,
         "filename": file.filename,
@@ -198,108 +255,113 @@ async def upload_php_project(file: UploadFile = File(...)):
     }
 
 @app.post("/api/analyze/{upload_id}", response_model=AnalysisResult)
-async def analyze_php_project(upload_id: str):
+async def analyze_php_project(upload_id: str, reachable_only: bool = False, profile: bool = False,
+                              memory_bounded: bool = False):
     """
     Analyze uploaded PHP project
+    
+    With `reachable_only=true`, only classes reachable from the routes'
+    handlers are parsed and returned as models. With `profile=true`, the
+    result includes phase timings, the slowest files, throughput and peak
+    memory.
+    
+    With `memory_bounded=true`, results are written to an on-disk store as
+    each file is analyzed. The response then carries only the summary and
+    `store` counts; page through the results with
+    `GET /api/analysis/{upload_id}/{view}`, and generate with
+    `{"analysis": {"store": ...}}`.
     """
     upload_path = UPLOAD_DIR / upload_id / "extracted"
     
     if not upload_path.exists():
         raise HTTPException(status_code=404, detail="Upload not found")
     
+    artifacts.touch(UPLOAD, upload_id)
+    
     try:
         analyzer = PHPAnalyzer()
-        analysis = analyzer.analyze_directory(upload_path)
+        analysis = analyzer.analyze_directory(
+            upload_path,
+            index_path=UPLOAD_DIR / upload_id / "symbols.json",
+            reachable_only=reachable_only,
+            profile=profile,
+            spill_path=analysis_store_path(upload_id) if memory_bounded else None
+        )
+        # Count the symbol index and spill store written next to the upload
+        artifacts.register(UPLOAD, upload_id)
         
         return AnalysisResult(
             routes=analysis['routes'],
+            route_conflicts=analysis['route_conflicts'],
             models=analysis['models'],
             dependencies=analysis['dependencies'],
+            dependency_files=analysis['dependency_files'],
             file_count=analysis['file_count'],
+            reachability=analysis['reachability'],
+            profile=analysis['profile'],
+            store=analysis['store'],
             summary=analysis['summary']
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+@app.get("/api/analysis/{upload_id}/{view}")
+async def analysis_view(upload_id: str, view: str, offset: int = Query(0, ge=0),
+                        limit: int = Query(100, ge=1, le=1000)):
+    """
+    Page through a memory-bounded analysis: routes, models, dependencies
+    or route_conflicts
+    """
+    if view not in VIEWS:
+        raise HTTPException(status_code=404, detail=f"Unknown view; expected one of {', '.join(VIEWS)}")
+    try:
+        store = SpillStore.open(analysis_store_path(upload_id))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="No memory-bounded analysis for this upload")
+    artifacts.touch(UPLOAD, upload_id)
+    try:
+        return store.page(view, offset, limit)
+    finally:
+        store.close()
+
 @app.post("/api/generate/{upload_id}")
 async def generate_python_code(upload_id: str, request: GenerateRequest):
     """
     Generate Python/FastAPI code from analysis
+    
+    An analysis with a `store` key (from `memory_bounded=true`) is loaded
+    from the upload's on-disk store.
+    
+    The generated project is then validated with `ast` and the report
+    returned under `validation`; skip it with the `validate: false` option.
+    The analysis comes from the client, so the generated app is never
+    imported here (the CLI's `--import-check` does that for local projects).
     """
+    if request.analysis.get('store'):
+        try:
+            store = SpillStore.open(analysis_store_path(upload_id))
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="No memory-bounded analysis for this upload")
+        try:
+            request.analysis = {**request.analysis, **store.to_analysis()}
+        finally:
+            store.close()
+    
     try:
-        # Generate OpenAPI spec
-        openapi_gen = OpenAPIGenerator()
-        openapi_spec = openapi_gen.generate(request.analysis)
-        
-        # Generate FastAPI code
-        fastapi_gen = FastAPIGenerator()
-        python_code = fastapi_gen.generate(request.analysis, openapi_spec)
-        
-        # Generate tests
-        test_gen = TestGenerator()
-        tests = test_gen.generate(request.analysis, openapi_spec)
+        options = request.options or {}
+        files = ProjectWriter().write(request.analysis, OUTPUT_DIR / upload_id, options)
+        artifacts.register(OUTPUT, upload_id)
+        artifacts.touch(UPLOAD, upload_id)
         
-        # Create output directory
-        output_dir = OUTPUT_DIR / upload_id
-        output_dir.mkdir(exist_ok=True)
-        
-        # Save generated files
-        (output_dir / "openapi.yaml").write_text(openapi_spec)
-        (output_dir / "main.py").write_text(python_code['main'])
-        (output_dir / "models.py").write_text(python_code['models'])
-        (output_dir / "routes.py").write_text(python_code['routes'])
-        (output_dir / "test_api.py").write_text(tests)
-        
-        # Create requirements.txt
-        requirements = """fastapi==0.104.1
-uvicorn[standard]==0.24.0
-pydantic==2.5.0
-pytest==7.4.3
-hypothesis==6.92.1
-"""
-        (output_dir / "requirements.txt").write_text(requirements)
-        
-        # Create README
-        readme = f"""# Migrated Python API
-
-Generated from PHP project using PHP Migration Tool.
-
-## Setup
-
-```bash
-pip install -r requirements.txt
-```
-
-## Run
-
-```bash
-uvicorn main:app --reload
-```
-
-## Test
-
-```bash
-pytest test_api.py
-```
-
-## API Documentation
-
-Visit http://localhost:8000/docs for interactive API documentation.
-"""
-        (output_dir / "README.md").write_text(readme)
+        validation = None
+        if options.get('validate', True):
+            validation = await asyncio.to_thread(CodeValidator().validate, OUTPUT_DIR / upload_id)
         
         return {
             "status": "success",
             "output_id": upload_id,
-            "files": {
-                "openapi": "openapi.yaml",
-                "main": "main.py",
-                "models": "models.py",
-                "routes": "routes.py",
-                "tests": "test_api.py",
-                "requirements": "requirements.txt",
-                "readme": "README.md"
-            }
+            "files": files,
+            "validation": validation
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
@@ -323,6 +385,9 @@ async def download_generated_code(output_id: str):
                 arcname = file_path.relative_to(output_dir)
                 zipf.write(file_path, arcname)
     
+    artifacts.touch(OUTPUT, output_id)
+    artifacts.register(ARCHIVE, output_id)
+    
     return FileResponse(
         zip_path,
         media_type="application/zip",
@@ -330,40 +395,139 @@ async def download_generated_code(output_id: str):
     )
 
 @app.get("/api/preview/{output_id}/{filename}")
-async def preview_file(output_id: str, filename: str):
+async def preview_file(
+    output_id: str,
+    filename: str,
+    request: Request,
+    start_line: int = Query(1, ge=1),
+    lines: Optional[int] = Query(None, ge=1),
+    byte_start: Optional[int] = Query(None, ge=0),
+    byte_end: Optional[int] = Query(None, ge=0),
+    raw: bool = False,
+):
     """
     Preview a generated file
+
+    Returns the whole file by default. Pass `start_line`/`lines` to page
+    through it, or `byte_start`/`byte_end` for a byte range. With `raw=true`
+    the text is returned as-is instead of JSON, and a `Range` header is
+    honored. Responses carry an ETag; a matching If-None-Match gets a 304.
+    A `start_line` after the last line or a `byte_start` after the end of
+    the file gets a 416.
     """
-    file_path = OUTPUT_DIR / output_id / filename
+    output_dir = (OUTPUT_DIR / output_id).resolve()
+    file_path = (output_dir / filename).resolve()
     
-    if not file_path.exists():
+    if file_path.parent != output_dir or not file_path.is_file():
         raise HTTPException(status_code=404, detail="File not found")
     
-    content = file_path.read_text()
+    artifacts.touch(OUTPUT, output_id)
+    index = preview_cache.index(file_path)
+    headers = {"ETag": index.etag, "Cache-Control": "no-cache"}
     
-    return {
+    if request.headers.get("if-none-match") == index.etag:
+        return Response(status_code=304, headers=headers)
+    
+    by_bytes = byte_start is not None or byte_end is not None
+    range_header = request.headers.get("range") if raw and not by_bytes and lines is None else None
+    
+    if raw and not by_bytes and lines is None and range_header is None:
+        # Whole file: let the server send it straight from disk
+        return FileResponse(file_path, media_type="text/plain; charset=utf-8", headers=headers)
+    
+    if range_header:
+        try:
+            start, end = parse_byte_range(range_header, index.size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{index.size}"})
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{index.size}"
+        return Response(preview_cache.read(index, start, end), status_code=206,
+                        media_type="text/plain; charset=utf-8", headers=headers)
+    
+    past_end = (byte_start or 0) > index.size if by_bytes else start_line > max(index.total_lines, 1)
+    if past_end:
+        raise HTTPException(
+            status_code=416,
+            detail=f"Requested range starts past the end of the file ({index.total_lines} lines, {index.size} bytes)",
+            headers={**headers, "Content-Range": f"bytes */{index.size}"},
+        )
+    
+    if by_bytes:
+        start = byte_start or 0
+        end = min(byte_end if byte_end is not None else index.size, index.size)
+        page = {"byte_start": start, "byte_end": max(start, end),
+                "next_byte_start": end if end < index.size else None}
+    else:
+        start, end, end_line = index.line_range(start_line, lines)
+        page = {"start_line": start_line, "end_line": end_line, "total_lines": index.total_lines,
+                "next_start_line": end_line + 1 if end_line < index.total_lines else None}
+    
+    data = preview_cache.read(index, start, end)
+    
+    if raw:
+        headers.update({f"X-{key.replace('_', '-').title()}": str(value) for key, value in page.items() if value is not None})
+        return Response(data, media_type="text/plain; charset=utf-8", headers=headers)
+    
+    return JSONResponse({
         "filename": filename,
-        "content": content
-    }
+        "content": data.decode("utf-8", errors="replace"),
+        "size": index.size,
+        "etag": index.etag,
+        **page
+    }, headers=headers)
 
 @app.post("/api/check-php-server")
 async def check_php_server(request: PreviewRequest):
     """
     Check if PHP server is accessible at given port
     """
+    return await health_prober.probe(request.port)
+
+@app.post("/api/check-php-servers")
+async def check_php_servers(request: PortsCheckRequest):
+    """
+    Check several ports concurrently
+    """
+    return {"results": await health_prober.probe_many(dict.fromkeys(request.ports))}
+
+@app.get("/api/watch-php-servers")
+async def watch_php_servers(ports: str):
+    """
+    Stream server status as Server-Sent Events: the current status of each
+    port first, then an event whenever one changes
+    """
     try:
-        response = requests.get(f"http://localhost:{request.port}", timeout=2)
-        return {
-            "accessible": True,
-            "status_code": response.status_code,
-            "port": request.port
-        }
-    except Exception as e:
-        return {
-            "accessible": False,
-            "error": str(e),
-            "port": request.port
-        }
+        port_list = list(dict.fromkeys(int(port) for port in ports.split(",") if port))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ports must be a comma-separated list of integers")
+    if not 1 <= len(port_list) <= 64:
+        raise HTTPException(status_code=400, detail="Watch between 1 and 64 ports")
+
+    async def events():
+        async for result in health_watch.stream(port_list):
+            yield f"data: {json.dumps(result)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/storage")
+async def storage_stats():
+    """
+    Disk used by uploads and outputs against the configured quota
+    """
+    return {**artifacts.stats(), "preview_cache": preview_cache.stats()}
+
+@app.on_event("shutdown")
+async def close_health_prober():
+    await health_watch.close()
+    await health_prober.close()
+
+@app.on_event("shutdown")
+async def stop_artifact_sweeper():
+    await artifacts.stop()
 
 if __name__ == "__main__":
     import uvicorn
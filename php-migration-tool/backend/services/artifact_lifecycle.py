@@ -0,0 +1,245 @@
+"""
+Artifact Lifecycle
+Tracks uploads and generated outputs on disk and garbage-collects them
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+UPLOAD = "upload"
+OUTPUT = "output"
+ARCHIVE = "archive"
+
+MB = 1024 * 1024
+
+
+def path_size(path: Path) -> int:
+    """Bytes used by a file or directory tree"""
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class ArtifactLifecycle:
+    """
+    Index of every upload, output directory and download archive, with its
+    size and last access time.
+
+    Entries are kept in least-recently-used order. The sweeper deletes
+    artifacts idle for longer than `ttl_seconds`, then evicts the least
+    recently used ones until the total is under `quota_bytes`. New uploads
+    go through admit(), which makes room the same way or refuses them when
+    the quota or the disk's free-space reserve cannot be met.
+
+    The index is a small JSON file written on each sweep and at shutdown.
+    On startup it is reconciled with what is actually on disk.
+    """
+
+    def __init__(self, upload_dir: Path, output_dir: Path, index_path: Optional[Path] = None,
+                 ttl_seconds: float = 24 * 3600, quota_bytes: int = 5 * 1024 * MB,
+                 min_free_bytes: int = 512 * MB, sweep_interval: float = 300):
+        self.upload_dir = Path(upload_dir)
+        self.output_dir = Path(output_dir)
+        self.index_path = Path(index_path) if index_path else self.upload_dir / ".artifact_index.json"
+        self.ttl_seconds = ttl_seconds
+        self.quota_bytes = quota_bytes
+        self.min_free_bytes = min_free_bytes
+        self.sweep_interval = sweep_interval
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # -- index -------------------------------------------------------------
+
+    @staticmethod
+    def key(kind: str, artifact_id: str) -> str:
+        return f"{kind}:{artifact_id}"
+
+    def path_for(self, kind: str, artifact_id: str) -> Path:
+        if kind == UPLOAD:
+            return self.upload_dir / artifact_id
+        if kind == OUTPUT:
+            return self.output_dir / artifact_id
+        return self.output_dir / f"{artifact_id}.zip"
+
+    def register(self, kind: str, artifact_id: str):
+        """Record (or re-measure) an artifact after it is written"""
+        path = self.path_for(kind, artifact_id)
+        size = path_size(path) if path.exists() else 0
+        now = time.time()
+        with self._lock:
+            key = self.key(kind, artifact_id)
+            previous = self.entries.pop(key, None)
+            if previous:
+                self.total_bytes -= previous["size"]
+            self.entries[key] = {
+                "kind": kind,
+                "id": artifact_id,
+                "size": size,
+                "created": previous["created"] if previous else now,
+                "last_access": now,
+            }
+            self.total_bytes += size
+
+    def touch(self, kind: str, artifact_id: str):
+        """Mark an artifact as used so it is the last to be evicted"""
+        with self._lock:
+            entry = self.entries.get(self.key(kind, artifact_id))
+            if entry:
+                entry["last_access"] = time.time()
+                self.entries.move_to_end(self.key(kind, artifact_id))
+
+    def load(self):
+        """Read the saved index and reconcile it with the directories"""
+        saved = {}
+        if self.index_path.exists():
+            try:
+                saved = json.loads(self.index_path.read_text())
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable artifact index: {e}")
+
+        found = []
+        for path in self.upload_dir.iterdir() if self.upload_dir.exists() else []:
+            if path.is_dir():
+                found.append((UPLOAD, path.name, path))
+        for path in self.output_dir.iterdir() if self.output_dir.exists() else []:
+            if path.is_dir():
+                found.append((OUTPUT, path.name, path))
+            elif path.suffix == ".zip":
+                found.append((ARCHIVE, path.stem, path))
+
+        entries = []
+        for kind, artifact_id, path in found:
+            entry = saved.get(self.key(kind, artifact_id))
+            if entry is None:
+                mtime = path.stat().st_mtime
+                entry = {"kind": kind, "id": artifact_id, "created": mtime, "last_access": mtime}
+            entry["size"] = path_size(path)
+            entries.append(entry)
+
+        with self._lock:
+            self.entries = OrderedDict(
+                (self.key(entry["kind"], entry["id"]), entry)
+                for entry in sorted(entries, key=lambda entry: entry["last_access"])
+            )
+            self.total_bytes = sum(entry["size"] for entry in entries)
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self.entries)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(data)
+        tmp_path.replace(self.index_path)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for entry in self.entries.values():
+                counts[entry["kind"]] = counts.get(entry["kind"], 0) + 1
+            return {
+                "total_bytes": self.total_bytes,
+                "quota_bytes": self.quota_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "artifacts": counts,
+                "free_bytes": shutil.disk_usage(self.upload_dir).free,
+            }
+
+    # -- admission and eviction --------------------------------------------
+
+    def admit(self, expected_bytes: int) -> bool:
+        """
+        Make room for a new artifact of `expected_bytes`.
+
+        Evicts least recently used artifacts if needed. Returns False when
+        the artifact cannot fit within the quota and the free-space reserve.
+        Nothing is evicted when evicting every tracked artifact would still
+        not make enough room. Deletes trees, so call it off the event loop.
+        """
+        with self._lock:
+            total_bytes = self.total_bytes
+        free = shutil.disk_usage(self.upload_dir).free
+        shortfall = max(total_bytes + expected_bytes - self.quota_bytes,
+                        self.min_free_bytes + expected_bytes - free)
+        if expected_bytes > self.quota_bytes or shortfall > total_bytes:
+            return False
+        self._evict_until(lambda: self._fits(expected_bytes))
+        return self._fits(expected_bytes)
+
+    def _fits(self, expected_bytes: int) -> bool:
+        free = shutil.disk_usage(self.upload_dir).free
+        return (self.total_bytes + expected_bytes <= self.quota_bytes
+                and free - expected_bytes >= self.min_free_bytes)
+
+    def sweep(self) -> List[str]:
+        """Delete expired artifacts, then enforce the quota; returns evicted keys"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [key for key, entry in self.entries.items() if entry["last_access"] < cutoff]
+        evicted = [key for key in expired if self._evict(key)]
+        evicted += self._evict_until(lambda: self.total_bytes <= self.quota_bytes)
+        self.save()
+        return evicted
+
+    def _evict_until(self, satisfied) -> List[str]:
+        evicted = []
+        while not satisfied():
+            with self._lock:
+                if not self.entries:
+                    break
+                key = next(iter(self.entries))
+            if self._evict(key):
+                evicted.append(key)
+        return evicted
+
+    def _evict(self, key: str) -> bool:
+        with self._lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return False
+            self.total_bytes -= entry["size"]
+        path = self.path_for(entry["kind"], entry["id"])
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        elif path.exists():
+            path.unlink()
+        print(f"Evicted {key} ({entry['size']} bytes)")
+        return True
+
+    # -- background sweeper ------------------------------------------------
+
+    def start(self):
+        """Load the index and start the periodic sweeper on the running loop"""
+        self.load()
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self.save()
+
+    async def _run(self):
+        while True:
+            try:
+                # Deleting trees blocks, so keep it off the event loop
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"Artifact sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
@@ -0,0 +1,156 @@
+"""
+Health Prober
+Async, pooled reachability checks for local PHP preview servers
+"""
+
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+PREVIEW_HOST = os.getenv("PHP_PREVIEW_HOST", "localhost")
+
+
+class HealthProber:
+    """
+    Probes ports over one shared, pooled httpx client.
+
+    Results are cached for `ttl` seconds, and concurrent probes of the same
+    port share a single request, so a frontend polling constantly costs at
+    most one request per port per TTL.
+    """
+
+    def __init__(self, host: str = PREVIEW_HOST, timeout: float = 2.0, ttl: float = 2.0,
+                 max_connections: int = 50):
+        self.host = host
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: Dict[int, Tuple[float, Dict]] = {}
+        self._in_flight: Dict[int, asyncio.Task] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def probe(self, port: int, use_cache: bool = True) -> Dict:
+        """Check one port; fresh cached results are returned without a request"""
+        if use_cache:
+            cached = self._cache.get(port)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                return {**cached[1], "cached": True}
+
+        task = self._in_flight.get(port)
+        if task is None:
+            task = asyncio.ensure_future(self._probe_uncached(port))
+            self._in_flight[port] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(port, None))
+        return {**await asyncio.shield(task), "cached": False}
+
+    async def probe_many(self, ports: Iterable[int], use_cache: bool = True) -> List[Dict]:
+        """Check several ports concurrently, in the order given"""
+        return list(await asyncio.gather(*(self.probe(port, use_cache) for port in ports)))
+
+    async def _probe_uncached(self, port: int) -> Dict:
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().get(f"http://{self.host}:{port}")
+            result = {
+                "accessible": True,
+                "status_code": response.status_code,
+                "port": port,
+            }
+        except httpx.HTTPError as e:
+            result = {
+                "accessible": False,
+                "error": str(e) or type(e).__name__,
+                "port": port,
+            }
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        result["checked_at"] = time.time()
+        self._cache[port] = (time.monotonic(), result)
+        return result
+
+
+class HealthWatch:
+    """
+    Background watcher pushing status changes to subscribers.
+
+    One task probes the union of all subscribed ports every `interval`
+    seconds and runs only while someone is subscribed. Each subscriber
+    receives the current status of its ports first, then an update whenever
+    a port's reachability or status code changes.
+    """
+
+    def __init__(self, prober: HealthProber, interval: float = 2.0):
+        self.prober = prober
+        self.interval = interval
+        self._subscribers: Dict[asyncio.Queue, Set[int]] = {}
+        self._last: Dict[int, Tuple] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, ports: Iterable[int]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self._subscribers[queue] = set(ports)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.pop(queue, None)
+
+    async def stream(self, ports: Iterable[int]) -> AsyncIterator[Dict]:
+        """Current status of each port, then changes as they happen"""
+        ports = list(ports)
+        queue = self.subscribe(ports)
+        try:
+            for result in await self.prober.probe_many(ports):
+                yield result
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(queue)
+
+    async def close(self):
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while self._subscribers:
+            ports = set().union(*self._subscribers.values())
+            for result in await self.prober.probe_many(sorted(ports), use_cache=False):
+                state = (result["accessible"], result.get("status_code"))
+                previous = self._last.get(result["port"])
+                self._last[result["port"]] = state
+                # Subscribers already got the first status from stream()
+                if previous is not None and previous != state:
+                    self._publish(result)
+            await asyncio.sleep(self.interval)
+        self._last.clear()
+
+    def _publish(self, result: Dict):
+        for queue, ports in list(self._subscribers.items()):
+            if result["port"] not in ports:
+                continue
+            if queue.full():
+                # Slow consumer: drop its oldest update rather than block the watcher
+                queue.get_nowait()
+            queue.put_nowait(result)
@@ -0,0 +1,154 @@
+"""
+File Preview
+Ranged reads of generated files through mmap with a small LRU of hot pages
+"""
+
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+MB = 1024 * 1024
+
+
+class FileIndex:
+    """
+    One version of a file (identified by size and mtime) and the byte offset
+    where each of its lines starts.
+
+    Every read maps the file, slices the requested range and unmaps it again,
+    so only that range is copied. The mapping is never kept open: a file
+    rewritten while mapped would fault on access past its new end.
+    """
+
+    def __init__(self, path: Path, stat: os.stat_result):
+        self.path = path
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.etag = f'"{self.mtime_ns:x}-{self.size:x}"'
+        self._line_starts: Optional[array] = None
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    @property
+    def line_starts(self) -> array:
+        """Offsets of each line, found with one scan for newlines"""
+        if self._line_starts is None:
+            starts = array("Q")
+            if self.size:
+                starts.append(0)
+                with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = mm.find(b"\n")
+                    while pos != -1 and pos + 1 < self.size:
+                        starts.append(pos + 1)
+                        pos = mm.find(b"\n", pos + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    @property
+    def total_lines(self) -> int:
+        return len(self.line_starts)
+
+    def line_range(self, start_line: int, count: Optional[int]) -> Tuple[int, int, int]:
+        """
+        Byte range covering `count` lines from 1-based `start_line`
+        (to the end of the file when count is None).
+
+        Returns (byte_start, byte_end, end_line).
+        """
+        starts = self.line_starts
+        first = min(start_line - 1, len(starts))
+        last = len(starts) if count is None else min(first + count, len(starts))
+        byte_start = starts[first] if first < len(starts) else self.size
+        byte_end = starts[last] if last < len(starts) else self.size
+        return byte_start, byte_end, last
+
+    def read(self, start: int, end: int) -> bytes:
+        end = min(end, self.size)
+        if start >= end:
+            return b""
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[start:end]
+
+
+class PreviewCache:
+    """
+    LRU of file indexes and of recently served byte ranges.
+
+    Ranges are keyed by the file's ETag, so a regenerated file never serves
+    stale content; old entries just age out. Ranges larger than a quarter
+    of the byte budget are read but not cached.
+    """
+
+    def __init__(self, max_files: int = 128, max_bytes: int = 16 * MB):
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._indexes: "OrderedDict[Path, FileIndex]" = OrderedDict()
+        self._pages: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._page_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def index(self, path: Path) -> FileIndex:
+        """Index for the current version of `path` (raises OSError if missing)"""
+        stat = path.stat()
+        index = self._indexes.get(path)
+        if index is not None and index.matches(stat):
+            self._indexes.move_to_end(path)
+            return index
+        index = FileIndex(path, stat)
+        self._indexes[path] = index
+        self._indexes.move_to_end(path)
+        while len(self._indexes) > self.max_files:
+            self._indexes.popitem(last=False)
+        return index
+
+    def read(self, index: FileIndex, start: int, end: int) -> bytes:
+        key = (index.path, index.etag, start, end)
+        data = self._pages.get(key)
+        if data is not None:
+            self.hits += 1
+            self._pages.move_to_end(key)
+            return data
+        self.misses += 1
+        data = index.read(start, end)
+        if len(data) <= self.max_bytes // 4:
+            self._pages[key] = data
+            self._page_bytes += len(data)
+            while self._page_bytes > self.max_bytes:
+                _, evicted = self._pages.popitem(last=False)
+                self._page_bytes -= len(evicted)
+        return data
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self._indexes),
+            "pages": len(self._pages),
+            "page_bytes": self._page_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def parse_byte_range(header: str, size: int) -> Tuple[int, int]:
+    """
+    Parse a single-range `Range: bytes=...` header into a half-open
+    (start, end) range. Raises ValueError if it is malformed or unsatisfiable.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        raise ValueError(f"Unsupported range: {header}")
+    first, _, last = spec.strip().partition("-")
+    if first:
+        start = int(first)
+        end = int(last) + 1 if last else size
+    else:
+        start = max(size - int(last), 0)
+        end = size
+    end = min(end, size)
+    if start >= end:
+        raise ValueError(f"Range not satisfiable: {header}")
+    return start, end
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for access log ranking: line parsing, gzip input, latency
+percentiles and the route ranking.
+"""
+
+import sys
+import os
+import gzip
+import json
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from analyzers.access_log import RouteStats, ingest_files, main_cli, parse_line, rank_routes
+
+ROUTES = [
+    {"method": "GET", "path": "/users/{id}"},
+    {"method": "GET", "path": "/reports"},
+    {"method": "POST", "path": "/users"},
+]
+
+
+def log_line(method, path, status=200, size=512, request_time=None):
+    line = (f'10.0.0.1 - - [19/Oct/2026:10:00:00 +0000] "{method} {path} HTTP/1.1" {status} {size} '
+            f'"-" "Mozilla/5.0 (X11; Linux x86_64)"')
+    if request_time is not None:
+        line += f" rt={request_time:.3f}"
+    return line + "\n"
+
+
+def traffic():
+    """100 user lookups at 1..100 ms, two slow reports and some unmatched paths"""
+    lines = [log_line("GET", f"/users/{n}?expand=1", 500 if n % 50 == 0 else 200, request_time=n / 1000)
+             for n in range(1, 101)]
+    lines += [log_line("GET", "/reports", request_time=2.0) for _ in range(2)]
+    lines += [log_line("GET", f"/orders/{n}", 404) for n in range(3)]
+    lines.append("not a request line\n")
+    return lines
+
+
+def test_parse_line():
+    assert parse_line(log_line("GET", "/users/7?x=1", 201, 99, 0.25).encode()) == (b"GET", b"/users/7", 201, 99, 250.0)
+    assert parse_line(log_line("POST", "/users", 204, "-").encode()) == (b"POST", b"/users", 204, 0, None)
+    assert parse_line(b'10.0.0.1 - - [..] "-" 400 0 "-" "-"') is None
+    assert parse_line(b"garbage") is None
+
+
+def test_percentiles_are_bucket_upper_bounds():
+    stats = RouteStats()
+    for ms in range(1, 101):
+        stats.add(200, 0, float(ms))
+
+    for fraction, exact in ((0.50, 50), (0.95, 95), (0.99, 99)):
+        # Buckets grow by 10%, so a percentile is at most 10% above the exact value
+        assert exact <= stats.percentile(fraction) <= exact * 1.1
+    assert RouteStats().percentile(0.5) is None
+
+
+def test_gzip_and_plain_logs_aggregate_the_same(tmp_path):
+    lines = traffic()
+    plain = tmp_path / "access.log"
+    plain.write_text("".join(lines[:60]))
+    rotated = tmp_path / "access.log.1.gz"
+    with gzip.open(rotated, "wt") as f:
+        f.write("".join(lines[60:]))
+    single = tmp_path / "all.log"
+    single.write_text("".join(lines))
+
+    split = ingest_files([str(plain), str(rotated)], ROUTES)
+    whole = ingest_files([str(single)], ROUTES)
+
+    assert (split.lines, split.skipped) == (whole.lines, whole.skipped) == (106, 1)
+    users = split.routes[("GET", "/users/{id}")]
+    assert (users.hits, users.server_errors, users.timed) == (100, 2, 100)
+    assert users.histogram == whole.routes[("GET", "/users/{id}")].histogram
+    assert split.unmatched == {"GET /orders/{id}": 3}
+
+
+def test_rank_routes(tmp_path):
+    log = tmp_path / "access.log"
+    log.write_text("".join(traffic()))
+    aggregate = ingest_files([str(log)], ROUTES)
+
+    by_time = rank_routes(aggregate, ROUTES, "time")
+    assert [(row["rank"], row["method"], row["path"]) for row in by_time] == [
+        (1, "GET", "/users/{id}"), (2, "GET", "/reports"), (3, "POST", "/users"),
+    ]
+    users, reports, unused = by_time
+    assert users["total_time_s"] == pytest.approx(5.05)
+    assert users["mean_ms"] == pytest.approx(50.5)
+    assert reports["p99_ms"] >= 2000
+    assert (unused["hits"], unused["p50_ms"]) == (0, None)
+    assert [row["path"] for row in rank_routes(aggregate, ROUTES, "p99")][:2] == ["/reports", "/users/{id}"]
+
+
+def test_strip_prefix_and_cli_report(tmp_path, capsys):
+    log = tmp_path / "access.log.gz"
+    with gzip.open(log, "wt") as f:
+        f.write(log_line("GET", "/legacy/users/1", request_time=0.01))
+        f.write(log_line("GET", "/legacy/reports", request_time=0.02))
+    analysis = tmp_path / "analysis.json"
+    analysis.write_text(json.dumps({"routes": ROUTES}))
+    output = tmp_path / "ranking.json"
+
+    assert main_cli([str(log), "--analysis", str(analysis), "--strip-prefix", "/legacy/",
+                     "--workers", "1", "--output", str(output)]) == 0
+
+    report = json.loads(output.read_text())
+    assert {(row["path"], row["hits"]) for row in report["routes"]} == {
+        ("/users/{id}", 1), ("/reports", 1), ("/users", 0),
+    }
+    assert report["unmatched"] == {}
+    assert "2 lines" in capsys.readouterr().out
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for artifact admission, TTL expiry and quota eviction.
+
+Artifacts are small directories under pytest's tmp_path; the free-space
+reserve is set to zero unless a test is about it.
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import zipfile
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from services.artifact_lifecycle import ARCHIVE, OUTPUT, UPLOAD, ArtifactLifecycle
+
+
+def lifecycle(tmp_path, **kwargs):
+    kwargs = {"quota_bytes": 1000, "min_free_bytes": 0, **kwargs}
+    return ArtifactLifecycle(tmp_path / "uploads", tmp_path / "outputs", **kwargs)
+
+
+def make_artifact(artifacts, kind, artifact_id, size):
+    """Write an artifact of `size` bytes and register it"""
+    path = artifacts.path_for(kind, artifact_id)
+    if kind == ARCHIVE:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"z" * size)
+    else:
+        path.mkdir(parents=True)
+        (path / "data.bin").write_bytes(b"x" * size)
+    artifacts.register(kind, artifact_id)
+    return path
+
+
+def test_admit_evicts_least_recently_used_to_make_room(tmp_path):
+    artifacts = lifecycle(tmp_path)
+    oldest = make_artifact(artifacts, UPLOAD, "a", 400)
+    newer = make_artifact(artifacts, OUTPUT, "b", 400)
+    archive = make_artifact(artifacts, ARCHIVE, "c", 100)
+    # Using "a" makes "b" the least recently used
+    artifacts.touch(UPLOAD, "a")
+
+    assert artifacts.total_bytes == 900
+    assert artifacts.admit(300)
+    assert not newer.exists()
+    assert oldest.exists() and archive.exists()
+    assert artifacts.total_bytes == 500
+
+
+def test_admit_refuses_what_can_never_fit(tmp_path):
+    artifacts = lifecycle(tmp_path)
+    kept = make_artifact(artifacts, UPLOAD, "a", 100)
+
+    assert not artifacts.admit(1001)
+    # Nothing is evicted for an artifact larger than the whole quota
+    assert kept.exists()
+
+    reserved = lifecycle(tmp_path, min_free_bytes=1 << 62)
+    reserved.register(UPLOAD, "a")
+    assert not reserved.admit(1)
+    assert kept.exists() and reserved.total_bytes == 100
+
+
+def test_admit_evicts_nothing_when_eviction_cannot_make_room(tmp_path):
+    artifacts = lifecycle(tmp_path, quota_bytes=100_000)
+    first = make_artifact(artifacts, UPLOAD, "a", 3000)
+    second = make_artifact(artifacts, OUTPUT, "b", 3000)
+    # The reserve is short by far more than the 6000 bytes eviction could free
+    artifacts.min_free_bytes = artifacts.stats()["free_bytes"] + 64 * 1024
+
+    assert not artifacts.admit(500)
+    assert first.exists() and second.exists()
+    assert artifacts.total_bytes == 6000
+
+
+def test_sweep_expires_idle_artifacts_then_enforces_quota(tmp_path):
+    artifacts = lifecycle(tmp_path, ttl_seconds=60, quota_bytes=500)
+    make_artifact(artifacts, UPLOAD, "stale", 100)
+    make_artifact(artifacts, UPLOAD, "old", 300)
+    make_artifact(artifacts, OUTPUT, "recent", 300)
+    artifacts.entries["upload:stale"]["last_access"] = time.time() - 120
+
+    evicted = artifacts.sweep()
+
+    assert evicted == ["upload:stale", "upload:old"]
+    assert list(artifacts.entries) == ["output:recent"]
+    assert artifacts.total_bytes == 300
+    assert not (tmp_path / "uploads" / "stale").exists()
+    assert json.loads(artifacts.index_path.read_text()).keys() == {"output:recent"}
+
+
+def test_load_reconciles_index_with_disk(tmp_path):
+    artifacts = lifecycle(tmp_path)
+    make_artifact(artifacts, UPLOAD, "kept", 10)
+    make_artifact(artifacts, OUTPUT, "deleted", 10)
+    artifacts.save()
+    saved_access = artifacts.entries["upload:kept"]["last_access"]
+    (artifacts.path_for(OUTPUT, "deleted") / "data.bin").unlink()
+    artifacts.path_for(OUTPUT, "deleted").rmdir()
+    make_artifact(lifecycle(tmp_path), ARCHIVE, "untracked", 20)
+
+    reloaded = lifecycle(tmp_path)
+    reloaded.load()
+
+    assert set(reloaded.entries) == {"upload:kept", "archive:untracked"}
+    assert reloaded.entries["upload:kept"]["last_access"] == saved_access
+    assert reloaded.total_bytes == 30
+
+
+def test_upload_over_quota_is_refused_with_507(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    monkeypatch.setattr(main, "artifacts", lifecycle(tmp_path, quota_bytes=64))
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("index.php", "<?php echo 'hello';" * 20)
+
+    response = TestClient(main.app).post(
+        "/api/upload", files={"file": ("project.zip", archive.getvalue(), "application/zip")}
+    )
+
+    assert response.status_code == 507
+    assert "Not enough storage" in response.json()["detail"]
+
+
+def test_analysis_outputs_are_counted_with_the_upload(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    artifacts = lifecycle(tmp_path)
+    monkeypatch.setattr(main, "UPLOAD_DIR", artifacts.upload_dir)
+    monkeypatch.setattr(main, "artifacts", artifacts)
+    extracted = artifacts.upload_dir / "u1" / "extracted"
+    extracted.mkdir(parents=True)
+    (extracted / "routes.php").write_text("<?php\nRoute::get('/users', 'UserController@index');\n")
+    artifacts.register(UPLOAD, "u1")
+    uploaded = artifacts.total_bytes
+
+    response = TestClient(main.app).post("/api/analyze/u1", params={"memory_bounded": True})
+
+    assert response.status_code == 200
+    assert (artifacts.upload_dir / "u1" / "analysis.db").exists()
+    assert artifacts.entries["upload:u1"]["size"] > uploaded
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch migration command line: source naming, archive
+extraction and the run report.
+"""
+
+import sys
+import os
+import json
+import tarfile
+import zipfile
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from cli import job_names, main_cli, read_sources, run_batch
+
+ROUTES_PHP = ("<?php\nuse App\\Models\\User;\n"
+              "Route::get('/users/{id}', 'UserController@show');\nRoute::post('/users', 'UserController@store');\n")
+MODEL_PHP = "<?php\nclass User { public $name; public $email; }\n"
+
+
+def repo(root):
+    root.mkdir(parents=True)
+    (root / "routes.php").write_text(ROUTES_PHP)
+    (root / "User.php").write_text(MODEL_PHP)
+    return root
+
+
+def zipped(path):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("app/routes.php", ROUTES_PHP)
+    return path
+
+
+def tarred(path):
+    source = repo(path.parent / "tar-src")
+    with tarfile.open(path, "w:gz") as archive:
+        archive.add(source / "User.php", arcname="User.php")
+    return path
+
+
+def test_job_names_are_unique(tmp_path):
+    sources = [tmp_path / "shop", tmp_path / "other" / "shop", tmp_path / "shop.tar.gz", tmp_path / "blog.zip"]
+    assert job_names(sources) == ["shop", "shop-2", "shop-3", "blog"]
+
+
+def test_read_sources(tmp_path):
+    repos_file = tmp_path / "repos.txt"
+    repos_file.write_text("# portfolio\n/srv/a\n\n  /srv/b.zip  \n")
+    assert [str(path) for path in read_sources(["x"], repos_file)] == ["x", "/srv/a", "/srv/b.zip"]
+
+
+def test_run_batch_report(tmp_path):
+    sources = [
+        repo(tmp_path / "shop"),
+        zipped(tmp_path / "api.zip"),
+        tarred(tmp_path / "models.tgz"),
+        tmp_path / "broken.zip",
+    ]
+    sources[-1].write_bytes(b"not a zip")
+    output = tmp_path / "migrations"
+
+    report = run_batch(sources, output, {})
+
+    assert (report["sources"], report["succeeded"], report["failed"], report["invalid"]) == (4, 3, 1, 0)
+    assert report["totals"] == {"file_count": 4, "routes": 4, "models": 2, "route_conflicts": 0}
+    assert [result["source"] for result in report["results"]] == [str(source) for source in sources]
+    shop, api, models, broken = report["results"]
+    assert (shop["status"], shop["routes"], shop["models"], shop["validation"]["ok"]) == ("ok", 2, 1, True)
+    assert api["output"] == str(output / "api")
+    assert (models["routes"], models["models"]) == (0, 1)
+    assert broken["status"] == "failed" and broken["error"].startswith("BadZipFile")
+    assert all(result["seconds"] >= 0 for result in report["results"])
+
+    # Resolving the `use` import builds the index; only directories keep it
+    assert (output / "shop" / "symbols.json").exists()
+    assert not (output / "api" / "symbols.json").exists()
+    assert shop["files"]["main"] == "main.py" and (output / "shop" / "generated" / "main.py").exists()
+    assert json.loads((output / "shop" / "validation.json").read_text())["import"] is None
+
+
+def test_parallel_analysis_only(tmp_path):
+    sources = [repo(tmp_path / f"repo{n}") for n in range(3)]
+    report = run_batch(sources, tmp_path / "out", {"generate": False, "memory_bounded": True, "profile": True},
+                       workers=2)
+
+    assert report["workers"] == 2
+    assert report["succeeded"] == 3
+    assert report["totals"]["routes"] == 6
+    for result in report["results"]:
+        assert "files" not in result and "validation" not in result
+        assert set(result["profile"]) == {"total_s", "phases_s", "bytes_per_sec"}
+    assert (tmp_path / "out" / "repo0" / "analysis.db").exists()
+
+
+def test_main_cli(tmp_path, capsys):
+    output = tmp_path / "migrations"
+    options = tmp_path / "options.json"
+    options.write_text(json.dumps({"runtime": {"profile": "production"}}))
+    good = repo(tmp_path / "shop")
+
+    assert main_cli([str(good), "--output", str(output), "--workers", "1",
+                     "--options", str(options)]) == 0
+    report = json.loads((output / "report.json").read_text())
+    assert report["options"]["validate_import"] is False
+    assert report["options"]["generation"] == {"runtime": {"profile": "production"}}
+    assert (output / "shop" / "generated" / "gunicorn.conf.py").exists()
+    assert "1/1 succeeded" in capsys.readouterr().out
+
+    bad = tmp_path / "bad.zip"
+    bad.write_bytes(b"junk")
+    assert main_cli([str(bad), "--output", str(output), "--workers", "1", "--report", str(tmp_path / "r.json")]) == 1
+    assert json.loads((tmp_path / "r.json").read_text())["failed"] == 1
+
+    with pytest.raises(SystemExit):
+        main_cli([str(tmp_path / "missing"), "--output", str(output)])
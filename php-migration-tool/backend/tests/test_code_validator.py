@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Tests for post-generation validation: keyword names, duplicate and
+shadowing definitions, model fields, route collisions and the import probe.
+"""
+
+import ast
+import sys
+import os
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from generators.code_validator import CodeValidator, check_source
+from generators.project_writer import ProjectWriter
+from services.artifact_lifecycle import ArtifactLifecycle
+
+
+def kinds(result):
+    return [(issue["severity"], issue["kind"], issue["line"]) for issue in result["issues"]]
+
+
+def test_keyword_fields_and_parameters_are_errors():
+    source = (
+        "from pydantic import BaseModel\n"
+        "\n"
+        "class Order(BaseModel):\n"
+        "    id: int\n"
+        "    class: str\n"
+        "    else_: str\n"
+        "\n"
+        "def lookup(id: int, from: str = 'a'):\n"
+        "    return id\n"
+    )
+    result = check_source("models.py", source)
+
+    assert result["parsed"] is False
+    assert kinds(result) == [("error", "keyword_name", 5), ("error", "keyword_name", 8)]
+    assert "field 'class'" in result["issues"][0]["message"]
+    assert "'from'" in result["issues"][1]["message"]
+
+
+def test_syntax_errors_without_keywords_are_reported():
+    result = check_source("routes.py", "def broken(:\n    pass\n")
+    assert kinds(result) == [("error", "syntax_error", 1)]
+
+
+def test_duplicate_and_shadowing_definitions():
+    source = (
+        "from models import User\n"
+        "from fastapi import APIRouter\n"
+        "\n"
+        "def get_user():\n"
+        "    pass\n"
+        "\n"
+        "async def get_user():\n"
+        "    pass\n"
+        "\n"
+        "class User:\n"
+        "    pass\n"
+    )
+    result = check_source("routes.py", source)
+
+    assert result["parsed"] is True
+    assert kinds(result) == [
+        ("error", "shadowed_import", 10),
+        ("error", "duplicate_definition", 7),
+    ]
+    assert "already defined on line 4" in result["issues"][1]["message"]
+    assert [definition["name"] for definition in result["definitions"]] == ["get_user", "get_user", "User"]
+
+
+def test_model_fields_pydantic_would_not_accept():
+    source = (
+        "class Account(BaseModel):\n"
+        "    _secret: str\n"
+        "    json: str\n"
+        "    model_config_name: str\n"
+        "    balance: float\n"
+    )
+    result = check_source("models.py", source)
+    assert kinds(result) == [("warning", "model_field", 2), ("warning", "model_field", 3), ("warning", "model_field", 4)]
+
+
+def write_project(root, main, routes):
+    root.mkdir()
+    (root / "main.py").write_text(main)
+    (root / "routes.py").write_text(routes)
+    (root / "models.py").write_text("class User:\n    pass\n\nclass Post:\n    pass\n")
+    return root
+
+
+def test_route_collisions_follow_registration_order(tmp_path):
+    main = (
+        "from fastapi import FastAPI\n"
+        "import routes\n"
+        "app = FastAPI()\n"
+        "\n"
+        "@app.get('/users/{user_id}')\n"
+        "def early(user_id: int):\n"
+        "    pass\n"
+        "\n"
+        "app.include_router(routes.router)\n"
+        "\n"
+        "@app.get('/')\n"
+        "def root():\n"
+        "    pass\n"
+    )
+    routes = (
+        "from fastapi import APIRouter\n"
+        "router = APIRouter()\n"
+        "\n"
+        "@router.get('/users/{id}')\n"
+        "def get_user(id: int):\n"
+        "    pass\n"
+        "\n"
+        "@router.get('/users/me')\n"
+        "def me():\n"
+        "    pass\n"
+        "\n"
+        "@router.post('/users/{id}')\n"
+        "def update_user(id: int):\n"
+        "    pass\n"
+    )
+    report = CodeValidator().validate(write_project(tmp_path / "app", main, routes), import_check=False)
+
+    assert (report["ok"], report["errors"], report["warnings"]) == (False, 1, 1)
+    assert (report["handlers"], report["models"], report["import"]) == (5, 2, None)
+    collision, shadowed = report["issues"]
+    assert (collision["kind"], collision["file"], collision["line"]) == ("route_collision", "routes.py", 4)
+    assert "registered as /users/{user_id} by early (main.py:5)" in collision["message"]
+    assert (shadowed["kind"], shadowed["severity"], shadowed["line"]) == ("shadowed_route", "warning", 8)
+
+
+def test_generated_project_validates_and_imports(tmp_path):
+    analysis = {
+        "routes": [{"method": "GET", "path": "/users/{id}", "file": "users.php"},
+                   {"method": "POST", "path": "/users", "file": "users.php"}],
+        "models": [{"name": "User", "extends": None, "file": "User.php",
+                    "properties": [{"name": "name", "visibility": "public"}], "methods": []}],
+        "route_conflicts": [],
+        "dependencies": [],
+        "dependency_files": {},
+    }
+    output = tmp_path / "generated"
+    ProjectWriter().write(analysis, output)
+
+    report = CodeValidator().validate(output, import_check=True)
+
+    assert report["ok"], report["issues"]
+    assert report["errors"] == 0
+    assert set(report["files"]) >= {"main.py", "models.py", "routes.py", "test_api.py"}
+    assert all(entry["parsed"] for entry in report["files"].values())
+    assert report["import"]["error"] is None or report["import"]["skipped"]
+
+
+def test_import_failures_fail_validation(tmp_path):
+    project = write_project(tmp_path / "app", "import routes\nraise RuntimeError('boom')\n", "")
+
+    assert CodeValidator().validate(project)["import"] is None
+
+    report = CodeValidator().validate(project, import_check=True)
+
+    assert report["ok"] is False
+    assert report["import"] == {"seconds": None, "error": "RuntimeError: boom", "skipped": False}
+
+
+PAYLOAD = "__import__('os').system('touch pwned')"
+
+HOSTILE_ANALYSIS = {
+    "routes": [
+        {"method": "GET", "path": f'/x")\n{PAYLOAD}\n#', "file": f'a"""\n{PAYLOAD}\n"""',
+         "handler": f'h"""\n{PAYLOAD}'},
+        {"method": f"get('/')\n{PAYLOAD}\n#", "path": "/y", "file": "y.php"},
+    ],
+    "route_conflicts": [],
+    "models": [{"name": f"User(BaseModel):\n    pass\n{PAYLOAD}\nclass X", "extends": None,
+                "file": f'User.php"""\n{PAYLOAD}\n"""',
+                "properties": [{"name": f"x = {PAYLOAD}\n    y", "visibility": "public"}], "methods": []}],
+    "dependencies": [],
+    "dependency_files": {},
+}
+
+
+def test_analysis_values_cannot_inject_code(tmp_path):
+    output = tmp_path / "generated"
+    ProjectWriter().write(HOSTILE_ANALYSIS, output)
+
+    for name in ("main.py", "models.py", "routes.py", "test_api.py"):
+        tree = ast.parse((output / name).read_text())
+        calls = [node.func.id for node in ast.walk(tree)
+                 if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)]
+        assert "__import__" not in calls, name
+
+    routes = (output / "routes.py").read_text()
+    assert "@router.get('/x\")\\n" in routes
+    assert "@router.get('/y')" not in routes
+    models = ast.parse((output / "models.py").read_text())
+    assert [node.name for node in models.body if isinstance(node, ast.ClassDef)] == [
+        "User_BaseModel_______pass___import____os___system__touch_pwned___class_X"
+    ]
+
+
+def test_generate_endpoint_never_imports_the_generated_app(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    monkeypatch.setattr(main, "OUTPUT_DIR", tmp_path / "outputs")
+    monkeypatch.setattr(main, "artifacts", ArtifactLifecycle(tmp_path / "uploads", tmp_path / "outputs"))
+    analysis = {"routes": [{"method": "GET", "path": "/users", "file": "users.php"}],
+                "models": [], "dependencies": []}
+
+    response = TestClient(main.app).post(
+        "/api/generate/u1", json={"analysis": analysis, "options": {"validate_import": True}}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["validation"]["import"] is None
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled preview health prober and its change watcher.
+
+Preview servers are stood in for by an httpx MockTransport that counts the
+requests it receives.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+from services.health_prober import HealthProber, HealthWatch
+
+
+def mock_prober(statuses, calls, ttl=2.0, delay=0.0):
+    """Prober whose client answers port N with statuses[N], or refuses the connection"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.port)
+        if delay:
+            await asyncio.sleep(delay)
+        status = statuses.get(request.url.port)
+        if status is None:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(status)
+
+    prober = HealthProber(host="preview.test", ttl=ttl)
+    prober._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return prober
+
+
+def test_probe_reports_status_and_unreachable_ports():
+    calls = []
+
+    async def scenario():
+        prober = mock_prober({8080: 200, 8081: 500}, calls)
+        try:
+            return await prober.probe_many([8080, 8081, 8082])
+        finally:
+            await prober.close()
+
+    up, failing, down = asyncio.run(scenario())
+    assert (up["accessible"], up["status_code"], up["port"]) == (True, 200, 8080)
+    assert (failing["accessible"], failing["status_code"]) == (True, 500)
+    assert down["accessible"] is False
+    assert "connection refused" in down["error"]
+    assert all(result["cached"] is False and result["latency_ms"] >= 0 for result in (up, failing, down))
+
+
+def test_results_are_cached_for_the_ttl():
+    calls = []
+
+    async def scenario():
+        prober = mock_prober({8080: 200}, calls, ttl=60)
+        try:
+            first = await prober.probe(8080)
+            second = await prober.probe(8080)
+            fresh = await prober.probe(8080, use_cache=False)
+            return first, second, fresh
+        finally:
+            await prober.close()
+
+    first, second, fresh = asyncio.run(scenario())
+    assert (first["cached"], second["cached"], fresh["cached"]) == (False, True, False)
+    assert second["checked_at"] == first["checked_at"]
+    assert calls == [8080, 8080]
+
+
+def test_concurrent_probes_of_one_port_share_a_request():
+    calls = []
+
+    async def scenario():
+        prober = mock_prober({8080: 204}, calls, delay=0.05)
+        try:
+            return await asyncio.gather(*(prober.probe(8080, use_cache=False) for _ in range(10)))
+        finally:
+            await prober.close()
+
+    results = asyncio.run(scenario())
+    assert calls == [8080]
+    assert {result["status_code"] for result in results} == {204}
+
+
+def test_watch_streams_current_status_then_changes():
+    calls = []
+    statuses = {8080: 200}
+
+    async def scenario():
+        prober = mock_prober(statuses, calls, ttl=0)
+        watch = HealthWatch(prober, interval=0.01)
+        updates = []
+        stream = watch.stream([8080])
+        try:
+            updates.append(await stream.__anext__())
+            # Let the watcher record the current state, then take the server down
+            await asyncio.sleep(0.05)
+            statuses.pop(8080)
+            updates.append(await asyncio.wait_for(stream.__anext__(), timeout=2))
+        finally:
+            await stream.aclose()
+            await watch.close()
+            await prober.close()
+        return updates, watch
+
+    (initial, change), watch = asyncio.run(scenario())
+    assert (initial["accessible"], initial["status_code"]) == (True, 200)
+    assert change["accessible"] is False and change["port"] == 8080
+    assert watch._subscribers == {}
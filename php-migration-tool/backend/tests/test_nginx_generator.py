@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the strangler gateway config: exact, regex and opt-in `^~` prefix
+locations, per-route cutover and deterministic output.
+"""
+
+import sys
+import os
+import re
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from generators.nginx_generator import LEGACY, NginxGenerator
+
+LOCATION = re.compile(r"location (=|\^~|~) (\S+) \{\s+proxy_pass http://(\w+);")
+PREFIXES = {"prefix_locations": True}
+
+
+def locations(analysis, options=None):
+    """(modifier, match, upstream) of every generated location, in file order"""
+    return LOCATION.findall(NginxGenerator().generate(analysis, options))
+
+
+def analysis(*routes):
+    return {"routes": [{"method": method, "path": path} for method, path in routes]}
+
+
+def test_static_paths_are_exact_and_parameters_are_anchored_regexes():
+    routes = analysis(("GET", "/users"), ("GET", "/users/{id}"), ("GET", "/users/{id}/posts"),
+                      ("POST", "/users"), ("GET", "/health"))
+
+    # Unanalyzed paths such as /users/1/delete stay on the legacy app
+    assert locations(routes) == [
+        ("=", "/health", "new_api"),
+        ("=", "/users", "new_api"),
+        ("~", "^/users/[^/]+/posts$", "new_api"),
+        ("~", "^/users/[^/]+$", "new_api"),
+    ]
+    assert locations(routes, PREFIXES) == [
+        ("=", "/health", "new_api"),
+        ("=", "/users", "new_api"),
+        ("^~", "/users/", "new_api"),
+    ]
+
+
+def test_mixed_targets_fall_back_to_anchored_regexes():
+    routes = analysis(("GET", "/orders/{id}"), ("GET", "/orders/{id}/items"), ("GET", "/catalog/{sku}"))
+
+    assert locations(routes, {**PREFIXES, "cutover": {"/orders/{id}": LEGACY}}) == [
+        ("^~", "/catalog/", "new_api"),
+        # Most specific regex first
+        ("~", "^/orders/[^/]+/items$", "new_api"),
+        ("~", "^/orders/[^/]+$", "legacy_php"),
+    ]
+
+
+def test_exact_route_under_a_prefix_with_another_target_keeps_regexes():
+    routes = analysis(("GET", "/reports/summary"), ("GET", "/reports/{year}"))
+
+    assert locations(routes, {**PREFIXES, "cutover": {"/reports/summary": LEGACY}}) == [
+        ("=", "/reports/summary", "legacy_php"),
+        ("~", "^/reports/[^/]+$", "new_api"),
+    ]
+
+
+def test_root_parameters_use_regexes_even_with_prefixes():
+    routes = analysis(("GET", "/{slug}"), ("GET", "/api/v1.0/items/{id}"))
+
+    assert locations(routes, PREFIXES) == [
+        ("^~", "/api/v1.0/items/", "new_api"),
+        ("~", "^/[^/]+$", "new_api"),
+    ]
+    assert locations(routes) == [
+        ("~", "^/api/v1\\.0/items/[^/]+$", "new_api"),
+        ("~", "^/[^/]+$", "new_api"),
+    ]
+
+
+def test_prefix_is_dropped_when_it_would_hide_nested_regexes():
+    routes = analysis(("GET", "/api/{id}"), ("GET", "/api/v2/{a}"), ("GET", "/api/v2/{a}/b"))
+    options = {**PREFIXES, "cutover": {"/api/v2/{a}": LEGACY}}
+
+    # `^~ /api/` would win for /api/v2/x and skip the legacy regex
+    assert locations(routes, options) == [
+        ("~", "^/api/v2/[^/]+/b$", "new_api"),
+        ("~", "^/api/v2/[^/]+$", "legacy_php"),
+        ("~", "^/api/[^/]+$", "new_api"),
+    ]
+
+
+def test_prefix_is_dropped_for_parameterized_routes_that_reach_below_it():
+    routes = analysis(("GET", "/shop/{id}"), ("GET", "/{tenant}/shop/{id}/{b}"))
+    options = {**PREFIXES, "cutover": {"/{tenant}/shop/{id}/{b}": LEGACY}}
+
+    assert ("^~", "/shop/", "new_api") not in locations(routes, options)
+    assert ("~", "^/shop/[^/]+$", "new_api") in locations(routes, options)
+
+
+def test_defaults_upstreams_and_skipped_paths():
+    routes = analysis(("GET", "/users/:id"), ("GET", "/users/{userId}"), ("GET", "/bad path"), ("GET", "/a;b"))
+    config = NginxGenerator().generate(routes, {"default_target": LEGACY, "keepalive": 8,
+                                                "new_upstream": "api.internal:9000"})
+
+    assert LOCATION.findall(config) == [("~", "^/users/[^/]+$", "legacy_php")]
+    assert "server api.internal:9000;" in config
+    assert config.count("keepalive 8;") == 2
+    assert "# 1 analyzed paths: 0 on the new service" in config
+    assert config == NginxGenerator().generate(
+        {"routes": list(reversed(routes["routes"]))},
+        {"default_target": LEGACY, "keepalive": 8, "new_upstream": "api.internal:9000"},
+    )
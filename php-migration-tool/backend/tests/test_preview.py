@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for ranged file preview: Range parsing, line paging, the page cache
+and the preview endpoint's ETag, 304 and 206 responses.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from fastapi.testclient import TestClient
+from services.preview import PreviewCache, parse_byte_range
+
+CONTENT = "".join(f"line {number}\n" for number in range(1, 11)).encode()
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 10)),
+    ("bytes=5-", (5, 100)),
+    ("bytes=-20", (80, 100)),
+    ("bytes=-500", (0, 100)),
+    ("bytes=90-500", (90, 100)),
+    (" bytes = 0-0", (0, 1)),
+])
+def test_parse_byte_range(header, expected):
+    assert parse_byte_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", [
+    "bytes=100-",
+    "bytes=50-10",
+    "bytes=0-1,5-9",
+    "items=0-9",
+    "bytes=x-9",
+    "bytes=-0",
+])
+def test_parse_byte_range_rejects(header):
+    with pytest.raises(ValueError):
+        parse_byte_range(header, 100)
+
+
+def test_line_ranges_and_cached_pages(tmp_path):
+    path = tmp_path / "routes.py"
+    path.write_bytes(CONTENT)
+    cache = PreviewCache()
+    index = cache.index(path)
+
+    assert index.total_lines == 10
+    start, end, end_line = index.line_range(3, 2)
+    assert (end_line, index.read(start, end)) == (4, b"line 3\nline 4\n")
+    assert index.line_range(9, None)[2] == 10
+    assert index.line_range(20, 5)[:2] == (len(CONTENT), len(CONTENT))
+
+    assert cache.read(index, start, end) == cache.read(index, start, end)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.index(path) is index
+
+
+def test_rewritten_file_gets_a_new_index(tmp_path):
+    path = tmp_path / "main.py"
+    path.write_bytes(CONTENT)
+    cache = PreviewCache()
+    first = cache.index(path)
+    cache.read(first, 0, 6)
+
+    path.write_bytes(b"changed\n")
+    os.utime(path, ns=(first.mtime_ns + 1, first.mtime_ns + 1))
+    second = cache.index(path)
+
+    assert second.etag != first.etag
+    assert cache.read(second, 0, 7) == b"changed"
+    assert cache.misses == 2
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    (tmp_path / "outputs" / "out1").mkdir(parents=True)
+    (tmp_path / "outputs" / "out1" / "routes.py").write_bytes(CONTENT)
+    monkeypatch.setattr(main, "OUTPUT_DIR", tmp_path / "outputs")
+    monkeypatch.setattr(main, "preview_cache", PreviewCache())
+    return TestClient(main.app)
+
+
+def test_preview_etag_and_not_modified(client):
+    response = client.get("/api/preview/out1/routes.py", params={"start_line": 2, "lines": 2})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    body = response.json()
+    assert body["content"] == "line 2\nline 3\n"
+    assert (body["etag"], body["total_lines"], body["next_start_line"]) == (etag, 10, 4)
+
+    cached = client.get("/api/preview/out1/routes.py", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    stale = client.get("/api/preview/out1/routes.py", headers={"If-None-Match": '"0-0"'})
+    assert stale.status_code == 200
+
+
+def test_preview_raw_range_requests(client):
+    partial = client.get("/api/preview/out1/routes.py", params={"raw": True}, headers={"Range": "bytes=0-6"})
+    assert partial.status_code == 206
+    assert partial.content == b"line 1\n"
+    assert partial.headers["content-range"] == f"bytes 0-6/{len(CONTENT)}"
+
+    unsatisfiable = client.get("/api/preview/out1/routes.py", params={"raw": True}, headers={"Range": "bytes=999-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    assert client.get("/api/preview/out1/routes.py", params={"raw": True}).content == CONTENT
+    assert client.get("/api/preview/out1/..%2Fsecret.py").status_code == 404
+
+
+def test_preview_pages_past_the_end_are_unsatisfiable(client):
+    last = client.get("/api/preview/out1/routes.py", params={"start_line": 10, "lines": 5}).json()
+    assert (last["start_line"], last["end_line"], last["next_start_line"]) == (10, 10, None)
+
+    for params in ({"start_line": 11}, {"start_line": 50, "lines": 2, "raw": True}, {"byte_start": len(CONTENT) + 1}):
+        response = client.get("/api/preview/out1/routes.py", params=params)
+        assert response.status_code == 416, params
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    end = client.get("/api/preview/out1/routes.py", params={"byte_start": len(CONTENT)}).json()
+    assert (end["content"], end["next_byte_start"]) == ("", None)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the production runtime profile of generated projects: the files
+and requirements each profile produces, the gunicorn settings, the served
+app, and regenerating into a directory written with another profile.
+"""
+
+import ast
+import sys
+import os
+import json
+import runpy
+import subprocess
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from generators.project_writer import PROJECT_FILES, ProjectWriter
+
+ANALYSIS = {
+    "routes": [{"method": "GET", "path": "/users/{id}", "file": "users.php"}],
+    "models": [{"name": "User", "extends": None, "file": "User.php",
+                "properties": [{"name": "name", "visibility": "public"}], "methods": []}],
+    "route_conflicts": [],
+    "dependencies": [],
+    "dependency_files": {},
+}
+PRODUCTION = {"runtime": {"profile": "production", "workers": 3, "cors_origins": ["https://app.test"]}}
+
+# Run in a subprocess so the generated `main` does not clash with the backend's
+SERVE_PROBE = """
+import json
+from fastapi.testclient import TestClient
+import main
+
+with TestClient(main.app) as client:
+    root = client.get("/")
+    preflight = client.options("/", headers={"Origin": "https://app.test", "Access-Control-Request-Method": "GET"})
+    other = client.get("/", headers={"Origin": "https://evil.test"})
+print(json.dumps({
+    "status": root.status_code,
+    "body": root.json(),
+    "response_class": main.app.router.default_response_class.__name__,
+    "allowed_origin": preflight.headers.get("access-control-allow-origin"),
+    "other_origin": other.headers.get("access-control-allow-origin"),
+}))
+"""
+
+
+def test_profiles_produce_their_own_files():
+    writer = ProjectWriter()
+    development = writer.generate(ANALYSIS)
+    production = writer.generate(ANALYSIS, PRODUCTION)
+
+    assert set(production) - set(development) == {"gunicorn", "legacy"}
+    assert set(production) == set(PROJECT_FILES)
+    assert "gunicorn" not in development["requirements"]
+    assert "gunicorn==" in production["requirements"] and "orjson==" in production["requirements"]
+    assert "uvicorn main:app --reload" in development["readme"]
+    assert "gunicorn -c gunicorn.conf.py main:app" in production["readme"]
+    assert "GZipMiddleware" in production["main"] and "GZipMiddleware" not in development["main"]
+    # The profile comes from the options, whatever the generated code contains
+    assert writer.generate(ANALYSIS, {"runtime": {"profile": "development"}}) == development
+
+
+def test_gunicorn_settings(tmp_path, monkeypatch):
+    config = tmp_path / "gunicorn.conf.py"
+    config.write_text(ProjectWriter().generate(ANALYSIS, PRODUCTION)["gunicorn"])
+
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    settings = runpy.run_path(str(config))
+    assert (settings["workers"], settings["bind"]) == (3, "0.0.0.0:8000")
+    assert settings["worker_class"] == "uvicorn.workers.UvicornWorker"
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "7")
+    monkeypatch.setenv("PORT", "9000")
+    settings = runpy.run_path(str(config))
+    assert (settings["workers"], settings["bind"]) == (7, "0.0.0.0:9000")
+
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    config.write_text(ProjectWriter().generate(ANALYSIS, {"runtime": {"profile": "production"}})["gunicorn"])
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    assert runpy.run_path(str(config))["workers"] == cores
+
+
+def test_production_app_serves_with_configured_origins(tmp_path):
+    output = tmp_path / "generated"
+    ProjectWriter().write(ANALYSIS, output, PRODUCTION)
+    env = {key: value for key, value in os.environ.items() if key != "CORS_ORIGINS"}
+
+    probe = subprocess.run([sys.executable, "-c", SERVE_PROBE], cwd=output, env=env,
+                           capture_output=True, text=True, timeout=60)
+
+    assert probe.returncode == 0, probe.stderr
+    result = json.loads(probe.stdout.strip().splitlines()[-1])
+    assert (result["status"], result["body"]["status"]) == (200, "healthy")
+    assert result["response_class"] in ("ORJSONResponse", "JSONResponse")
+    assert result["allowed_origin"] == "https://app.test"
+    assert result["other_origin"] is None
+
+
+def getenv_defaults(source):
+    """Default of every os.getenv("NAME", default) call in a generated module"""
+    return {node.args[0].value: ast.literal_eval(node.args[1]) for node in ast.walk(ast.parse(source))
+            if isinstance(node, ast.Call) and getattr(node.func, "attr", None) == "getenv" and len(node.args) == 2}
+
+
+def test_runtime_strings_are_emitted_as_literals():
+    origin = 'https://app.test")\nimport os; os.system("touch pwned")  # \\'
+    base_url = 'http://legacy")\n__import__("os")\n#'
+    files = ProjectWriter().generate(ANALYSIS, {"runtime": {
+        "profile": "production", "cors_origins": [origin, "https://other.test"], "legacy_base_url": base_url,
+    }})
+
+    assert getenv_defaults(files["main"])["CORS_ORIGINS"] == f"{origin},https://other.test"
+    assert getenv_defaults(files["legacy"])["LEGACY_BASE_URL"] == base_url
+    for source in (files["main"], files["legacy"]):
+        calls = [getattr(node.func, "attr", getattr(node.func, "id", None))
+                 for node in ast.walk(ast.parse(source)) if isinstance(node, ast.Call)]
+        assert "system" not in calls and "__import__" not in calls
+
+
+def test_regenerating_removes_files_of_the_other_profile(tmp_path):
+    output = tmp_path / "generated"
+    writer = ProjectWriter()
+
+    written = writer.write(ANALYSIS, output, PRODUCTION)
+    assert {"gunicorn", "legacy"} <= set(written)
+    assert (output / "gunicorn.conf.py").exists() and (output / "legacy.py").exists()
+
+    written = writer.write(ANALYSIS, output)
+    assert not {"gunicorn", "legacy"} & set(written)
+    assert not (output / "gunicorn.conf.py").exists()
+    assert not (output / "legacy.py").exists()
+    assert sorted(path.name for path in output.iterdir()) == sorted(written.values())
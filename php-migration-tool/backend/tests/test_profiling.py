@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for analysis profiling: phase and per-file accounting, the folded
+stack output and profiled analyzer runs.
+"""
+
+import sys
+import os
+import re
+import time
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analyzers.php_analyzer import PHPAnalyzer
+from analyzers.profiling import AnalysisProfiler, NullProfiler, main_cli
+
+
+def test_phases_are_attributed_to_the_current_file():
+    profiler = AnalysisProfiler(slowest=1, trace_memory=False)
+    profiler.start()
+    with profiler.phase("glob"):
+        pass
+    profiler.begin_file("slow.php", 100)
+    with profiler.phase("read"):
+        time.sleep(0.02)
+    with profiler.phase("routes"):
+        pass
+    profiler.end_file()
+    profiler.begin_file("fast.php", 50)
+    with profiler.phase("read"):
+        pass
+    profiler.end_file()
+    profiler.stop()
+
+    report = profiler.report()
+    assert set(report["phases_s"]) == {"glob", "read", "routes"}
+    assert report["phases_s"]["read"] >= 0.02
+    assert (report["files"], report["bytes"]) == (2, 150)
+    assert report["bytes_per_sec"] > 0
+    assert report["peak_memory_bytes"] is None
+    assert [entry["file"] for entry in report["slowest_files"]] == ["slow.php"]
+    assert set(report["slowest_files"][0]["phases_s"]) == {"read", "routes"}
+
+
+def test_folded_stacks():
+    profiler = AnalysisProfiler(trace_memory=False)
+    profiler.start()
+    with profiler.phase("glob"):
+        time.sleep(0.01)
+    profiler.begin_file("app/My File;v2.php", 10)
+    with profiler.phase("models"):
+        time.sleep(0.01)
+    profiler.end_file()
+    profiler.stop()
+
+    lines = profiler.folded().splitlines()
+    assert all(re.fullmatch(r"analyze(;[^; ]+)+ \d+", line) for line in lines)
+    stacks = {line.rsplit(" ", 1)[0] for line in lines}
+    assert stacks == {"analyze;models;app/My_File_v2.php", "analyze;glob"}
+
+
+def test_profiled_analysis_reports_phases_and_memory(tmp_path):
+    (tmp_path / "routes.php").write_text("<?php\nRoute::get('/users', 'UserController@index');\n")
+    (tmp_path / "User.php").write_text("<?php\nclass User { public $name; }\n")
+
+    plain = PHPAnalyzer().analyze_directory(tmp_path)
+    profiled = PHPAnalyzer().analyze_directory(tmp_path, profile=True)
+
+    assert plain["profile"] is None
+    assert profiled["routes"] == plain["routes"]
+    profile = profiled["profile"]
+    assert {"glob", "read", "routes", "models", "deps"} <= set(profile["phases_s"])
+    assert profile["files"] == 2
+    assert profile["bytes"] == sum(len(path.read_text()) for path in tmp_path.glob("*.php"))
+    assert profile["peak_memory_bytes"] > 0
+    assert NullProfiler().report() is None
+
+
+def test_cli_writes_folded_stacks(tmp_path, capsys):
+    (tmp_path / "index.php").write_text("<?php\n$app->get('/ping', function () {});\n")
+    folded = tmp_path / "analysis.folded"
+
+    assert main_cli([str(tmp_path), "--folded", str(folded), "--no-memory", "--top", "1"]) == 0
+
+    assert "analyze;routes;index.php" in folded.read_text()
+    assert '"slowest_files"' in capsys.readouterr().out
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for route reachability: reference extraction, the lazily built
+dependency graph and reachable-only analysis.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analyzers.php_analyzer import PHPAnalyzer
+from analyzers.reachability import DependencyGraph, referenced_names, route_roots
+from analyzers.symbol_index import SymbolIndex
+
+FILES = {
+    "routes/web.php": """<?php
+use Illuminate\\Support\\Facades\\Route;
+use App\\Support\\Audit;
+
+Route::get('/users/{id}', 'UserController@show');
+Audit::enable();
+""",
+    "app/Http/UserController.php": """<?php
+namespace App\\Http;
+
+use App\\Models\\User;
+
+class UserController
+{
+    public function show(int $id): User
+    {
+        return User::find($id);
+    }
+}
+""",
+    "app/Models/User.php": """<?php
+namespace App\\Models;
+
+class User extends Model
+{
+    public $name;
+
+    public function profile() { return new Profile(); }
+}
+""",
+    "app/Models/Model.php": "<?php\nnamespace App\\Models;\n\nabstract class Model {}\n",
+    "app/Models/Profile.php": "<?php\nnamespace App\\Models;\n\nclass Profile { public $bio; }\n",
+    "app/Support/Audit.php": "<?php\nnamespace App\\Support;\n\nclass Audit {}\n",
+    "app/Legacy/Orphan.php": "<?php\nnamespace App\\Legacy;\n\nclass Orphan { public $unused; }\n",
+}
+
+
+def project(root):
+    for relative, content in FILES.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return root
+
+
+def test_referenced_names():
+    source = """
+    function handle(?Request $request, User &$user, Tag ...$tags): Response {
+        try { $x = new \\App\\Thing(); Cache::get(self::KEY); }
+        catch (NotFound | Gone $e) {}
+        if ($x instanceof Widget) { return parent::handle(); }
+    }
+    """
+    assert referenced_names(source) == {
+        "Request", "User", "Tag", "Response", "\\App\\Thing", "Cache", "NotFound", "Gone", "Widget",
+    }
+
+
+def test_graph_only_scans_reached_classes(tmp_path):
+    index = SymbolIndex.open(project(tmp_path))
+    graph = DependencyGraph(index)
+    routes = [{"handler": "UserController.show", "source_file": "routes/web.php"}]
+
+    roots = route_roots(graph, routes, tmp_path)
+    reachable = graph.reachable(roots)
+
+    assert roots == ["app\\http\\usercontroller", "app\\support\\audit"]
+    assert set(reachable) == {
+        "app\\http\\usercontroller", "app\\support\\audit",
+        "app\\models\\user", "app\\models\\model", "app\\models\\profile",
+    }
+    assert "app\\legacy\\orphan" not in graph._edges
+    assert set(graph.edges("app\\models\\user")) == {"app\\models\\model", "app\\models\\profile"}
+
+
+def test_reachable_only_analysis_skips_unreached_models(tmp_path):
+    project(tmp_path)
+    full = PHPAnalyzer().analyze_directory(tmp_path)
+    reachable = PHPAnalyzer().analyze_directory(tmp_path, reachable_only=True)
+
+    assert [route["path"] for route in reachable["routes"]] == [route["path"] for route in full["routes"]]
+    assert "Orphan" in {model["name"] for model in full["models"]}
+    assert {model["name"] for model in reachable["models"]} == {"UserController", "User", "Model", "Profile", "Audit"}
+    assert reachable["reachability"] == {"entry_points": 2, "reachable_classes": 5, "total_classes": 6}
+    assert "5 of 6 classes reachable from routes" in reachable["summary"]
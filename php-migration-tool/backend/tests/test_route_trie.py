@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the route trie: template normalization, deduplication and
+conflicts, specific-first ordering and matching.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from analyzers.route_trie import RouteTrie, normalize_template, sample_path
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/users/:id/", ("/users/{id}", ["id"])),
+    ("/users/{id:\\d+}", ("/users/{id}", ["id"])),
+    ("/posts/<int:post_id>/comments?page=2", ("/posts/{post_id}/comments", ["post_id"])),
+    ("//a//b", ("/a/b", [])),
+    ("/", ("/", [])),
+    ("/files/{name}.json", ("/files/{name}.json", [])),
+])
+def test_normalize_template(path, expected):
+    assert normalize_template(path) == expected
+
+
+def test_duplicates_merge_and_renamed_parameters_conflict():
+    trie = RouteTrie.from_routes([
+        {"method": "get", "path": "/users/:id", "file": "a.php"},
+        {"method": "GET", "path": "/users/{id}", "file": "b.php"},
+        {"method": "GET", "path": "/users/{user}", "file": "c.php"},
+        {"method": "DELETE", "path": "/users/{user}", "file": "c.php"},
+    ])
+
+    assert [(route["method"], route["template"], route["file"]) for route in trie.routes] == [
+        ("GET", "/users/{id}", "a.php"), ("DELETE", "/users/{user}", "c.php"),
+    ]
+    assert trie.conflicts == [{
+        "method": "GET", "template": "/users/{id}", "conflicting_template": "/users/{user}",
+        "path": "/users/{user}", "file": "c.php",
+    }]
+    assert trie.size == 2
+    assert trie.add("GET", "/users/:id") is None
+
+
+def test_specific_first_puts_literals_before_parameters():
+    trie = RouteTrie()
+    for path in ("/users/{id}", "/users/{id}/posts", "/users/me", "/users", "/{page}", "/about", "/users/me/avatar"):
+        trie.add("GET", path)
+
+    assert [route["template"] for route in trie.specific_first()] == [
+        "/users", "/users/me", "/users/me/avatar", "/users/{id}", "/users/{id}/posts", "/about", "/{page}",
+    ]
+    # Registration order is kept in `routes`
+    assert trie.routes[0]["template"] == "/users/{id}"
+
+
+def test_match_prefers_literals_and_backtracks_to_parameters():
+    trie = RouteTrie()
+    trie.add("GET", "/users/me")
+    trie.add("GET", "/users/{id}/posts")
+    trie.add("GET", "/users/{id}")
+    trie.add("POST", "/users")
+
+    assert trie.match("get", "/users/me") == "/users/me"
+    assert trie.match("GET", "/users/7?x=1") == "/users/{id}"
+    # The literal `me` branch has no posts route, so the parameter branch serves it
+    assert trie.resolve("GET", "/users/me/posts") == (trie.routes[1], {"id": "me"})
+    assert trie.match("POST", "/users/") == "/users"
+    assert trie.match("GET", "/users") is None
+    assert trie.match("GET", "/users/7/comments") is None
+    assert trie.resolve("DELETE", "/users/7") is None
+
+
+def test_sample_path():
+    assert sample_path("/users/{id}/posts/{post}", "42") == "/users/42/posts/42"
+    assert sample_path("/") == "/"
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite spill store: route deduplication and conflict
+counting, paging, memory-bounded analysis matching the in-memory one, and
+where the symbol index is built and kept.
+"""
+
+import sys
+import os
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from fastapi.testclient import TestClient
+from analyzers.php_analyzer import PHPAnalyzer
+from analyzers.route_trie import RouteTrie
+from analyzers.spill_store import JsonTable, SpillStore
+from analyzers.symbol_index import SymbolIndex
+
+ROUTES = [
+    {"method": "get", "path": "/users/:id", "file": "a.php"},
+    {"method": "GET", "path": "/users/{id}", "file": "b.php"},
+    {"method": "GET", "path": "/users/{user}", "file": "c.php"},
+    {"method": "GET", "path": "/users/{uid:\\d+}", "file": "d.php"},
+    {"method": "PUT", "path": "/users/{user}", "file": "c.php"},
+    {"path": "/health", "file": "e.php"},
+]
+
+
+def test_routes_are_deduplicated_and_conflicts_counted(tmp_path):
+    store = SpillStore.create(tmp_path / "analysis.db")
+    store.add_routes(ROUTES[:3])
+    store.add_routes(ROUTES[3:])
+
+    assert store.counts["routes"] == 3
+    assert store.counts["route_conflicts"] == 2
+    assert [(route["method"], route["template"], route["file"]) for route in store.routes()] == [
+        ("GET", "/users/{id}", "a.php"), ("PUT", "/users/{user}", "c.php"), ("GET", "/health", "e.php"),
+    ]
+    # Same rules, and the same results, as the in-memory trie
+    trie = RouteTrie.from_routes(ROUTES)
+    assert list(store.route_conflicts()) == trie.conflicts
+    assert [route["template"] for route in store.routes()] == [route["template"] for route in trie.routes]
+    store.close()
+
+
+def test_models_dependencies_and_pages(tmp_path):
+    path = tmp_path / "analysis.db"
+    store = SpillStore.create(path)
+    store.add_models([{"name": f"Model{n}"} for n in range(5)])
+    store.add_dependencies(["PDO", "App\\Models\\User", "PDO"])
+    store.add_dependencies(["App\\Models\\User", "Monolog\\Logger"])
+    store.set_dependency_files({"App\\Models\\User": "src/Models/User.php"})
+    store.close()
+
+    reopened = SpillStore.open(path)
+    assert reopened.counts == {"routes": 0, "models": 5, "dependencies": 3, "route_conflicts": 0}
+    page = reopened.page("models", offset=3, limit=10)
+    assert (page["total"], [model["name"] for model in page["items"]]) == (5, ["Model3", "Model4"])
+    assert reopened.page("dependencies", limit=2)["items"] == [
+        {"name": "App\\Models\\User", "file": "src/Models/User.php"}, {"name": "Monolog\\Logger", "file": None},
+    ]
+    with pytest.raises(KeyError):
+        reopened.page("classes")
+    assert reopened.to_analysis()["dependency_files"] == {"App\\Models\\User": "src/Models/User.php"}
+    reopened.close()
+
+    with pytest.raises(FileNotFoundError):
+        SpillStore.open(tmp_path / "missing.db")
+
+
+def project(root):
+    (root / "routes").mkdir()
+    (root / "routes" / "web.php").write_text("""<?php
+use App\\Models\\User;
+Route::get('/users/{id}', 'UserController@show');
+Route::get('/users/:id', 'UserController@show');
+""")
+    (root / "routes" / "api.php").write_text("<?php\nRoute::get('/users/{user}', 'Api@show');\nRoute::post('/users', 'Api@store');\n")
+    (root / "User.php").write_text("<?php\nnamespace App\\Models;\nuse PDO;\nclass User { public $name; }\n")
+
+
+def test_memory_bounded_analysis_matches_in_memory(tmp_path):
+    project(tmp_path)
+    in_memory = PHPAnalyzer().analyze_directory(tmp_path)
+    spilled = PHPAnalyzer().analyze_directory(tmp_path, spill_path=tmp_path / "analysis.db")
+
+    assert in_memory["store"] is None
+    assert spilled["routes"] == [] and spilled["models"] == []
+    assert spilled["store"] == {"routes": 2, "models": 1, "dependencies": 2, "route_conflicts": 1}
+    assert spilled["summary"] == in_memory["summary"]
+
+    store = SpillStore.open(tmp_path / "analysis.db")
+    stored = store.to_analysis()
+    store.close()
+    for key in ("routes", "route_conflicts", "models", "dependencies", "dependency_files"):
+        assert sorted(map(repr, stored[key])) == sorted(map(repr, in_memory[key])), key
+
+
+def test_symbol_index_is_built_only_when_needed(tmp_path):
+    (tmp_path / "routes.php").write_text("<?php\nRoute::get('/ping', 'Ping@show');\nrequire 'config.php';\n")
+    (tmp_path / "Ping.php").write_text("<?php\nnamespace App;\nclass Ping { public $at; }\n")
+    analyzer = PHPAnalyzer()
+
+    analysis = analyzer.analyze_directory(tmp_path, index_path=tmp_path / "symbols.json")
+
+    # No class dependencies to resolve: models are qualified from their own file
+    assert analyzer.symbol_index is None
+    assert not (tmp_path / "symbols.json").exists()
+    assert [(model["fqcn"], model["path"], model["span"]) for model in analysis["models"]] == [
+        ("App\\Ping", "Ping.php", [3, 3]),
+    ]
+
+
+def test_memory_bounded_symbol_index_lives_in_the_store(tmp_path):
+    project(tmp_path)
+    in_memory = PHPAnalyzer().analyze_directory(tmp_path, reachable_only=True)
+    analyzer = PHPAnalyzer()
+    spilled = analyzer.analyze_directory(tmp_path, reachable_only=True, spill_path=tmp_path / "analysis.db",
+                                         index_path=tmp_path / "symbols.json")
+
+    assert isinstance(analyzer.symbol_index.symbols, JsonTable)
+    assert not (tmp_path / "symbols.json").exists()
+    assert spilled["reachability"] == in_memory["reachability"]
+    store = SpillStore.open(tmp_path / "analysis.db")
+    assert store.to_analysis()["dependency_files"] == in_memory["dependency_files"] == {"App\\Models\\User": "User.php"}
+    assert dict(SymbolIndex(tmp_path, **store.symbol_tables()).symbols) == dict(SymbolIndex.open(tmp_path).symbols)
+    store.close()
+
+
+def test_analysis_view_endpoint(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import main
+
+    monkeypatch.setattr(main, "UPLOAD_DIR", tmp_path / "uploads")
+    (tmp_path / "uploads" / "up1").mkdir(parents=True)
+    store = SpillStore.create(main.analysis_store_path("up1"))
+    store.add_routes(ROUTES)
+    store.close()
+    client = TestClient(main.app)
+
+    page = client.get("/api/analysis/up1/routes", params={"offset": 1, "limit": 1}).json()
+    assert (page["total"], page["offset"], [route["template"] for route in page["items"]]) == (3, 1, ["/users/{user}"])
+    assert client.get("/api/analysis/up1/route_conflicts").json()["total"] == 2
+    assert client.get("/api/analysis/up1/classes").status_code == 404
+    assert client.get("/api/analysis/missing/routes").status_code == 404
+    assert client.get("/api/analysis/up1/routes", params={"limit": 5000}).status_code == 422
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent PHP symbol index: declaration parsing, PSR-4
+lookup and incremental re-indexing.
+"""
+
+import sys
+import os
+import json
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from analyzers import symbol_index
+from analyzers.symbol_index import SymbolIndex, parse_symbols, parse_use_clause, resolve_name
+
+USER = """<?php
+namespace App\\Models;
+
+use App\\Contracts\\{Auditable, HasOwner as Owned};
+use Illuminate\\Database\\Eloquent\\Model;
+
+final class User extends Model implements Auditable, Owned
+{
+    use SoftDeletes;
+
+    public function posts() { return []; }
+}
+"""
+
+
+def write(root, relative, content):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def project(root):
+    write(root, "composer.json", json.dumps({
+        "autoload": {"psr-4": {"App\\": "src/", "App\\Http\\": "http/"}},
+        "autoload-dev": {"psr-4": {"Tests\\": ["tests/", "more-tests/"]}},
+    }))
+    write(root, "src/Models/User.php", USER)
+    write(root, "http/Controllers/UserController.php",
+          "<?php\nnamespace App\\Http\\Controllers;\n\nclass UserController {}\n")
+
+
+def test_parse_symbols_resolves_imports_and_spans():
+    (user,) = parse_symbols(USER)
+
+    assert user["fqcn"] == "App\\Models\\User"
+    assert user["extends"] == ["Illuminate\\Database\\Eloquent\\Model"]
+    assert user["implements"] == ["App\\Contracts\\Auditable", "App\\Contracts\\HasOwner"]
+    # A trait `use` inside the class body is not an import
+    assert "softdeletes" not in user["imports"]
+    assert user["span"] == [7, 12]
+    assert USER[slice(*user["offsets"])].rstrip().endswith("}")
+
+
+def test_name_resolution_rules():
+    imports = parse_use_clause("App\\Models\\User as U, App\\Support")
+    assert imports == {"u": "App\\Models\\User", "support": "App\\Support"}
+    assert resolve_name("U", "App\\Http", imports) == "App\\Models\\User"
+    assert resolve_name("Support\\Str", "App\\Http", imports) == "App\\Support\\Str"
+    assert resolve_name("\\DateTime", "App\\Http", imports) == "DateTime"
+    assert resolve_name("Request", "App\\Http", imports) == "App\\Http\\Request"
+
+
+def test_psr4_paths_use_the_longest_prefix(tmp_path):
+    project(tmp_path)
+    index = SymbolIndex(tmp_path)
+    index.load_composer()
+
+    assert index.psr4_paths("App\\Http\\Kernel") == ["http/Kernel.php"]
+    assert index.psr4_paths("\\App\\Models\\Post") == ["src/Models/Post.php"]
+    assert index.psr4_paths("Tests\\Unit\\UserTest") == ["tests/Unit/UserTest.php", "more-tests/Unit/UserTest.php"]
+    assert index.psr4_paths("Vendor\\Thing") == []
+
+
+def test_locate_indexes_psr4_files_on_demand(tmp_path):
+    project(tmp_path)
+    index = SymbolIndex(tmp_path)
+    index.load_composer()
+    assert index.symbols == {}
+
+    assert index.locate("App\\Models\\User") == "src/Models/User.php"
+    # Once indexed, lookups are case-insensitive like PHP class names
+    assert index.locate("app\\models\\user") == "src/Models/User.php"
+    assert index.locate("App\\Http\\Controllers\\UserController") == "http/Controllers/UserController.php"
+    assert index.locate("App\\Models\\Missing") is None
+    assert "class User extends Model" in index.source("App\\Models\\User")
+
+
+def test_update_reparses_only_changed_files(tmp_path, monkeypatch):
+    project(tmp_path)
+    index_path = tmp_path / "symbols.json"
+    SymbolIndex.open(tmp_path, index_path)
+
+    parsed = []
+    real_parse = symbol_index.parse_symbols
+    monkeypatch.setattr(symbol_index, "parse_symbols", lambda content: parsed.append(content) or real_parse(content))
+
+    unchanged = SymbolIndex.open(tmp_path, index_path)
+    assert parsed == []
+    assert unchanged.lookup("App\\Models\\User")["file"] == "src/Models/User.php"
+
+    write(tmp_path, "src/Models/User.php", USER.replace("class User", "class Member"))
+    (tmp_path / "http/Controllers/UserController.php").unlink()
+    updated = SymbolIndex.open(tmp_path, index_path)
+
+    assert len(parsed) == 1
+    assert updated.lookup("App\\Models\\User") is None
+    assert updated.lookup("App\\Models\\Member")["file"] == "src/Models/User.php"
+    assert updated.lookup("App\\Http\\Controllers\\UserController") is None
+    assert set(json.loads(index_path.read_text())["files"]) == {"src/Models/User.php"}
@@ -1,18 +1,38 @@
 import { useState } from 'react'
 
+const PREVIEW_PAGE_LINES = 500
+
 export default function Download({ generated }) {
   const [selectedFile, setSelectedFile] = useState(null)
   const [fileContent, setFileContent] = useState(null)
+  const [nextLine, setNextLine] = useState(null)
+  const [totalLines, setTotalLines] = useState(0)
+
+  const fetchPreviewPage = async (filename, startLine) => {
+    const response = await fetch(
+      `/api/preview/${generated.output_id}/${filename}?start_line=${startLine}&lines=${PREVIEW_PAGE_LINES}`
+    )
+    return response.json()
+  }
 
   const handlePreview = async (filename) => {
     setSelectedFile(filename)
     
     try {
-      const response = await fetch(
-        `/api/preview/${generated.output_id}/${filename}`
-      )
-      const data = await response.json()
+      const data = await fetchPreviewPage(filename, 1)
       setFileContent(data.content)
+      setNextLine(data.next_start_line)
+      setTotalLines(data.total_lines)
+    } catch (err) {
+      console.error('Preview failed:', err)
+    }
+  }
+
+  const handleLoadMore = async () => {
+    try {
+      const data = await fetchPreviewPage(selectedFile, nextLine)
+      setFileContent((content) => content + data.content)
+      setNextLine(data.next_start_line)
     } catch (err) {
       console.error('Preview failed:', err)
     }
@@ -86,6 +106,14 @@ export default function Download({ generated }) {
             <pre className="text-sm text-green-400 font-mono">
               <code>{fileContent}</code>
             </pre>
+            {nextLine && (
+              <button
+                onClick={handleLoadMore}
+                className="mt-4 text-sm text-purple-300 hover:text-purple-100"
+              >
+                Load more (line {nextLine} of {totalLines})
+              </button>
+            )}
           </div>
         </div>
       )}
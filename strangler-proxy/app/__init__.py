@@ -0,0 +1 @@
+# Strangler routing proxy package
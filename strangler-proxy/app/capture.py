@@ -0,0 +1,291 @@
+"""
+Traffic capture for building migration test corpora.
+
+CaptureMiddleware wraps any ASGI app (normally the strangler proxy) and
+records request/response pairs to an append-only log. The request path
+stays cheap: finished exchanges are appended to an in-memory batch, and
+full batches are compressed and written by a single background thread.
+
+On-disk layout of a capture directory:
+
+    capture-000001.ndjson.gz   segments of concatenated gzip members, one
+                               member per batch (a valid .gz file as a whole)
+    index.ndjson               one line per member: segment, byte offset,
+                               length, record count and per-route counts
+
+The index lets readers decompress only the members that contain the routes
+they ask for. Nothing is ever rewritten: a new writer starts a new segment,
+and an index line is appended only after its member is on disk.
+
+Usage:
+    python -m app.capture captures/            # per-route counts
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from app.diff_engine import decode_content, route_template
+
+INDEX_FILE = "index.ndjson"
+SEGMENT_PATTERN = "capture-{:06d}.ndjson.gz"
+
+# Never written to the log
+SENSITIVE_HEADERS = {"authorization", "cookie", "set-cookie", "proxy-authorization", "x-api-key"}
+
+# Content-Encoding says whether the stored response body is compressed
+CAPTURED_RESPONSE_HEADERS = {"content-type", "content-encoding", "location"}
+
+
+def encode_body(body: bytes) -> Dict[str, str]:
+    """Text bodies stay readable in the log; anything else is base64"""
+    try:
+        return {"text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(body).decode("ascii")}
+
+
+def decode_body(encoded: Dict[str, str]) -> bytes:
+    if "b64" in encoded:
+        return base64.b64decode(encoded["b64"])
+    return encoded.get("text", "").encode("utf-8")
+
+
+def response_body(record: Dict[str, Any]) -> bytes:
+    """Captured response body, decompressed if it was sent with a Content-Encoding"""
+    encoding = next((value for name, value in record.get("response_headers", []) if name == "content-encoding"), None)
+    return decode_content(decode_body(record["response"]), encoding)
+
+
+class CaptureWriter:
+    """Batches capture records and appends them as compressed, indexed members"""
+
+    def __init__(
+        self,
+        directory: Path,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        segment_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_bytes = segment_bytes
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        # One thread keeps members and index lines in submission order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture-writer")
+        self._segment_number = max(
+            (int(path.name.split("-")[1].split(".")[0]) for path in self.directory.glob("capture-*.ndjson.gz")),
+            default=0,
+        ) + 1
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.append(entry)
+            due = (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            batch = self._take_pending() if due else None
+        if batch:
+            self._executor.submit(self._write_batch, batch)
+
+    def flush(self) -> None:
+        """Write everything recorded so far and wait for it to reach disk"""
+        with self._lock:
+            batch = self._take_pending()
+        if batch:
+            self._executor.submit(self._write_batch, batch)
+        self._executor.submit(lambda: None).result()
+
+    def close(self) -> None:
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _take_pending(self) -> List[Dict[str, Any]]:
+        batch, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+        return batch
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        member = gzip.compress(b"".join(json.dumps(entry).encode() + b"\n" for entry in batch))
+        segment = self.directory / SEGMENT_PATTERN.format(self._segment_number)
+        if segment.exists() and segment.stat().st_size + len(member) > self.segment_bytes:
+            self._segment_number += 1
+            segment = self.directory / SEGMENT_PATTERN.format(self._segment_number)
+        with open(segment, "ab") as stream:
+            offset = stream.tell()
+            stream.write(member)
+        index_entry = {
+            "segment": segment.name,
+            "offset": offset,
+            "length": len(member),
+            "records": len(batch),
+            "routes": Counter(entry["route"] for entry in batch),
+            "first_ts": batch[0]["ts"],
+            "last_ts": batch[-1]["ts"],
+        }
+        with open(self.directory / INDEX_FILE, "a") as index:
+            index.write(json.dumps(index_entry) + "\n")
+
+
+def read_index(directory: Path) -> List[Dict[str, Any]]:
+    index = Path(directory) / INDEX_FILE
+    if not index.exists():
+        return []
+    return [json.loads(line) for line in index.read_text().splitlines() if line.strip()]
+
+
+def route_counts(directory: Path) -> Counter:
+    counts: Counter = Counter()
+    for entry in read_index(directory):
+        counts.update(entry["routes"])
+    return counts
+
+
+def iter_captures(
+    directory: Path, routes: Optional[Iterable[str]] = None, methods: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream captured exchanges in capture order.
+
+    Args:
+        routes: only these route templates, e.g. "GET /requests/{id}"
+        methods: only these HTTP methods
+    """
+    wanted_routes: Optional[Set[str]] = set(routes) if routes else None
+    wanted_methods: Optional[Set[str]] = {method.upper() for method in methods} if methods else None
+    for entry in read_index(directory):
+        if wanted_routes is not None and wanted_routes.isdisjoint(entry["routes"]):
+            continue
+        with open(Path(directory) / entry["segment"], "rb") as stream:
+            stream.seek(entry["offset"])
+            member = stream.read(entry["length"])
+        for line in gzip.decompress(member).splitlines():
+            record = json.loads(line)
+            if wanted_routes is not None and record["route"] not in wanted_routes:
+                continue
+            if wanted_methods is not None and record["method"] not in wanted_methods:
+                continue
+            yield record
+
+
+class CaptureMiddleware:
+    """ASGI middleware recording a sample of HTTP exchanges to a CaptureWriter"""
+
+    def __init__(
+        self,
+        app,
+        writer: CaptureWriter,
+        sample_rate: float = 1.0,
+        max_body_bytes: int = 1024 * 1024,
+        exclude_paths: Iterable[str] = ("/__proxy/stats",),
+        rng: Optional[random.Random] = None,
+    ):
+        self.app = app
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.max_body_bytes = max_body_bytes
+        self.exclude_paths = set(exclude_paths)
+        self.rng = rng or random.Random()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.app(scope, receive, self._lifespan_send(send))
+            return
+        if (
+            scope["type"] != "http"
+            or scope["path"] in self.exclude_paths
+            or (self.sample_rate < 1.0 and self.rng.random() >= self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_body = bytearray()
+        response_body = bytearray()
+        response: Dict[str, Any] = {"status": None, "headers": [], "truncated": False}
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "http.request":
+                self._append(request_body, message.get("body", b""), response)
+            return message
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                self._append(response_body, message.get("body", b""), response)
+            await send(message)
+
+        started = time.perf_counter()
+        await self.app(scope, receive_wrapper, send_wrapper)
+        if response["status"] is None:
+            return
+
+        method = scope["method"]
+        self.writer.record({
+            "ts": time.time(),
+            "route": route_template(f"{method} {scope['path']}"),
+            "method": method,
+            "path": scope["path"],
+            "query": scope["query_string"].decode("latin-1"),
+            "headers": _filter_headers(scope["headers"]),
+            "request": encode_body(bytes(request_body)),
+            "status": response["status"],
+            "response_headers": _filter_headers(response["headers"], CAPTURED_RESPONSE_HEADERS),
+            "response": encode_body(bytes(response_body)),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "truncated": response["truncated"],
+        })
+
+    def _append(self, buffer: bytearray, chunk: bytes, response: Dict[str, Any]) -> None:
+        room = self.max_body_bytes - len(buffer)
+        if len(chunk) > room:
+            response["truncated"] = True
+            chunk = chunk[:max(room, 0)]
+        buffer.extend(chunk)
+
+    def _lifespan_send(self, send):
+        async def wrapper(message):
+            if message["type"] == "lifespan.shutdown.complete":
+                self.writer.close()
+            await send(message)
+        return wrapper
+
+
+def _filter_headers(raw_headers, allowed: Optional[Set[str]] = None) -> List[List[str]]:
+    headers = []
+    for raw_name, raw_value in raw_headers:
+        name = raw_name.decode("latin-1").lower()
+        if name in SENSITIVE_HEADERS or (allowed is not None and name not in allowed):
+            continue
+        headers.append([name, raw_value.decode("latin-1")])
+    return headers
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", type=Path)
+    args = parser.parse_args()
+
+    counts = route_counts(args.directory)
+    print(f"{sum(counts.values())} captured exchanges in {len(read_index(args.directory))} batches")
+    for route, count in counts.most_common():
+        print(f"  {route:<50} {count}")
+
+
+if __name__ == "__main__":
+    main_cli()
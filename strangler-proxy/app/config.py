@@ -0,0 +1,108 @@
+"""
+Routing configuration for the strangler proxy.
+
+Rules are matched by longest path prefix. Each rule decides what share of
+its traffic the new API serves and whether the other backend receives a
+shadow copy for comparison. The defaults reproduce gateway/nginx.conf:
+/api/* goes to the new API with the /api prefix stripped, everything else
+goes to the legacy PHP app.
+
+Rules can be overridden with a JSON file named by PROXY_ROUTES_FILE:
+
+    [
+        {"prefix": "/api/", "new_percent": 100, "new_prefix": "/"},
+        {"prefix": "/api/requests", "new_percent": 25, "new_prefix": "/requests",
+         "legacy_prefix": "/legacy/requests.json", "shadow": true},
+        {"prefix": "/"}
+    ]
+
+Shadowing only mirrors safe methods (GET, HEAD) unless a rule sets
+"shadow_unsafe": true. Mirroring a POST or DELETE would repeat its side
+effects on the other backend.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+LEGACY = "legacy"
+NEW = "new"
+
+# Methods that can be sent to a second backend without side effects
+SAFE_METHODS = ("GET", "HEAD")
+
+
+@dataclass(frozen=True)
+class RouteRule:
+    """How requests under one path prefix are split between backends"""
+    prefix: str
+    new_percent: float = 0.0
+    shadow: bool = False
+    # Also shadow methods outside SAFE_METHODS (the other backend must tolerate repeated writes)
+    shadow_unsafe: bool = False
+    # Replacement for `prefix` when forwarding to each backend
+    new_prefix: Optional[str] = None
+    legacy_prefix: Optional[str] = None
+
+    def upstream_path(self, path: str, backend: str) -> str:
+        """Rewrite a request path for the given backend"""
+        replacement = self.new_prefix if backend == NEW else self.legacy_prefix
+        if replacement is None:
+            return path
+        return replacement + path[len(self.prefix):]
+
+    def shadows(self, method: str) -> bool:
+        """Whether a request with this method gets a shadow copy"""
+        return self.shadow and (self.shadow_unsafe or method in SAFE_METHODS)
+
+
+@dataclass
+class ProxyConfig:
+    legacy_url: str = "http://legacy-php:80"
+    new_url: str = "http://new-api:8000"
+    rules: List[RouteRule] = field(default_factory=list)
+    upstream_timeout: float = 30.0
+    # Upper bound on keep-alive connections per upstream pool
+    max_connections: int = 100
+    # Shadow calls waiting beyond this are dropped rather than queued
+    shadow_queue_size: int = 1000
+    shadow_workers: int = 8
+    shadow_timeout: float = 5.0
+
+    def __post_init__(self):
+        # Longest prefix first so the most specific rule wins
+        self.rules = sorted(self.rules, key=lambda rule: len(rule.prefix), reverse=True)
+
+    def match(self, path: str) -> RouteRule:
+        for rule in self.rules:
+            if path.startswith(rule.prefix):
+                return rule
+        return RouteRule(prefix="/")
+
+
+DEFAULT_RULES = [
+    RouteRule(prefix="/api/", new_percent=100, new_prefix="/"),
+    RouteRule(prefix="/"),
+]
+
+
+def load_rules(path: Path) -> List[RouteRule]:
+    """Read routing rules from a JSON file"""
+    return [RouteRule(**rule) for rule in json.loads(path.read_text())]
+
+
+def load_config() -> ProxyConfig:
+    """Build the proxy configuration from environment variables"""
+    routes_file = os.getenv("PROXY_ROUTES_FILE")
+    return ProxyConfig(
+        legacy_url=os.getenv("LEGACY_URL", "http://legacy-php:80"),
+        new_url=os.getenv("NEW_API_URL", "http://new-api:8000"),
+        rules=load_rules(Path(routes_file)) if routes_file else list(DEFAULT_RULES),
+        upstream_timeout=float(os.getenv("UPSTREAM_TIMEOUT", "30")),
+        max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+        shadow_queue_size=int(os.getenv("SHADOW_QUEUE_SIZE", "1000")),
+        shadow_workers=int(os.getenv("SHADOW_WORKERS", "8")),
+        shadow_timeout=float(os.getenv("SHADOW_TIMEOUT", "5")),
+    )
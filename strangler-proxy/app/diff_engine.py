@@ -0,0 +1,512 @@
+"""
+Structured diffing of legacy vs. new API responses at scale.
+
+Response pairs are streamed from recorded NDJSON files (plain or .gz), so a
+run over millions of pairs holds only the chunks currently in flight plus
+an aggregate report. Lines are parsed, normalized and diffed in worker
+processes; the parent only reads lines and merges partial reports.
+
+Input formats, one JSON object per line:
+
+    paired file:  {"key": "GET /requests/7", "route": "GET /requests/{id}",
+                   "legacy": {"status": 200, "body": ...},
+                   "new": {"status": 200, "body": ...}}
+    two files:    {"key": "GET /requests/7", "status": 200, "body": ...}
+                  (legacy and new recorded in the same order)
+
+"route" is optional. Without it, numeric path segments of "key" are
+collapsed to {id} for the per-route breakdown. "body" may be a JSON value
+or a raw string.
+
+Live responses are recorded into a paired file first with --live, so the
+same pairs can be diffed again later under different rules.
+
+Usage (from the strangler-proxy directory):
+    python -m app.diff_engine pairs.ndjson.gz --workers 8 --output report.json
+    python -m app.diff_engine --legacy legacy.ndjson --new new.ndjson
+    python -m app.diff_engine --live paths.txt --legacy-url http://localhost:8080 \\
+        --new-url http://localhost:8000 --record pairs.ndjson.gz
+    python -m app.diff_engine pairs.ndjson --rules field_casing,dates,compared_fields \\
+        --rules-module my_rules
+"""
+
+import argparse
+import asyncio
+import gzip
+import importlib
+import itertools
+import json
+import re
+import sys
+import zlib
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.normalize import DEFAULT_NORMALIZER, DEFAULT_RULES, Normalizer
+
+LEGACY_SIDE = "legacy"
+NEW_SIDE = "new"
+
+# Differences recorded per pair; further ones are only counted as truncated
+MAX_DIFFS_PER_PAIR = 20
+
+_INDEX = re.compile(r"\[[^\]]*\]")
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|\?|$)")
+
+
+@dataclass(frozen=True)
+class FieldDiff:
+    """One difference between normalized legacy and new values"""
+    path: str
+    # changed | missing (only legacy has it) | extra (only new has it) | type | length
+    kind: str
+    legacy: Any = None
+    new: Any = None
+
+    def describe(self) -> str:
+        if self.kind == "missing":
+            return f"{self.path}: only in first response"
+        if self.kind == "extra":
+            return f"{self.path}: only in second response"
+        return f"{self.path}: {self.legacy!r} != {self.new!r}"
+
+
+def diff_values(legacy: Any, new: Any, path: str = "$", limit: int = MAX_DIFFS_PER_PAIR) -> List[FieldDiff]:
+    """Differences between two JSON values, at most `limit` of them"""
+    diffs: List[FieldDiff] = []
+    _diff_into(legacy, new, path, diffs, limit)
+    return diffs
+
+
+def _diff_into(legacy: Any, new: Any, path: str, diffs: List[FieldDiff], limit: int) -> None:
+    if len(diffs) >= limit or legacy == new:
+        return
+    if isinstance(legacy, dict) and isinstance(new, dict):
+        names = list(legacy) + [name for name in new if name not in legacy]
+        for name in names:
+            child = f"{path}{name}" if name.startswith("[") else f"{path}.{name}"
+            if name not in new:
+                diffs.append(FieldDiff(child, "missing", legacy=legacy[name]))
+            elif name not in legacy:
+                diffs.append(FieldDiff(child, "extra", new=new[name]))
+            else:
+                _diff_into(legacy[name], new[name], child, diffs, limit)
+            if len(diffs) >= limit:
+                return
+    elif isinstance(legacy, list) and isinstance(new, list):
+        if _is_record_list(legacy) and _is_record_list(new):
+            # Align records by id so one missing row is not reported as a shifted list
+            _diff_into(_by_id(legacy), _by_id(new), path, diffs, limit)
+            return
+        if len(legacy) != len(new):
+            diffs.append(FieldDiff(path, "length", legacy=len(legacy), new=len(new)))
+        for index, (left, right) in enumerate(zip(legacy, new)):
+            _diff_into(left, right, f"{path}[{index}]", diffs, limit)
+            if len(diffs) >= limit:
+                return
+    elif type(legacy) is not type(new):
+        diffs.append(FieldDiff(path, "type", legacy=type(legacy).__name__, new=type(new).__name__))
+    else:
+        diffs.append(FieldDiff(path, "changed", legacy=legacy, new=new))
+
+
+def _is_record_list(items: List[Any]) -> bool:
+    return bool(items) and all(isinstance(item, dict) and "id" in item for item in items)
+
+
+def _by_id(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {f"[id={record['id']}]": record for record in records}
+
+
+def diff_responses(
+    legacy_status: int, legacy_body: Any, new_status: int, new_body: Any,
+    normalizer: Normalizer = DEFAULT_NORMALIZER, limit: int = MAX_DIFFS_PER_PAIR,
+) -> List[FieldDiff]:
+    """Structured differences between two responses after normalization"""
+    diffs = []
+    if legacy_status != new_status:
+        diffs.append(FieldDiff("status", "changed", legacy=legacy_status, new=new_status))
+    legacy_json, new_json = _as_json(legacy_body), _as_json(new_body)
+    if legacy_json is None or new_json is None:
+        if legacy_json is None and new_json is None:
+            if legacy_body != new_body:
+                diffs.append(FieldDiff("$", "changed", legacy="<non-JSON body>", new="<non-JSON body>"))
+        else:
+            diffs.append(FieldDiff("$", "type", legacy=_body_kind(legacy_json), new=_body_kind(new_json)))
+        return diffs
+    diffs.extend(diff_values(
+        normalizer.normalize_payload(legacy_json), normalizer.normalize_payload(new_json),
+        limit=limit - len(diffs),
+    ))
+    return diffs
+
+
+def compare_responses(
+    primary_status: int, primary_body: bytes, shadow_status: int, shadow_body: bytes
+) -> Optional[str]:
+    """
+    Compare two upstream responses after normalization.
+
+    Returns:
+        None when the responses are equivalent, otherwise a short description
+        of the first difference found
+    """
+    diffs = diff_responses(primary_status, primary_body, shadow_status, shadow_body, limit=1)
+    return diffs[0].describe() if diffs else None
+
+
+def decode_content(body: bytes, content_encoding: Optional[str]) -> bytes:
+    """
+    Undo a gzip/deflate Content-Encoding so bodies compare by content.
+    Unknown encodings and undecodable bodies are returned unchanged.
+    """
+    encoding = (content_encoding or "").strip().lower()
+    try:
+        if encoding in ("gzip", "x-gzip"):
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+    except (OSError, EOFError, zlib.error):
+        pass
+    return body
+
+
+def _as_json(body: Any) -> Any:
+    """Decode raw bodies; recorded bodies may already be JSON values"""
+    if isinstance(body, (bytes, str)):
+        try:
+            return json.loads(body)
+        except (ValueError, UnicodeDecodeError):
+            return None
+    return body
+
+
+def _body_kind(value: Any) -> str:
+    return "non-JSON" if value is None else "JSON"
+
+
+def route_template(key: str) -> str:
+    """'GET /requests/7?x=1' -> 'GET /requests/{id}'"""
+    return _NUMERIC_SEGMENT.sub("/{id}", key.split("?", 1)[0])
+
+
+@dataclass
+class DiffReport:
+    """Aggregate of many pair comparisons; partial reports merge into one"""
+    max_samples: int = 20
+    pairs: int = 0
+    matched: int = 0
+    mismatched: int = 0
+    # Lines that were not valid JSON or could not be paired
+    errors: int = 0
+    truncated: int = 0
+    by_path: Counter = field(default_factory=Counter)
+    by_kind: Counter = field(default_factory=Counter)
+    by_route: Dict[str, List[int]] = field(default_factory=dict)
+    samples: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add(self, key: str, route: str, diffs: Sequence[FieldDiff]) -> None:
+        self.pairs += 1
+        counts = self.by_route.setdefault(route, [0, 0])
+        counts[0] += 1
+        if not diffs:
+            self.matched += 1
+            return
+        self.mismatched += 1
+        counts[1] += 1
+        if len(diffs) >= MAX_DIFFS_PER_PAIR:
+            self.truncated += 1
+        # Count each generalized path once per pair so list rows do not dominate
+        self.by_path.update({_INDEX.sub("[*]", diff.path) for diff in diffs})
+        self.by_kind.update(diff.kind for diff in diffs)
+        if len(self.samples) < self.max_samples:
+            self.samples.append({
+                "key": key,
+                "route": route,
+                "diffs": [diff.__dict__ for diff in diffs[:5]],
+            })
+
+    def merge(self, other: "DiffReport") -> None:
+        self.pairs += other.pairs
+        self.matched += other.matched
+        self.mismatched += other.mismatched
+        self.errors += other.errors
+        self.truncated += other.truncated
+        self.by_path.update(other.by_path)
+        self.by_kind.update(other.by_kind)
+        for route, (pairs, mismatched) in other.by_route.items():
+            counts = self.by_route.setdefault(route, [0, 0])
+            counts[0] += pairs
+            counts[1] += mismatched
+        self.samples.extend(other.samples[: self.max_samples - len(self.samples)])
+
+    @property
+    def mismatch_rate(self) -> float:
+        return self.mismatched / self.pairs if self.pairs else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "pairs": self.pairs,
+            "matched": self.matched,
+            "mismatched": self.mismatched,
+            "mismatch_rate": round(self.mismatch_rate, 6),
+            "errors": self.errors,
+            "truncated": self.truncated,
+            "by_kind": dict(self.by_kind.most_common()),
+            "by_path": dict(self.by_path.most_common()),
+            "by_route": {
+                route: {"pairs": pairs, "mismatched": mismatched}
+                for route, (pairs, mismatched) in sorted(self.by_route.items())
+            },
+            "samples": self.samples,
+        }
+
+
+# -- workers -----------------------------------------------------------------
+
+_worker_normalizer: Normalizer = DEFAULT_NORMALIZER
+
+
+def _init_worker(rule_names: Sequence[str], rule_modules: Sequence[str]) -> None:
+    """Build the normalizer once per process; custom rules register on import"""
+    global _worker_normalizer
+    for module in rule_modules:
+        importlib.import_module(module)
+    _worker_normalizer = Normalizer(rule_names)
+
+
+def _diff_record(report: DiffReport, key: str, route: Optional[str], legacy: Dict, new: Dict) -> None:
+    diffs = diff_responses(
+        legacy.get("status"), legacy.get("body"), new.get("status"), new.get("body"),
+        normalizer=_worker_normalizer,
+    )
+    report.add(key, route or route_template(key), diffs)
+
+
+def diff_paired_lines(lines: Sequence[bytes], max_samples: int) -> DiffReport:
+    """Diff a chunk of paired-file lines"""
+    report = DiffReport(max_samples=max_samples)
+    for line in lines:
+        try:
+            pair = json.loads(line)
+            _diff_record(report, pair.get("key", ""), pair.get("route"), pair[LEGACY_SIDE], pair[NEW_SIDE])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            report.errors += 1
+    return report
+
+
+def diff_line_pairs(pairs: Sequence[Tuple[Optional[bytes], Optional[bytes]]], max_samples: int) -> DiffReport:
+    """Diff a chunk of (legacy line, new line) tuples from two files"""
+    report = DiffReport(max_samples=max_samples)
+    for legacy_line, new_line in pairs:
+        try:
+            legacy, new = json.loads(legacy_line), json.loads(new_line)
+            key = legacy.get("key", "")
+            if new.get("key", key) != key:
+                raise ValueError("recordings are out of order")
+            _diff_record(report, key, legacy.get("route"), legacy, new)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            report.errors += 1
+    return report
+
+
+# -- driver ------------------------------------------------------------------
+
+def open_recording(path: Path) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def iter_lines(path: Path) -> Iterator[bytes]:
+    with open_recording(path) as stream:
+        for line in stream:
+            if line.strip():
+                yield line
+
+
+def iter_line_pairs(legacy_path: Path, new_path: Path) -> Iterator[Tuple[Optional[bytes], Optional[bytes]]]:
+    """Lines of two recordings side by side; a shorter file pads with None"""
+    return itertools.zip_longest(iter_lines(legacy_path), iter_lines(new_path))
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_diff(
+    items: Iterable,
+    paired: bool = True,
+    rule_names: Sequence[str] = DEFAULT_RULES,
+    rule_modules: Sequence[str] = (),
+    workers: int = 1,
+    chunk_size: int = 2000,
+    max_samples: int = 20,
+) -> DiffReport:
+    """
+    Diff a stream of recorded lines.
+
+    Args:
+        items: paired-file lines, or (legacy, new) line tuples when `paired` is False
+        workers: processes to diff in; 1 diffs in this process
+        chunk_size: lines handed to a worker at a time
+
+    Returns:
+        The merged report
+    """
+    diff_chunk = diff_paired_lines if paired else diff_line_pairs
+    report = DiffReport(max_samples=max_samples)
+
+    if workers <= 1:
+        _init_worker(rule_names, rule_modules)
+        for chunk in _chunks(items, chunk_size):
+            report.merge(diff_chunk(chunk, max_samples))
+        return report
+
+    # Bound the chunks in flight so memory stays flat however long the input is
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(rule_names, rule_modules)) as pool:
+        pending = set()
+        for chunk in _chunks(items, chunk_size):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report.merge(future.result())
+            pending.add(pool.submit(diff_chunk, chunk, max_samples))
+        for future in pending:
+            report.merge(future.result())
+    return report
+
+
+# -- live recording ----------------------------------------------------------
+
+async def record_live_pairs(
+    paths: Sequence[Tuple[str, str]], legacy_url: str, new_url: str, output: Path, concurrency: int = 16
+) -> int:
+    """Fetch each (legacy path, new path) from both backends into a paired recording"""
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_pair(legacy_client, new_client, legacy_path, new_path):
+        async with semaphore:
+            responses = await asyncio.gather(
+                legacy_client.get(legacy_path), new_client.get(new_path), return_exceptions=True
+            )
+        return {
+            "key": f"GET {new_path}",
+            LEGACY_SIDE: _recorded(responses[0]),
+            NEW_SIDE: _recorded(responses[1]),
+        }
+
+    written = 0
+    async with httpx.AsyncClient(base_url=legacy_url, limits=limits, timeout=30.0) as legacy_client, \
+            httpx.AsyncClient(base_url=new_url, limits=limits, timeout=30.0) as new_client:
+        with (gzip.open(output, "wt") if output.suffix == ".gz" else open(output, "w")) as stream:
+            for batch in _chunks(paths, concurrency * 8):
+                pairs = await asyncio.gather(*(
+                    fetch_pair(legacy_client, new_client, legacy_path, new_path)
+                    for legacy_path, new_path in batch
+                ))
+                for pair in pairs:
+                    stream.write(json.dumps(pair) + "\n")
+                written += len(pairs)
+    return written
+
+
+def _recorded(response: Any) -> Dict[str, Any]:
+    if isinstance(response, Exception):
+        return {"status": 0, "body": f"{type(response).__name__}: {response}"}
+    body = _as_json(response.content)
+    return {"status": response.status_code, "body": body if body is not None else response.text}
+
+
+def read_live_paths(path: Path) -> List[Tuple[str, str]]:
+    """One request per line: a path for both backends, or 'legacy_path new_path'"""
+    paths = []
+    for line in path.read_text().splitlines():
+        parts = line.split()
+        if parts:
+            paths.append((parts[0], parts[-1]))
+    return paths
+
+
+# -- CLI -----------------------------------------------------------------------
+
+def print_report(report: DiffReport) -> None:
+    print(
+        f"Pairs: {report.pairs}  matched: {report.matched}  mismatched: {report.mismatched} "
+        f"({report.mismatch_rate:.2%})  errors: {report.errors}"
+    )
+    if report.by_kind:
+        print("By kind: " + ", ".join(f"{kind}={count}" for kind, count in report.by_kind.most_common()))
+    for path, count in report.by_path.most_common(10):
+        print(f"  {path:<40} {count}")
+    for route, (pairs, mismatched) in sorted(report.by_route.items()):
+        if mismatched:
+            print(f"  {route:<40} {mismatched}/{pairs} mismatched")
+
+
+def main_cli(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pairs", nargs="?", type=Path, help="Paired recording (.ndjson or .ndjson.gz)")
+    parser.add_argument("--legacy", type=Path, help="Legacy recording, diffed line by line against --new")
+    parser.add_argument("--new", type=Path, help="New API recording")
+    parser.add_argument("--live", type=Path, help="File of request paths to fetch from both backends")
+    parser.add_argument("--legacy-url", default="http://localhost:8080")
+    parser.add_argument("--new-url", default="http://localhost:8000")
+    parser.add_argument("--record", type=Path, default=Path("live-pairs.ndjson.gz"), help="Where --live writes pairs")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent live requests")
+    parser.add_argument("--rules", default=",".join(DEFAULT_RULES), help="Comma-separated normalization rules")
+    parser.add_argument("--rules-module", action="append", default=[], help="Module registering extra rules")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=20, help="Mismatched pairs kept in the report")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--max-mismatch-rate", type=float, help="Exit non-zero above this fraction")
+    args = parser.parse_args(argv)
+
+    for module in args.rules_module:
+        importlib.import_module(module)
+    rule_names = [name for name in args.rules.split(",") if name]
+    Normalizer(rule_names)  # fail fast on unknown rule names
+
+    if args.live:
+        written = asyncio.run(record_live_pairs(
+            read_live_paths(args.live), args.legacy_url, args.new_url, args.record, args.concurrency
+        ))
+        print(f"Recorded {written} live pairs to {args.record}")
+        items, paired = iter_lines(args.record), True
+    elif args.legacy and args.new:
+        items, paired = iter_line_pairs(args.legacy, args.new), False
+    elif args.pairs:
+        items, paired = iter_lines(args.pairs), True
+    else:
+        parser.error("give a paired recording, --legacy and --new, or --live")
+
+    report = run_diff(
+        items, paired=paired, rule_names=rule_names, rule_modules=args.rules_module,
+        workers=args.workers, chunk_size=args.chunk_size, max_samples=args.samples,
+    )
+    print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report.as_dict(), indent=2, default=str))
+
+    if args.max_mismatch_rate is not None and report.mismatch_rate > args.max_mismatch_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,27 @@
+"""
+Strangler proxy entry point.
+
+Run with: uvicorn app.main:app --host 0.0.0.0 --port 8000
+
+Set CAPTURE_DIR to record proxied traffic for replay (see app.capture),
+optionally sampled with CAPTURE_SAMPLE_RATE (0.0-1.0).
+"""
+
+import logging
+import os
+from pathlib import Path
+
+from app.capture import CaptureMiddleware, CaptureWriter
+from app.config import load_config
+from app.proxy import StranglerProxy
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "info").upper())
+
+app = StranglerProxy(load_config())
+
+if os.getenv("CAPTURE_DIR"):
+    app = CaptureMiddleware(
+        app,
+        CaptureWriter(Path(os.environ["CAPTURE_DIR"])),
+        sample_rate=float(os.getenv("CAPTURE_SAMPLE_RATE", "1.0")),
+    )
@@ -0,0 +1,144 @@
+"""
+Response normalization for legacy vs. new API comparison.
+
+Normalization is a pipeline of named rules. Each rule takes a record dict
+and returns a (possibly new) record dict. The default pipeline mirrors
+tests/test_property_data_equivalence.sh:
+- legacy field names may be camelCase
+- legacy dates use a space separator, while API dates may carry fractional
+  seconds and a trailing Z
+- API statuses are Halloween-themed labels for the legacy semantic statuses
+- schools are compared by their first word
+As in that script, created_at is not part of the final comparison.
+
+Extra rules are registered by name and can then be added to a pipeline:
+
+    @register_rule("drop_notes")
+    def drop_notes(record):
+        return {k: v for k, v in record.items() if k != "notes"}
+
+    Normalizer(DEFAULT_RULES[:-1] + ["drop_notes", "compared_fields"])
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List
+
+Record = Dict[str, Any]
+Rule = Callable[[Record], Record]
+
+# Halloween status label -> semantic status used by the legacy app
+HALLOWEEN_TO_SEMANTIC = {
+    "Possessed": "Active",
+    "Summoned": "Active",
+    "Banished": "Completed",
+    "Pending": "Pending",
+}
+
+COMPARED_FIELDS = ("id", "student_name", "school", "status", "priority")
+
+DATE_FIELDS = ("created_at", "updated_at")
+
+_FRACTION_OR_ZULU = re.compile(r"\.\d+|Z$")
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])([A-Z])")
+
+RULES: Dict[str, Rule] = {}
+
+
+def register_rule(name: str) -> Callable[[Rule], Rule]:
+    """Decorator registering a record rule under `name`"""
+    def decorator(rule: Rule) -> Rule:
+        RULES[name] = rule
+        return rule
+    return decorator
+
+
+def normalize_date(value: str) -> str:
+    """'2024-10-15 14:30:00' and '2024-10-15T14:30:00.000Z' -> '2024-10-15T14:30:00'"""
+    return _FRACTION_OR_ZULU.sub("", value.replace(" ", "T", 1))
+
+
+def normalize_status(value: str) -> str:
+    return HALLOWEEN_TO_SEMANTIC.get(value, value)
+
+
+def school_key(value: str) -> str:
+    parts = value.split()
+    return parts[0] if parts else ""
+
+
+def snake_case(name: str) -> str:
+    """'studentName' -> 'student_name'"""
+    return _CAMEL_BOUNDARY.sub(r"_\1", name).lower()
+
+
+@register_rule("field_casing")
+def _field_casing(record: Record) -> Record:
+    return {snake_case(name): value for name, value in record.items()}
+
+
+@register_rule("dates")
+def _dates(record: Record) -> Record:
+    normalized = dict(record)
+    for name in DATE_FIELDS:
+        if isinstance(normalized.get(name), str):
+            normalized[name] = normalize_date(normalized[name])
+    return normalized
+
+
+@register_rule("status_theme")
+def _status_theme(record: Record) -> Record:
+    if isinstance(record.get("status"), str):
+        return {**record, "status": normalize_status(record["status"])}
+    return record
+
+
+@register_rule("school_key")
+def _school_key(record: Record) -> Record:
+    if isinstance(record.get("school"), str):
+        return {**record, "school": school_key(record["school"])}
+    return record
+
+
+@register_rule("compared_fields")
+def _compared_fields(record: Record) -> Record:
+    return {name: record.get(name) for name in COMPARED_FIELDS}
+
+
+DEFAULT_RULES = ["field_casing", "dates", "status_theme", "school_key", "compared_fields"]
+
+
+class Normalizer:
+    """Applies a pipeline of registered rules to records and payloads"""
+
+    def __init__(self, rule_names: Iterable[str] = DEFAULT_RULES):
+        self.rule_names = list(rule_names)
+        unknown = [name for name in self.rule_names if name not in RULES]
+        if unknown:
+            raise ValueError(f"Unknown normalization rules: {', '.join(unknown)}")
+        self._rules: List[Rule] = [RULES[name] for name in self.rule_names]
+
+    def normalize_record(self, record: Record) -> Record:
+        for rule in self._rules:
+            record = rule(record)
+        return record
+
+    def normalize_payload(self, payload: Any) -> Any:
+        """Normalize a single record or a list of records (ordered by id)"""
+        if isinstance(payload, list):
+            records = [self.normalize_record(item) for item in payload if isinstance(item, dict)]
+            return sorted(records, key=lambda record: str(record.get("id")))
+        if isinstance(payload, dict) and "id" in payload:
+            return self.normalize_record(payload)
+        return payload
+
+
+DEFAULT_NORMALIZER = Normalizer()
+
+
+def normalize_record(record: Record) -> Record:
+    """Canonical form of a Student Request for semantic comparison"""
+    return DEFAULT_NORMALIZER.normalize_record(record)
+
+
+def normalize_payload(payload: Any) -> Any:
+    return DEFAULT_NORMALIZER.normalize_payload(payload)
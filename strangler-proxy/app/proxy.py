@@ -0,0 +1,308 @@
+"""
+Pure ASGI strangler proxy.
+
+Each request is matched to a RouteRule, sent to the legacy or new backend
+according to the rule's percentage, and answered from that backend. For
+shadowed rules the same request (GET and HEAD only, unless the rule opts in
+to unsafe methods) is also queued for the other backend; a fixed pool of
+workers replays it after the client has been answered and compares both responses with app.diff_engine. Shadow work never adds to user
+latency: when the bounded queue is full the shadow call is dropped and
+counted instead of waiting.
+
+Both backends use their own pooled keep-alive httpx clients.
+"""
+
+import asyncio
+import json
+import logging
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import LEGACY, NEW, ProxyConfig, RouteRule
+from app.diff_engine import compare_responses, decode_content
+
+logger = logging.getLogger("strangler_proxy")
+
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host",
+}
+
+STATS_PATH = "/__proxy/stats"
+
+
+@dataclass
+class ShadowCall:
+    """A request already answered by `primary`, to be replayed on the other backend"""
+    rule: RouteRule
+    primary: str
+    method: str
+    path: str
+    query: bytes
+    headers: List[Tuple[str, str]]
+    body: bytes
+    primary_status: int
+    primary_body: bytes
+    primary_encoding: Optional[str] = None
+
+
+class RouteStats:
+    """Per-rule counters exposed on /__proxy/stats"""
+
+    __slots__ = ("served", "shadowed", "matches", "mismatches", "dropped", "shadow_errors", "last_mismatch")
+
+    def __init__(self):
+        self.served = {LEGACY: 0, NEW: 0}
+        self.shadowed = 0
+        self.matches = 0
+        self.mismatches = 0
+        self.dropped = 0
+        self.shadow_errors = 0
+        self.last_mismatch: Optional[str] = None
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class StranglerProxy:
+    """ASGI application routing between the legacy and new backends"""
+
+    def __init__(
+        self,
+        config: ProxyConfig,
+        legacy_client: Optional[httpx.AsyncClient] = None,
+        new_client: Optional[httpx.AsyncClient] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.config = config
+        self.clients: Dict[str, Optional[httpx.AsyncClient]] = {LEGACY: legacy_client, NEW: new_client}
+        self.rng = rng or random.Random()
+        self.stats: Dict[str, RouteStats] = {rule.prefix: RouteStats() for rule in config.rules}
+        self.shadow_queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        self._ensure_started()
+        if scope["path"] == STATS_PATH:
+            await self._send_stats(send)
+            return
+        await self._proxy(scope, receive, send)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        """Create upstream pools and shadow workers on first use"""
+        if self.shadow_queue is not None:
+            return
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_connections,
+        )
+        for backend, base_url in ((LEGACY, self.config.legacy_url), (NEW, self.config.new_url)):
+            if self.clients[backend] is None:
+                self.clients[backend] = httpx.AsyncClient(
+                    base_url=base_url, limits=limits, timeout=self.config.upstream_timeout
+                )
+        self.shadow_queue = asyncio.Queue(maxsize=self.config.shadow_queue_size)
+        self._workers = [
+            asyncio.create_task(self._shadow_worker()) for _ in range(self.config.shadow_workers)
+        ]
+
+    async def aclose(self) -> None:
+        """Stop shadow workers and close upstream pools"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for client in self.clients.values():
+            if client is not None:
+                await client.aclose()
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._ensure_started()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # -- request path ------------------------------------------------------
+
+    def choose_backend(self, rule: RouteRule) -> str:
+        if rule.new_percent >= 100:
+            return NEW
+        if rule.new_percent <= 0:
+            return LEGACY
+        return NEW if self.rng.random() * 100 < rule.new_percent else LEGACY
+
+    async def _proxy(self, scope, receive, send) -> None:
+        rule = self.config.match(scope["path"])
+        backend = self.choose_backend(rule)
+        stats = self.stats.setdefault(rule.prefix, RouteStats())
+        stats.served[backend] += 1
+        shadow = rule.shadows(scope["method"])
+
+        body = await _read_body(receive)
+        headers = _forward_headers(scope, strip_encoding=shadow)
+        client = self.clients[backend]
+        request = client.build_request(
+            scope["method"],
+            _upstream_url(rule.upstream_path(scope["path"], backend), scope["query_string"]),
+            headers=headers,
+            content=body,
+        )
+        try:
+            response = await client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            logger.warning("Upstream %s failed for %s: %s", backend, scope["path"], e)
+            await _send_simple(send, 502, b'{"detail":"Bad gateway"}')
+            return
+
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": _response_headers(response),
+            })
+            if shadow:
+                # Buffer the body so it can be compared with the shadow response
+                primary_body = b"".join([chunk async for chunk in response.aiter_raw()])
+                await send({"type": "http.response.body", "body": primary_body})
+            else:
+                async for chunk in response.aiter_raw():
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            await response.aclose()
+
+        if shadow:
+            self._enqueue_shadow(ShadowCall(
+                rule=rule,
+                primary=backend,
+                method=scope["method"],
+                path=scope["path"],
+                query=scope["query_string"],
+                headers=headers,
+                body=body,
+                primary_status=response.status_code,
+                primary_body=primary_body,
+                primary_encoding=response.headers.get("content-encoding"),
+            ), stats)
+
+    def _enqueue_shadow(self, call: ShadowCall, stats: RouteStats) -> None:
+        try:
+            self.shadow_queue.put_nowait(call)
+        except asyncio.QueueFull:
+            stats.dropped += 1
+
+    # -- shadow path -------------------------------------------------------
+
+    async def _shadow_worker(self) -> None:
+        while True:
+            call = await self.shadow_queue.get()
+            try:
+                await self._run_shadow(call)
+            except Exception:
+                logger.exception("Shadow comparison failed for %s", call.path)
+            finally:
+                self.shadow_queue.task_done()
+
+    async def _run_shadow(self, call: ShadowCall) -> None:
+        stats = self.stats.setdefault(call.rule.prefix, RouteStats())
+        shadow_backend = LEGACY if call.primary == NEW else NEW
+        try:
+            response = await self.clients[shadow_backend].request(
+                call.method,
+                _upstream_url(call.rule.upstream_path(call.path, shadow_backend), call.query),
+                headers=call.headers,
+                content=call.body,
+                timeout=self.config.shadow_timeout,
+            )
+        except httpx.HTTPError as e:
+            stats.shadow_errors += 1
+            logger.info("Shadow call to %s failed for %s: %s", shadow_backend, call.path, e)
+            return
+
+        stats.shadowed += 1
+        # The primary body was relayed raw, in case the upstream compressed it
+        # anyway; httpx has already decoded the shadow body
+        primary_body = decode_content(call.primary_body, call.primary_encoding)
+        mismatch = compare_responses(call.primary_status, primary_body, response.status_code, response.content)
+        if mismatch is None:
+            stats.matches += 1
+        else:
+            stats.mismatches += 1
+            stats.last_mismatch = f"{call.method} {call.path}: {mismatch}"
+            logger.warning("Shadow mismatch (%s primary) %s %s: %s", call.primary, call.method, call.path, mismatch)
+
+    async def _send_stats(self, send) -> None:
+        payload = {
+            "queue_depth": self.shadow_queue.qsize(),
+            "routes": {prefix: stats.as_dict() for prefix, stats in sorted(self.stats.items())},
+        }
+        await _send_simple(send, 200, json.dumps(payload).encode())
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _upstream_url(path: str, query: bytes) -> str:
+    return f"{path}?{query.decode('latin-1')}" if query else path
+
+
+def _forward_headers(scope, strip_encoding: bool) -> List[Tuple[str, str]]:
+    """Request headers for the upstream, minus hop-by-hop headers"""
+    headers = []
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin-1").lower()
+        if name in HOP_BY_HOP_HEADERS or name == "content-length":
+            continue
+        if strip_encoding and name == "accept-encoding":
+            continue
+        headers.append((name, raw_value.decode("latin-1")))
+    if strip_encoding:
+        # Shadowed responses are compared, so ask for uncompressed bodies
+        # (without the header httpx would send its own `gzip, deflate`)
+        headers.append(("accept-encoding", "identity"))
+    for raw_name, raw_value in scope["headers"]:
+        if raw_name.lower() == b"host":
+            headers.append(("x-forwarded-host", raw_value.decode("latin-1")))
+    client = scope.get("client")
+    if client:
+        headers.append(("x-forwarded-for", client[0]))
+    return headers
+
+
+def _response_headers(response: httpx.Response) -> List[Tuple[bytes, bytes]]:
+    return [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        for name, value in response.headers.multi_items()
+        if name.lower() not in HOP_BY_HOP_HEADERS
+    ]
+
+
+async def _send_simple(send, status: int, body: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,198 @@
+"""
+Replay captured traffic against a migrated app and verify the responses.
+
+Exchanges recorded by app.capture are re-issued concurrently against a
+target. The target is either a base URL or an ASGI import path such as
+main:app, for example the FastAPI project emitted by the PHP migration
+tool, which is driven in-process. Each replayed response is diffed against
+the captured one with app.diff_engine normalization, and the run produces
+the same aggregate report as the offline diff engine.
+
+Only GET and HEAD are replayed unless --methods says otherwise, so
+replaying a corpus cannot write to the target by accident.
+
+Usage (from the strangler-proxy directory):
+    python -m app.replay captures/ --target http://localhost:8000 --rewrite /api/=/
+    python -m app.replay captures/ --target main:app --app-dir ../generated/my_api \\
+        --route "GET /api/requests/{id}" --concurrency 32 --output replay.json
+    python -m app.replay captures/ --target main:app --record pairs.ndjson.gz
+"""
+
+import argparse
+import asyncio
+import gzip
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+from app.capture import decode_body, iter_captures, response_body
+from app.config import SAFE_METHODS
+from app.diff_engine import LEGACY_SIDE, NEW_SIDE, DiffReport, diff_responses
+from app.normalize import DEFAULT_RULES, Normalizer
+
+# Request headers that describe the original connection, not the request
+SKIPPED_HEADERS = {"host", "content-length", "connection", "accept-encoding"}
+
+
+def make_client(target: str, concurrency: int, app_dir: Optional[Path] = None) -> httpx.AsyncClient:
+    """Client for a base URL, or for an ASGI app given as module:attribute"""
+    if target.startswith(("http://", "https://")):
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        return httpx.AsyncClient(base_url=target, limits=limits, timeout=30.0)
+
+    if app_dir is not None:
+        sys.path.insert(0, str(app_dir.resolve()))
+    module_name, _, attribute = target.partition(":")
+    app = getattr(importlib.import_module(module_name), attribute or "app")
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replay")
+
+
+def rewrite_path(path: str, rewrites: Sequence[Tuple[str, str]]) -> str:
+    """Apply the first matching prefix rewrite"""
+    for old, new in rewrites:
+        if path.startswith(old):
+            return new + path[len(old):]
+    return path
+
+
+def parse_rewrite(value: str) -> Tuple[str, str]:
+    old, sep, new = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("rewrite must look like /old/prefix=/new/prefix")
+    return old, new
+
+
+async def replay(
+    records: Iterable[Dict[str, Any]],
+    client: httpx.AsyncClient,
+    concurrency: int = 16,
+    rewrites: Sequence[Tuple[str, str]] = (),
+    normalizer: Optional[Normalizer] = None,
+    recording: Optional[IO[str]] = None,
+    max_samples: int = 20,
+) -> Dict[str, Any]:
+    """
+    Replay captured exchanges and diff each response against the capture.
+
+    Args:
+        recording: if given, each pair is also written as a paired line for
+            app.diff_engine (captured response as "legacy", replayed as "new")
+
+    Returns:
+        Replay totals with the aggregate diff report under "diff"
+    """
+    normalizer = normalizer or Normalizer(DEFAULT_RULES)
+    report = DiffReport(max_samples=max_samples)
+    transport_errors = 0
+    iterator = iter(records)
+
+    async def worker():
+        nonlocal transport_errors
+        # A shared synchronous iterator is safe: next() never awaits
+        for record in iterator:
+            path = rewrite_path(record["path"], rewrites)
+            url = f"{path}?{record['query']}" if record["query"] else path
+            captured_body = response_body(record)
+            try:
+                response = await client.request(
+                    record["method"],
+                    url,
+                    headers=[(name, value) for name, value in record["headers"] if name not in SKIPPED_HEADERS],
+                    content=decode_body(record["request"]),
+                )
+                status, body = response.status_code, response.content
+            except httpx.HTTPError as e:
+                transport_errors += 1
+                status, body = 0, f"{type(e).__name__}: {e}".encode()
+
+            key = f"{record['method']} {url}"
+            if record.get("truncated"):
+                # A partial captured body cannot be compared meaningfully
+                report.errors += 1
+            else:
+                report.add(key, record["route"], diff_responses(
+                    record["status"], captured_body, status, body, normalizer=normalizer
+                ))
+            if recording is not None:
+                recording.write(json.dumps({
+                    "key": key,
+                    "route": record["route"],
+                    LEGACY_SIDE: {"status": record["status"], "body": captured_body.decode("utf-8", "replace")},
+                    NEW_SIDE: {"status": status, "body": body.decode("utf-8", "replace")},
+                }) + "\n")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "replayed": report.pairs,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_sec": round(report.pairs / elapsed, 1) if elapsed else 0.0,
+        "transport_errors": transport_errors,
+        "diff": report.as_dict(),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    records = iter_captures(args.captures, routes=args.route or None, methods=args.methods.split(","))
+    recording = None
+    if args.record:
+        recording = gzip.open(args.record, "wt") if args.record.suffix == ".gz" else open(args.record, "w")
+    try:
+        async with make_client(args.target, args.concurrency, args.app_dir) as client:
+            return await replay(
+                records, client,
+                concurrency=args.concurrency,
+                rewrites=args.rewrite,
+                normalizer=Normalizer([name for name in args.rules.split(",") if name]),
+                recording=recording,
+                max_samples=args.samples,
+            )
+    finally:
+        if recording is not None:
+            recording.close()
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("captures", type=Path, help="Capture directory written by CaptureMiddleware")
+    parser.add_argument("--target", required=True, help="Base URL, or ASGI import path such as main:app")
+    parser.add_argument("--app-dir", type=Path, help="Directory to import --target from")
+    parser.add_argument("--route", action="append", default=[], help="Replay only this route template (repeatable)")
+    parser.add_argument("--methods", default=",".join(SAFE_METHODS), help="Comma-separated methods to replay")
+    parser.add_argument("--rewrite", action="append", type=parse_rewrite, default=[],
+                        help="Path prefix rewrite, e.g. /api/=/ (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rules", default=",".join(DEFAULT_RULES), help="Comma-separated normalization rules")
+    parser.add_argument("--samples", type=int, default=20, help="Mismatched pairs kept in the report")
+    parser.add_argument("--record", type=Path, help="Also write pairs for app.diff_engine")
+    parser.add_argument("--output", type=Path, help="Write the JSON result here")
+    parser.add_argument("--max-mismatch-rate", type=float, help="Exit non-zero above this fraction")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args))
+    diff = result["diff"]
+    print(
+        f"Replayed {result['replayed']} requests in {result['elapsed_s']} s ({result['requests_per_sec']} req/s): "
+        f"{diff['matched']} matched, {diff['mismatched']} mismatched, "
+        f"{diff['errors']} skipped, {result['transport_errors']} transport errors"
+    )
+    for path, count in list(diff["by_path"].items())[:10]:
+        print(f"  {path:<40} {count}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2, default=str))
+
+    if args.max_mismatch_rate is not None and diff["mismatch_rate"] > args.max_mismatch_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
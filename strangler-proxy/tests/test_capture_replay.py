@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for traffic capture and replay.
+
+A small ASGI app stands in for production; its traffic is captured, read
+back by route, and replayed against a second app playing the migrated API.
+"""
+
+import sys
+import os
+import asyncio
+import gzip
+import json
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+from app.capture import CaptureMiddleware, CaptureWriter, iter_captures, read_index, route_counts
+from app.replay import replay
+
+RECORDS = {
+    1: {"id": 1, "student_name": "Victor Frankenstein", "school": "Miskatonic University",
+        "status": "Active", "priority": "Critical"},
+    2: {"id": 2, "student_name": "Herbert West", "school": "Miskatonic University",
+        "status": "Pending", "priority": "High"},
+}
+
+
+def json_app(lookup):
+    """ASGI app serving /requests/{id} from `lookup`, echoing POST bodies"""
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        message = await receive()
+        record_id = scope["path"].rsplit("/", 1)[-1]
+        if scope["method"] == "POST":
+            status, body = 201, message.get("body", b"")
+        elif record_id.isdigit() and int(record_id) in lookup:
+            status, body = 200, json.dumps(lookup[int(record_id)]).encode()
+        else:
+            status, body = 404, b'{"detail":"Not found"}'
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def drive(app, requests):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://capture") as client:
+        for method, path, body in requests:
+            await client.request(method, path, content=body, headers={"authorization": "Bearer secret"})
+
+
+def capture(tmp_path, requests, batch_size=2):
+    writer = CaptureWriter(tmp_path, batch_size=batch_size)
+    asyncio.run(drive(CaptureMiddleware(json_app(RECORDS), writer), requests))
+    writer.close()
+    return tmp_path
+
+
+def test_capture_is_compressed_indexed_and_append_only(tmp_path):
+    """Batches become gzip members indexed by route; a new writer adds a segment"""
+    requests = [("GET", "/requests/1", None), ("GET", "/requests/2", None),
+                ("GET", "/requests/9", None), ("POST", "/requests", b'{"student_name": "Ghost"}')]
+    capture(tmp_path, requests)
+    capture(tmp_path, [("GET", "/requests/1", None)])
+
+    index = read_index(tmp_path)
+    assert [entry["records"] for entry in index] == [2, 2, 1]
+    assert len({entry["segment"] for entry in index}) == 2
+    assert route_counts(tmp_path) == {"GET /requests/{id}": 4, "POST /requests": 1}
+
+    with gzip.open(tmp_path / index[0]["segment"], "rt") as stream:
+        assert len(stream.read().splitlines()) == 4
+
+    posts = list(iter_captures(tmp_path, routes=["POST /requests"]))
+    assert len(posts) == 1
+    assert posts[0]["status"] == 201
+    assert posts[0]["request"] == {"text": '{"student_name": "Ghost"}'}
+    assert all(name != "authorization" for name, _ in posts[0]["headers"])
+
+
+def test_replay_verifies_against_migrated_app(tmp_path):
+    """Safe-method replays are diffed; the changed record is the only mismatch"""
+    requests = [("GET", f"/api/requests/{i}", None) for i in (1, 2, 2, 9)]
+    capture(tmp_path, requests + [("POST", "/api/requests", b"{}")])
+
+    migrated = {1: {**RECORDS[1], "status": "Possessed"}, 2: {**RECORDS[2], "priority": "Low"}}
+    recording = tmp_path / "pairs.ndjson"
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=json_app(migrated)),
+                                     base_url="http://replay") as client:
+            with open(recording, "w") as stream:
+                return await replay(
+                    iter_captures(tmp_path, methods=["GET"]), client,
+                    concurrency=3, rewrites=[("/api/", "/")], recording=stream,
+                )
+
+    result = asyncio.run(run())
+
+    assert result["replayed"] == 4
+    assert result["transport_errors"] == 0
+    assert result["diff"]["mismatched"] == 2
+    assert result["diff"]["by_path"] == {"$.priority": 2}
+    assert len(recording.read_text().splitlines()) == 4
+
+
+def gzip_app(app):
+    """Wrap an ASGI app so every response body is gzip-compressed, as a gateway would"""
+    async def wrapped(scope, receive, send):
+        start = {}
+
+        async def send_gzip(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                body = gzip.compress(message.get("body", b""))
+                headers = list(start["headers"]) + [(b"content-encoding", b"gzip"),
+                                                    (b"content-length", str(len(body)).encode())]
+                await send({**start, "headers": headers})
+                await send({"type": "http.response.body", "body": body})
+        await app(scope, receive, send_gzip)
+    return wrapped
+
+
+def test_replay_decodes_compressed_captures(tmp_path):
+    """A gzip response is captured with its Content-Encoding and compared decoded"""
+    writer = CaptureWriter(tmp_path, batch_size=2)
+    requests = [("GET", f"/requests/{i}", None) for i in (1, 2)]
+    asyncio.run(drive(CaptureMiddleware(gzip_app(json_app(RECORDS)), writer), requests))
+    writer.close()
+
+    captured = list(iter_captures(tmp_path))
+    assert ["content-encoding", "gzip"] in captured[0]["response_headers"]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=json_app(RECORDS)),
+                                     base_url="http://replay") as client:
+            return await replay(iter(captured), client)
+
+    result = asyncio.run(run())
+
+    assert result["replayed"] == 2
+    assert result["diff"]["mismatched"] == 0
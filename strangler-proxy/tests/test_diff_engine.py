@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for normalization rules and the streaming diff engine.
+"""
+
+import sys
+import os
+import gzip
+import json
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from app.normalize import Normalizer, RULES, register_rule
+from app.diff_engine import diff_responses, iter_line_pairs, iter_lines, main_cli, run_diff
+
+LEGACY_RECORD = {
+    "id": 1, "studentName": "Victor Frankenstein", "school": "Miskatonic University",
+    "status": "Active", "created_at": "2024-10-31 23:59:59", "priority": "Critical",
+}
+API_RECORD = {
+    "id": 1, "student_name": "Victor Frankenstein", "school": "Miskatonic University",
+    "status": "Possessed", "created_at": "2024-10-31T23:59:59.000Z", "priority": "Critical",
+}
+
+
+def pair_line(key, legacy_body, new_body, legacy_status=200, new_status=200):
+    return json.dumps({
+        "key": key,
+        "legacy": {"status": legacy_status, "body": legacy_body},
+        "new": {"status": new_status, "body": new_body},
+    })
+
+
+def test_default_rules_make_themed_records_equal():
+    """Field casing, dates and Halloween statuses normalize away"""
+    assert diff_responses(200, [LEGACY_RECORD], 200, json.dumps([API_RECORD])) == []
+
+
+def test_record_lists_are_aligned_by_id():
+    """A missing row is reported once, not as a shift of every later row"""
+    second = {**API_RECORD, "id": 2}
+    third = {**API_RECORD, "id": 3}
+    diffs = diff_responses(200, [LEGACY_RECORD, third], 200, [API_RECORD, second, third])
+
+    assert [(diff.path, diff.kind) for diff in diffs] == [("$[id=2]", "extra")]
+
+
+def test_dates_rule_keeps_created_at_comparable():
+    """Without the field projection, normalized dates compare equal"""
+    normalizer = Normalizer(["field_casing", "dates", "status_theme"])
+    legacy = normalizer.normalize_record(LEGACY_RECORD)
+    new = normalizer.normalize_record(API_RECORD)
+    assert legacy["created_at"] == new["created_at"] == "2024-10-31T23:59:59"
+
+
+def test_custom_rules_plug_into_the_pipeline():
+    """Registered rules can be selected by name; unknown names are rejected"""
+    @register_rule("test_ignore_priority")
+    def ignore_priority(record):
+        return {**record, "priority": None}
+
+    try:
+        normalizer = Normalizer(["field_casing", "status_theme", "test_ignore_priority", "compared_fields"])
+        diffs = diff_responses(200, [{**LEGACY_RECORD, "priority": "Low"}], 200, [API_RECORD], normalizer=normalizer)
+        assert diffs == []
+        with pytest.raises(ValueError):
+            Normalizer(["no_such_rule"])
+    finally:
+        RULES.pop("test_ignore_priority")
+
+
+def test_parallel_report_matches_serial(tmp_path):
+    """Worker processes produce the same aggregate as an in-process run"""
+    recording = tmp_path / "pairs.ndjson.gz"
+    with gzip.open(recording, "wt") as stream:
+        for index in range(1, 301):
+            legacy = {**LEGACY_RECORD, "id": index}
+            new = {**API_RECORD, "id": index}
+            if index % 10 == 0:
+                new["priority"] = "Low"
+            stream.write(pair_line(f"GET /requests/{index}", legacy, new) + "\n")
+        stream.write("not json\n")
+
+    serial = run_diff(iter_lines(recording), chunk_size=37)
+    parallel = run_diff(iter_lines(recording), workers=2, chunk_size=37)
+
+    for report in (serial, parallel):
+        assert report.pairs == 300
+        assert report.mismatched == 30
+        assert report.errors == 1
+        assert report.by_path == {"$.priority": 30}
+        assert report.by_route == {"GET /requests/{id}": [300, 30]}
+
+
+def test_two_file_recordings_and_cli(tmp_path):
+    """Separate recordings are paired line by line; the CLI gates on mismatch rate"""
+    legacy_path, new_path, output = tmp_path / "legacy.ndjson", tmp_path / "new.ndjson", tmp_path / "report.json"
+    legacy_path.write_text("\n".join(
+        json.dumps({"key": f"GET /requests/{i}", "status": 200, "body": {**LEGACY_RECORD, "id": i}})
+        for i in (1, 2)
+    ))
+    new_path.write_text("\n".join([
+        json.dumps({"key": "GET /requests/1", "status": 200, "body": {**API_RECORD, "id": 1}}),
+        json.dumps({"key": "GET /requests/2", "status": 404, "body": {"detail": "Not found"}}),
+    ]))
+
+    report = run_diff(iter_line_pairs(legacy_path, new_path), paired=False)
+    assert (report.matched, report.mismatched) == (1, 1)
+    assert report.by_kind["changed"] == 1
+
+    exit_code = main_cli([
+        "--legacy", str(legacy_path), "--new", str(new_path),
+        "--output", str(output), "--max-mismatch-rate", "0.25",
+    ])
+    assert exit_code == 1
+    assert json.loads(output.read_text())["mismatch_rate"] == 0.5
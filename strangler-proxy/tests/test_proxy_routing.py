@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Tests for strangler proxy routing and shadow comparison.
+
+Both backends are replaced by httpx.MockTransport handlers, and the proxy is
+driven in-process through httpx.ASGITransport.
+"""
+
+import sys
+import os
+import asyncio
+import gzip
+import json
+
+# Add parent directory to path to import app module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+from app.config import ProxyConfig, RouteRule, DEFAULT_RULES
+from app.proxy import StranglerProxy
+
+LEGACY_RECORD = {
+    "id": 1, "student_name": "Victor Frankenstein", "school": "Miskatonic University",
+    "status": "Active", "created_at": "2024-10-31 23:59:59", "priority": "Critical",
+}
+API_RECORD = {
+    "id": 1, "student_name": "Victor Frankenstein", "school": "Miskatonic University",
+    "status": "Possessed", "created_at": "2024-10-31T23:59:59Z", "priority": "Critical",
+}
+
+
+class StreamedBody(httpx.AsyncByteStream):
+    """Unread response body, as a network transport would return it"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+
+
+def upstream(status, payload=None, text=None):
+    """Upstream response with a streamed (not preloaded) body"""
+    body = text.encode() if text is not None else json.dumps(payload).encode()
+    content_type = "text/html" if text is not None else "application/json"
+    return httpx.Response(
+        status,
+        headers={"content-type": content_type, "content-length": str(len(body))},
+        stream=StreamedBody(body),
+    )
+
+
+def make_proxy(rules, legacy_handler, new_handler, **config):
+    """Proxy whose backends are served by the given handlers"""
+    return StranglerProxy(
+        ProxyConfig(rules=rules, **config),
+        legacy_client=httpx.AsyncClient(transport=httpx.MockTransport(legacy_handler), base_url="http://legacy"),
+        new_client=httpx.AsyncClient(transport=httpx.MockTransport(new_handler), base_url="http://new"),
+    )
+
+
+async def fetch(proxy, paths):
+    """GET each path through the proxy, then let shadow workers drain"""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=proxy), base_url="http://proxy") as client:
+        responses = [await client.get(path) for path in paths]
+        if proxy.shadow_queue is not None and proxy._workers:
+            await proxy.shadow_queue.join()
+        stats = (await client.get("/__proxy/stats")).json()
+    await proxy.aclose()
+    return responses, stats
+
+
+def test_default_rules_match_gateway():
+    """/api/* goes to the new API with the prefix stripped; the rest to legacy"""
+    seen = []
+
+    def legacy(request):
+        seen.append(("legacy", request.url.path))
+        return upstream(200, text="<html>legacy</html>")
+
+    def new(request):
+        seen.append(("new", request.url.path))
+        return upstream(200, [API_RECORD])
+
+    proxy = make_proxy(list(DEFAULT_RULES), legacy, new)
+    responses, _ = asyncio.run(fetch(proxy, ["/api/requests", "/requests?use_new=1"]))
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert responses[0].json() == [API_RECORD]
+    assert seen == [("new", "/requests"), ("legacy", "/requests")]
+
+
+def test_shadow_equivalent_responses_match():
+    """Semantically equal legacy/new payloads count as matches"""
+    rules = [RouteRule(prefix="/api/requests", new_percent=100, new_prefix="/requests",
+                       legacy_prefix="/legacy/requests", shadow=True)]
+    proxy = make_proxy(
+        rules,
+        lambda request: upstream(200, [LEGACY_RECORD]),
+        lambda request: upstream(200, [API_RECORD]),
+    )
+    responses, stats = asyncio.run(fetch(proxy, ["/api/requests"] * 5))
+
+    assert all(r.json() == [API_RECORD] for r in responses)
+    route = stats["routes"]["/api/requests"]
+    assert route["served"]["new"] == 5
+    assert route["matches"] == 5
+    assert route["mismatches"] == 0
+
+
+def test_shadow_mismatch_is_reported():
+    """A differing priority is recorded as a mismatch with a description"""
+    rules = [RouteRule(prefix="/api/requests", new_percent=0, new_prefix="/requests", shadow=True)]
+    proxy = make_proxy(
+        rules,
+        lambda request: upstream(200, [{**LEGACY_RECORD, "priority": "Low"}]),
+        lambda request: upstream(200, [API_RECORD]),
+    )
+    _, stats = asyncio.run(fetch(proxy, ["/api/requests"]))
+
+    route = stats["routes"]["/api/requests"]
+    assert route["served"]["legacy"] == 1
+    assert route["mismatches"] == 1
+    assert "priority" in route["last_mismatch"]
+
+
+def shadow_writes(rule):
+    """POST, DELETE and GET through a shadowed rule; the requests each backend saw and the route stats"""
+    seen = []
+
+    def backend(name):
+        def handler(request):
+            seen.append((name, request.method))
+            return upstream(200, [API_RECORD])
+        return handler
+
+    proxy = make_proxy([rule], backend("legacy"), backend("new"))
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=proxy), base_url="http://proxy") as client:
+            await client.post("/api/requests", json={"student_name": "Ada"})
+            await client.delete("/api/requests/1")
+            await client.get("/api/requests")
+            await proxy.shadow_queue.join()
+            stats = (await client.get("/__proxy/stats")).json()
+        await proxy.aclose()
+        return stats
+
+    stats = asyncio.run(scenario())
+    return seen, stats["routes"][rule.prefix]
+
+
+def test_shadow_skips_unsafe_methods_by_default():
+    """Only GET is mirrored; the write goes to the primary backend alone"""
+    seen, route = shadow_writes(RouteRule(prefix="/api/requests", new_percent=100, shadow=True))
+
+    assert [method for name, method in seen if name == "legacy"] == ["GET"]
+    assert [method for name, method in seen if name == "new"] == ["POST", "DELETE", "GET"]
+    assert route["shadowed"] == 1
+
+
+def test_shadow_unsafe_methods_when_the_rule_opts_in():
+    """shadow_unsafe mirrors writes too"""
+    seen, route = shadow_writes(RouteRule(prefix="/api/requests", new_percent=100, shadow=True,
+                                          shadow_unsafe=True))
+
+    assert sorted(method for name, method in seen if name == "legacy") == ["DELETE", "GET", "POST"]
+    assert route["shadowed"] == 3
+
+
+def gzip_upstream(request, payload, always=False):
+    """Upstream that gzips whenever the client accepts it (or regardless)"""
+    body = json.dumps(payload).encode()
+    if always or "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body)
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json", "content-encoding": "gzip",
+                     "content-length": str(len(body))},
+            stream=StreamedBody(body),
+        )
+    return upstream(200, payload)
+
+
+def test_shadow_asks_upstreams_for_uncompressed_bodies():
+    """Mirrored requests send Accept-Encoding: identity, so gzip-capable upstreams match"""
+    seen = []
+
+    def legacy(request):
+        seen.append(request.headers.get("accept-encoding"))
+        return gzip_upstream(request, [LEGACY_RECORD])
+
+    def new(request):
+        seen.append(request.headers.get("accept-encoding"))
+        return gzip_upstream(request, [API_RECORD])
+
+    rules = [RouteRule(prefix="/api/requests", new_percent=100, new_prefix="/requests", shadow=True)]
+    proxy = make_proxy(rules, legacy, new)
+    responses, stats = asyncio.run(fetch(proxy, ["/api/requests"] * 3))
+
+    assert all(r.json() == [API_RECORD] for r in responses)
+    assert seen == ["identity"] * 6
+    route = stats["routes"]["/api/requests"]
+    assert route["matches"] == 3
+    assert route["mismatches"] == 0
+
+
+def test_shadow_decodes_gzip_from_upstreams_that_ignore_identity():
+    """A primary body that arrives gzipped anyway is relayed as is but compared decoded"""
+    rules = [RouteRule(prefix="/api/requests", new_percent=100, new_prefix="/requests", shadow=True)]
+    proxy = make_proxy(
+        rules,
+        lambda request: gzip_upstream(request, [LEGACY_RECORD], always=True),
+        lambda request: gzip_upstream(request, [API_RECORD], always=True),
+    )
+    responses, stats = asyncio.run(fetch(proxy, ["/api/requests"] * 2))
+
+    assert responses[0].headers["content-encoding"] == "gzip"
+    assert responses[0].json() == [API_RECORD]
+    route = stats["routes"]["/api/requests"]
+    assert route["matches"] == 2
+    assert route["mismatches"] == 0
+    assert route["last_mismatch"] is None
+
+
+def test_full_shadow_queue_drops_instead_of_blocking():
+    """With no free queue slots, shadow calls are dropped and counted"""
+    rules = [RouteRule(prefix="/", new_percent=100, shadow=True)]
+    proxy = make_proxy(
+        rules,
+        lambda request: upstream(200, {}),
+        lambda request: upstream(200, {}),
+        shadow_queue_size=1,
+        shadow_workers=0,
+    )
+    responses, stats = asyncio.run(fetch(proxy, ["/a", "/b", "/c"]))
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert stats["routes"]["/"]["dropped"] == 2
+    assert stats["queue_depth"] == 1
+
+
+def test_upstream_failure_returns_bad_gateway():
+    """Connection errors from the chosen backend surface as 502"""
+    def broken(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    proxy = make_proxy(list(DEFAULT_RULES), broken, broken)
+    responses, _ = asyncio.run(fetch(proxy, ["/requests"]))
+
+    assert responses[0].status_code == 502
+    assert json.loads(responses[0].content) == {"detail": "Bad gateway"}